@@ -0,0 +1,576 @@
+"""
+Performans ölçümleri (sentetik veriyle, OBS'ye istek atmaz)
+Kullanım: python benchmark.py <ölçüm> [--branches N] [--sections N] [--users N] [--subscriptions N]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from class_yapisi import DersProgramList, DersListesi
+
+GUNLER = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma']
+BINALAR = ['EEB', 'FEB', 'MED', 'INB', 'DMB', 'KMB', 'MKB']
+
+
+def make_branch(branch_id: int, sections: int = 1200, courses: int = 250, seed: int = 0) -> DersListesi:
+    """Gerçek büyüklükte (MAT/FIZ gibi) sentetik bir branş anlık görüntüsü üret"""
+    rnd = random.Random(seed * 100003 + branch_id)
+    hocalar = [f"Öğretim Üyesi {branch_id}-{i}" for i in range(max(1, courses // 3))]
+    dersler = []
+    for i in range(sections):
+        kontenjan = rnd.randint(20, 120)
+        ders_no = i % courses
+        dersler.append(DersProgramList(
+            ders_tanimi_id=branch_id * 10000 + ders_no,
+            akademik_donem_kodu=202510,
+            crn=branch_id * 100000 + i,
+            ders_kodu=f"B{branch_id:03d} {100 + ders_no}{'E' if ders_no % 2 else ''}",
+            ders_brans_kodu_id=branch_id,
+            dil_kodu='en' if ders_no % 2 else 'tr',
+            program_seviye_tipi='LS',
+            ders_adi=f"Ders {ders_no} Adı",
+            ogretim_yontemi='Yüz yüze',
+            ad_soyad=rnd.choice(hocalar),
+            mekan_adi=f"D{rnd.randint(1, 400)}",
+            gun_adi_tr=rnd.choice(GUNLER),
+            gun_adi_en='Monday',
+            baslangic_saati='08:30',
+            bitis_saati='11:29',
+            webde_goster=True,
+            bina_kodu=rnd.choice(BINALAR),
+            kontenjan=kontenjan,
+            ogrenci_sayisi=rnd.randint(0, kontenjan + 5),
+            program_seviye_tipi_id=2,
+            rezervasyon='-',
+            sinif_program='-',
+            on_sart='-',
+            sinif_onsart='-'
+        ))
+    return DersListesi(dersler, '2025-09-22 10:00')
+
+
+def timed(func, repeat: int = 5) -> float:
+    """En iyi çalıştırma süresi (sn)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_index(args):
+    """Takip edilen her ders için tam tarama ile ders kodu indeksinin karşılaştırması"""
+    snapshot = make_branch(26, sections=args.sections)
+    codes = sorted({x.ders_kodu for x in snapshot.ders_program_list})
+    tracked = random.Random(1).sample(codes, min(args.tracked, len(codes)))
+
+    def scan():
+        for code in tracked:
+            [i for i in snapshot.ders_program_list if i.ders_kodu == code]
+
+    def index():
+        fresh = DersListesi(snapshot.ders_program_list, snapshot.guncellenme_saati)
+        for code in tracked:
+            fresh.sections_for(code)
+
+    scan_time = timed(scan)
+    index_time = timed(index)
+    print(f"{args.sections} şube, {len(tracked)} takip edilen ders")
+    print(f"  tam tarama : {scan_time * 1000:8.2f} ms")
+    print(f"  indeks     : {index_time * 1000:8.2f} ms (indeks kurulumu dahil)")
+    print(f"  hızlanma   : {scan_time / index_time:8.1f}x")
+
+
+def catalog_payloads(branches: int, sections: int) -> list:
+    """Tüm katalog için OBS'den gelmiş gibi JSON metinleri üret"""
+    return [json.dumps(make_branch(b, sections=sections).to_dict()) for b in range(1, branches + 1)]
+
+
+def measure_memory(build) -> int:
+    """build() ile oluşturulan yapının tuttuğu bellek (bayt)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def bench_memory(args):
+    """Tüm katalog yüklendiğinde __dict__'li düz nesneler ile __slots__ + intern karşılaştırması"""
+    payloads = catalog_payloads(args.branches, args.sections)
+
+    def plain():
+        # Eski düzen: alan başına __dict__, her metin ayrı kopya
+        return [[SimpleNamespace(**row) for row in json.loads(p)['dersProgramList']] for p in payloads]
+
+    def compact():
+        return [DersListesi.from_dict(json.loads(p)) for p in payloads]
+
+    plain_size = measure_memory(plain)
+    compact_size = measure_memory(compact)
+    rows = args.branches * args.sections
+    print(f"{args.branches} branş, {rows} şube")
+    print(f"  __dict__ nesneler   : {plain_size / 2**20:8.1f} MB ({plain_size / rows:6.0f} B/şube)")
+    print(f"  __slots__ + intern  : {compact_size / 2**20:8.1f} MB ({compact_size / rows:6.0f} B/şube)")
+    print(f"  azalma              : {(1 - compact_size / plain_size) * 100:8.1f} %")
+
+
+def bench_columnar(args):
+    """Boş yer / fazla kayıt / değişim / doluluk hesabı: nesne yolu ile NumPy sütunları"""
+    from columnar import ColumnarSnapshot, HAS_NUMPY
+    if not HAS_NUMPY:
+        print("numpy kurulu değil")
+        return
+
+    previous = {b: make_branch(b, sections=args.sections) for b in range(1, args.branches + 1)}
+    current = {b: make_branch(b, sections=args.sections, seed=1) for b in range(1, args.branches + 1)}
+
+    def objects():
+        prev_open = {x.crn: max(0, x.kontenjan - x.ogrenci_sayisi)
+                     for s in previous.values() for x in s.ders_program_list}
+        open_seats = over = 0
+        deltas = {}
+        ratios = {}
+        for branch_id, snapshot in current.items():
+            capacity = enrolled = 0
+            for x in snapshot.ders_program_list:
+                free = max(0, x.kontenjan - x.ogrenci_sayisi)
+                open_seats += free
+                if x.ogrenci_sayisi > x.kontenjan:
+                    over += 1
+                before = prev_open.get(x.crn)
+                if before is not None and before != free:
+                    deltas[x.crn] = free - before
+                capacity += x.kontenjan
+                enrolled += min(x.ogrenci_sayisi, x.kontenjan)
+            ratios[branch_id] = enrolled / capacity if capacity else 1.0
+        return open_seats, over, deltas, ratios
+
+    prev_columnar = ColumnarSnapshot.from_snapshots(previous)
+    build_time = timed(lambda: ColumnarSnapshot.from_snapshots(current, prev_columnar.vocabulary), repeat=3)
+    cur_columnar = ColumnarSnapshot.from_snapshots(current, prev_columnar.vocabulary)
+
+    def vectorised():
+        cur_columnar.summary(prev_columnar)
+        cur_columnar.fill_ratios()
+
+    object_time = timed(objects, repeat=3)
+    vector_time = timed(vectorised, repeat=3)
+    print(f"{args.branches} branş, {len(cur_columnar)} şube")
+    print(f"  nesne yolu        : {object_time * 1000:8.1f} ms")
+    print(f"  numpy hesap       : {vector_time * 1000:8.1f} ms ({object_time / vector_time:.0f}x)")
+    print(f"  numpy sütun kurma : {build_time * 1000:8.1f} ms (görüntü başına bir kez)")
+
+
+class PerCallDatabase:
+    """Karşılaştırma için eski düzen: her çağrıda yeni bağlantı, varsayılan rollback journal"""
+
+    def __init__(self, db_path: str):
+        from database import DatabaseManager
+        DatabaseManager(db_path).close()  # Şemayı oluştur
+        conn = sqlite3.connect(db_path)
+        conn.execute('PRAGMA journal_mode=DELETE')
+        conn.close()
+        self.db_path = db_path
+
+    def _write(self, sql, params):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(sql, params)
+        conn.commit()
+        conn.close()
+
+    def _read(self, sql, params):
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(sql, params).fetchall()
+        conn.close()
+        return rows
+
+    def add_user(self, user_id, chat_id, username=None, first_name=None, last_name=None):
+        self._write('INSERT OR REPLACE INTO users (user_id, chat_id, username, first_name, last_name, is_active) '
+                    'VALUES (?, ?, ?, ?, ?, 1)', (user_id, chat_id, username, first_name, last_name))
+
+    def add_course_to_user(self, user_id, course_code, branch_id):
+        if self._read('SELECT id FROM user_courses WHERE user_id = ? AND course_code = ?', (user_id, course_code)):
+            return False
+        self._write('INSERT INTO user_courses (user_id, course_code, branch_id) VALUES (?, ?, ?)',
+                    (user_id, course_code, branch_id))
+        return True
+
+    def get_user_courses(self, user_id):
+        return self._read('SELECT course_code, branch_id FROM user_courses WHERE user_id = ?', (user_id,))
+
+    def get_users_by_course(self, course_code, branch_id):
+        return self._read('SELECT u.user_id, u.chat_id, u.first_name FROM users u '
+                          'JOIN user_courses uc ON u.user_id = uc.user_id '
+                          'WHERE uc.course_code = ? AND uc.branch_id = ? AND u.is_active = 1',
+                          (course_code, branch_id))
+
+
+def db_workload(db, users: int, courses: int = 200, seed: int = 0):
+    """Kullanıcı kaydı, ders ekleme, /list ve bildirim listesi sorgularından oluşan yük"""
+    rnd = random.Random(seed)
+    for user_id in range(1, users + 1):
+        db.add_user(user_id, user_id, f"kullanici{user_id}", "Ad", "Soyad")
+        for _ in range(3):
+            ders_no = rnd.randrange(courses)
+            db.add_course_to_user(user_id, f"MAT {100 + ders_no}", 1 + ders_no % 20)
+        db.get_user_courses(user_id)
+    for ders_no in range(courses):
+        db.get_users_by_course(f"MAT {100 + ders_no}", 1 + ders_no % 20)
+
+
+def bench_db(args):
+    """Çağrı başına bağlantı ile kalıcı WAL bağlantısının karşılaştırması"""
+    from database import DatabaseManager
+
+    operations = args.users * 5 + 200
+    with tempfile.TemporaryDirectory() as tmp:
+        old = PerCallDatabase(os.path.join(tmp, 'old.db'))
+        start = time.perf_counter()
+        db_workload(old, args.users)
+        old_time = time.perf_counter() - start
+
+        new = DatabaseManager(os.path.join(tmp, 'new.db'))
+        start = time.perf_counter()
+        db_workload(new, args.users)
+        new_time = time.perf_counter() - start
+        new.close()
+
+    print(f"{args.users} kullanıcı, {operations} işlem")
+    print(f"  çağrı başına bağlantı : {old_time:8.2f} sn ({operations / old_time:8.0f} işlem/sn)")
+    print(f"  kalıcı WAL bağlantısı : {new_time:8.2f} sn ({operations / new_time:8.0f} işlem/sn)")
+    print(f"  hızlanma              : {old_time / new_time:8.1f}x")
+
+
+# DatabaseManager'daki sorgular (EXPLAIN QUERY PLAN için)
+PLAN_QUERIES = {
+    'get_users_by_course': ('SELECT u.user_id, u.chat_id, u.first_name FROM users u '
+                            'JOIN user_courses uc ON u.user_id = uc.user_id '
+                            'WHERE uc.course_code = ? AND uc.branch_id = ? AND u.is_active = 1',
+                            ('MAT 150', 11)),
+    'get_user_courses': ('SELECT course_code, branch_id FROM user_courses WHERE user_id = ?', (42,)),
+    'get_all_active_users': ('SELECT u.user_id, u.chat_id, uc.course_code, uc.branch_id FROM users u '
+                             'JOIN user_courses uc ON u.user_id = uc.user_id WHERE u.is_active = 1', ()),
+    'remove_course_from_user': ('DELETE FROM user_courses WHERE user_id = ? AND course_code = ?', (42, 'MAT 150')),
+}
+
+
+def bench_queryplan(args):
+    """user_courses indeksleriyle ve indekssiz sorgu planları ve süreleri"""
+    from database import DatabaseManager
+
+    users = max(1, args.subscriptions // 4)
+    rnd = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'plan.db'))
+        with db._transaction() as cursor:
+            cursor.executemany('INSERT INTO users (user_id, chat_id, first_name) VALUES (?, ?, ?)',
+                               [(u, u, 'Ad') for u in range(1, users + 1)])
+            cursor.executemany('INSERT OR IGNORE INTO user_courses (user_id, course_code, branch_id) VALUES (?, ?, ?)',
+                               [(1 + i % users, f"MAT {100 + (d := rnd.randrange(2000))}", 1 + d % 161)
+                                for i in range(args.subscriptions)])
+            cursor.execute('ANALYZE')
+        count = db.conn.execute('SELECT COUNT(*) FROM user_courses').fetchone()[0]
+        lookups = [(f"MAT {100 + d}", 1 + d % 161) for d in rnd.sample(range(2000), 500)]
+
+        def run(label):
+            print(label)
+            plans = sqlite3.connect(db.db_path)  # Önbelleğe alınmış ifadelerden bağımsız plan
+            for name, (sql, params) in PLAN_QUERIES.items():
+                plan = '; '.join(row[3] for row in plans.execute('EXPLAIN QUERY PLAN ' + sql, params))
+                print(f"  {name:24}: {plan}")
+            plans.close()
+            elapsed = timed(lambda: [db.get_users_by_course(*lookup) for lookup in lookups], repeat=3)
+            print(f"  {len(lookups)} x get_users_by_course: {elapsed * 1000:8.1f} ms")
+            return elapsed
+
+        print(f"{count} abonelik, {users} kullanıcı")
+        indexed = run("İndeksli (şema sürümü " + str(db.schema_version()) + ")")
+        db.conn.execute('DROP INDEX idx_user_courses_course_branch')
+        db.conn.execute('DROP INDEX idx_user_courses_user_course')
+        scanned = run("İndekssiz")
+        print(f"  hızlanma: {scanned / indexed:.0f}x")
+        db.close()
+
+
+def bench_dbstall(args):
+    """
+    Komut yükü altında olay döngüsü gecikmesi: doğrudan sqlite3 çağrıları ile async veritabanı
+    Başka bir bağlantı düzenli aralıklarla yazma kilidini tutar (yedekleme, yavaş disk gibi).
+    """
+    import asyncio
+    import threading
+    from database import DatabaseManager, AsyncDatabaseManager
+    from loop_monitor import LoopLagMonitor
+
+    commands = min(args.users, 2000)
+
+    async def command(db, user_id, call):
+        # /add + /list benzeri bir komut
+        await call(db.add_course_to_user, user_id, f"MAT {100 + user_id % 500}", 1 + user_id % 161)
+        await call(db.get_user_courses, user_id)
+        await call(db.get_users_by_course, f"MAT {100 + user_id % 500}", 1 + user_id % 161)
+
+    async def direct(func, *call_args):
+        return func(*call_args)
+
+    def hold_write_lock(path, stop):
+        conn = sqlite3.connect(path, isolation_level=None)
+        while not stop.is_set():
+            conn.execute('BEGIN IMMEDIATE')
+            time.sleep(0.1)
+            conn.execute('COMMIT')
+            time.sleep(0.4)
+        conn.close()
+
+    async def measure(db, call):
+        stop = threading.Event()
+        locker = threading.Thread(target=hold_write_lock, args=(db.db_path, stop))
+        monitor = LoopLagMonitor(interval=0.01)
+        monitor_task = asyncio.create_task(monitor.run())
+        locker.start()
+        start = time.perf_counter()
+        tasks = []
+        for user_id in range(1, commands + 1):
+            tasks.append(asyncio.create_task(command(db, user_id, call)))
+            await asyncio.sleep(0.002)  # Komutlar ~500/sn gelir
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        locker.join()
+        monitor_task.cancel()
+        return elapsed, monitor.stats()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'stall.db'))
+        with db._transaction() as cursor:
+            cursor.executemany('INSERT INTO users (user_id, chat_id, first_name) VALUES (?, ?, ?)',
+                               [(u, u, 'Ad') for u in range(1, commands + 1)])
+        adb = AsyncDatabaseManager(db)
+
+        sync_time, sync_lag = asyncio.run(measure(db, direct))
+        db.conn.execute('DELETE FROM user_courses')
+        async_time, async_lag = asyncio.run(measure(db, lambda func, *a: adb.run(func, *a)))
+        adb.close()
+        db.close()
+
+    print(f"{commands} komut (her biri 3 sorgu), 500 ms'de bir 100 ms yazma kilidi")
+    for label, elapsed, lag in (("doğrudan sqlite3", sync_time, sync_lag), ("async veritabanı", async_time, async_lag)):
+        print(f"  {label} : {elapsed:6.2f} sn, döngü gecikmesi ort. {lag['avg_ms']:6.1f} ms, "
+              f"en uzun {lag['max_ms']:6.1f} ms, {lag['stalls']} takılma (>100 ms)")
+
+
+def bench_usercache(args):
+    """/list, /status benzeri okumalar: önbelleksiz ile LRU önbellekli async veritabanı"""
+    import asyncio
+    from database import DatabaseManager, AsyncDatabaseManager
+
+    rnd = random.Random(0)
+    active = [rnd.randint(1, args.users) for _ in range(20000)]  # Sık etkileşen kullanıcılar tekrar eder
+    active = [u for u in active for _ in range(1 + u % 3)]
+
+    async def commands(adb):
+        start = time.perf_counter()
+        for user_id in active:
+            await adb.get_user(user_id)
+            await adb.get_user_courses(user_id)
+            if user_id % 50 == 0:
+                await adb.add_course_to_user(user_id, f"FIZ {100 + user_id % 7}", 2)  # Ara sıra yazma
+        return time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'cache.db'))
+        with db._transaction() as cursor:
+            cursor.executemany('INSERT INTO users (user_id, chat_id, first_name) VALUES (?, ?, ?)',
+                               [(u, u, 'Ad') for u in range(1, args.users + 1)])
+            cursor.executemany('INSERT OR IGNORE INTO user_courses (user_id, course_code, branch_id) VALUES (?, ?, ?)',
+                               [(u, f"MAT {100 + (u * 7 + k) % 500}", 1) for u in range(1, args.users + 1)
+                                for k in range(3)])
+        uncached = AsyncDatabaseManager(db, cache_size=0)
+        uncached_time = asyncio.run(commands(uncached))
+        uncached.close()
+        cached = AsyncDatabaseManager(db, cache_size=args.users // 2)
+        cached_time = asyncio.run(commands(cached))
+        stats = cached.cache_stats()
+        cached.close()
+        db.close()
+
+    print(f"{len(active)} komut, {args.users} kullanıcı, önbellek {args.users // 2}")
+    print(f"  önbelleksiz : {uncached_time:6.2f} sn ({uncached_time / len(active) * 1e6:6.0f} µs/komut)")
+    print(f"  LRU önbellek: {cached_time:6.2f} sn ({cached_time / len(active) * 1e6:6.0f} µs/komut)")
+    print(f"  isabet      : profil {stats['users']['hit_ratio']}, ders listesi {stats['courses']['hit_ratio']}")
+
+
+def bench_coursecatalog(args):
+    """/add doğrulaması: ders kataloğunda arama, öneri ve diske yazma/okuma süreleri"""
+    from course_catalog import CourseCatalog
+
+    catalog = CourseCatalog()
+    snapshots = {b: make_branch(b, sections=args.sections) for b in range(1, args.branches + 1)}
+    for branch_id, snapshot in snapshots.items():
+        catalog.update(branch_id, snapshot)
+
+    rnd = random.Random(0)
+    queries = []
+    for _ in range(10000):
+        branch_id = rnd.randint(1, args.branches)
+        number = 100 + rnd.randint(0, 400)  # make_branch 250 ders üretir: yaklaşık yarısı yok
+        queries.append((branch_id, f"B{branch_id:03d} {number}{'E' if number % 2 else ''}"))
+
+    def scan():
+        # Karşılaştırma: branşın şubelerinde doğrusal arama
+        for branch_id, code in queries:
+            any(x.ders_kodu == code for x in snapshots[branch_id].ders_program_list)
+
+    def lookup():
+        for branch_id, code in queries:
+            catalog.contains(branch_id, code)
+
+    misses = [(b, c) for b, c in queries if not catalog.contains(b, c)][:1000]
+
+    def suggest():
+        for branch_id, code in misses:
+            catalog.suggest(branch_id, code)
+
+    scan_time = timed(scan, repeat=1)
+    lookup_time = timed(lookup)
+    suggest_time = timed(suggest, repeat=3)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'course_catalog.json')
+        save_time = timed(lambda: catalog.save(path), repeat=3)
+        load_time = timed(lambda: CourseCatalog().load(path), repeat=3)
+        size = os.path.getsize(path)
+
+    stats = catalog.stats()
+    print(f"{stats['branches']} branş, {stats['courses']} ders, {len(queries)} sorgu ({len(misses)} yok)")
+    print(f"  doğrusal tarama : {scan_time / len(queries) * 1e6:8.2f} µs/sorgu")
+    print(f"  katalog         : {lookup_time / len(queries) * 1e6:8.2f} µs/sorgu")
+    print(f"  öneri           : {suggest_time / len(misses) * 1e6:8.2f} µs/bulunamayan ders")
+    print(f"  diske yazma     : {save_time * 1000:8.2f} ms ({size / 1024:.0f} KiB), okuma {load_time * 1000:.2f} ms")
+
+
+DERS_KELIMELERI = [
+    'Giriş', 'Temel', 'İleri', 'Uygulamalı', 'Matematik', 'Fizik', 'Kimya', 'Devre', 'Teorisi', 'Elektronik',
+    'Sinyaller', 'Sistemler', 'Olasılık', 'İstatistik', 'Programlama', 'Veri', 'Yapıları', 'Algoritmalar',
+    'Mekanik', 'Termodinamik', 'Akışkanlar', 'Malzeme', 'Bilimi', 'Tasarım', 'Proje', 'Laboratuvar',
+    'Mühendislik', 'Ekonomi', 'Yönetim', 'Tarih', 'Türk', 'Dili', 'İngilizce', 'Lineer', 'Cebir',
+    'Diferansiyel', 'Denklemler', 'Sayısal', 'Yöntemler', 'Kontrol', 'Haberleşme', 'Ağları', 'Yapay',
+    'Zeka', 'Öğrenme', 'Görüntü', 'İşleme', 'Enerji', 'Çevre', 'Yapı', 'Statik', 'Dinamik', 'Gemi',
+]
+ADLAR = ['Ahmet', 'Mehmet', 'Ayşe', 'Fatma', 'Ali', 'Zeynep', 'Mustafa', 'Elif', 'Can', 'Şule', 'Işık',
+         'Gökhan', 'Özlem', 'Burak', 'Deniz', 'Emre', 'Selin', 'Tolga', 'Ümit', 'Çağla']
+SOYADLAR = ['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Öztürk', 'Aydın', 'Arslan', 'Doğan',
+            'Kılıç', 'Aslan', 'Çetin', 'Kara', 'Koç', 'Kurt', 'Özdemir', 'Erdem', 'Güneş', 'Aksoy']
+
+
+def search_catalog(branches: int, courses: int, seed: int = 0) -> list:
+    """Ders araması için gerçekçi ad ve öğretim üyeleriyle tüm katalog: (branş, kod, ad, öğretim üyeleri)"""
+    rnd = random.Random(seed)
+    entries = []
+    for branch_id in range(1, branches + 1):
+        hocalar = [f"{rnd.choice(ADLAR)} {rnd.choice(SOYADLAR)}" for _ in range(max(1, courses // 4))]
+        for ders_no in range(courses):
+            entries.append((
+                branch_id,
+                f"B{branch_id:03d} {100 + ders_no}{'E' if ders_no % 2 else ''}",
+                ' '.join(rnd.sample(DERS_KELIMELERI, rnd.randint(1, 4))),
+                rnd.sample(hocalar, rnd.randint(1, 3))
+            ))
+    return entries
+
+
+def bench_search(args):
+    """Inline ders araması: tüm katalogda sorgu gecikmesi (p50/p95/p99)"""
+    from course_search import CourseSearchIndex, fold_words
+
+    entries = search_catalog(args.branches, courses=250)
+    index = CourseSearchIndex()
+    build_time = timed(lambda: index.rebuild(entries), repeat=1)
+
+    def build():
+        fresh = CourseSearchIndex()
+        fresh.rebuild(entries)
+        return fresh
+
+    index_size = measure_memory(build)
+
+    rnd = random.Random(1)
+
+    def prefix(word):
+        word = ' '.join(fold_words(word))
+        return word[:rnd.randint(2, len(word))]
+
+    queries = []
+    for _ in range(5000):
+        branch_id, code, name, hocalar = rnd.choice(entries)
+        kind = rnd.randrange(6)
+        if kind == 0:
+            queries.append(code[:rnd.randint(2, len(code))].lower())        # Kod öneki: "b01", "B012 1"
+        elif kind == 1:
+            queries.append(prefix(rnd.choice(name.split())))                # Ders adı kelimesi
+        elif kind == 2:
+            queries.append(' '.join(prefix(w) for w in name.split()[:2]))   # İki kelime
+        elif kind == 3:
+            queries.append(prefix(rnd.choice(hocalar)))                     # Öğretim üyesi
+        elif kind == 4:
+            queries.append(f"{prefix(name.split()[0])} {prefix(hocalar[0].split()[-1])}")  # Ad + hoca
+        else:
+            queries.append(rnd.choice(['xq', 'zzz ders', 'b999 1', 'qwerty']))  # Sonuçsuz
+
+    latencies = []
+    results = 0
+    for query in queries:
+        start = time.perf_counter()
+        results += len(index.search(query))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(f"{len(index)} ders, {len(queries)} sorgu (ort. {results / len(queries):.1f} sonuç)")
+    print(f"  indeks kurulumu : {build_time * 1000:8.1f} ms, {index_size / 1024 / 1024:.1f} MiB")
+    print(f"  p50             : {percentile(0.50):8.3f} ms")
+    print(f"  p95             : {percentile(0.95):8.3f} ms")
+    print(f"  p99             : {percentile(0.99):8.3f} ms")
+    print(f"  en uzun         : {latencies[-1] * 1000:8.3f} ms")
+
+
+BENCHMARKS = {
+    'columnar': bench_columnar,
+    'coursecatalog': bench_coursecatalog,
+    'db': bench_db,
+    'dbstall': bench_dbstall,
+    'index': bench_index,
+    'memory': bench_memory,
+    'queryplan': bench_queryplan,
+    'search': bench_search,
+    'usercache': bench_usercache,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İTÜ kontenjan botu performans ölçümleri")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--branches', type=int, default=161)
+    parser.add_argument('--sections', type=int, default=1200)
+    parser.add_argument('--tracked', type=int, default=40)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--subscriptions', type=int, default=100000)
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == '__main__':
+    main()
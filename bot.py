@@ -1,12 +1,25 @@
 import time
 import httpx
-from bs4 import BeautifulSoup
 import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from telegram import Bot
 from telegram.constants import ParseMode
 from class_yapisi import DersProgramList, DersListesi
-from database import DatabaseManager
+from ders_parser import aiter_ders_rows, decode_snapshot, DecodeStats
+from database import get_database, get_async_database
 from telegram_bot import TelegramBot
+from scheduler import PollScheduler, parse_registration_windows
+from fingerprint import FingerprintStore, UNCHANGED, new_hasher
+from loop_monitor import LoopLagMonitor
+from columnar import ColumnarSnapshot, CourseCodeVocabulary, HAS_NUMPY
+from subscription_index import SubscriptionIndex
+from course_validator import CourseValidator
+from course_catalog import CourseCatalog
+from course_search import CourseSearchIndex
+from branch_catalog import CATALOG as BRANCH_CATALOG
+from kontenjan_state import SectionStateTable, NOTIFY_EVENTS, OPENED, INCREASED
+from notifier import NotificationDispatcher, pack_digest, is_unreachable_chat
 import os
 import logging
 
@@ -14,230 +27,647 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Veritabanı
-db = DatabaseManager()
+# Veritabanı (TelegramBot ile aynı bağlantı; sorgular ayrı iş parçacığında, olay döngüsü beklemez)
+# Bu modül ayrıştırma süreçlerinde yeniden içe aktarılabilir: veritabanı, bot ve yüklemeler initialize()'da kurulur
+db = None
 
-def parse_html_ders_list(html_text, branscode):
-    try:
-        soup = BeautifulSoup(html_text, 'html.parser')
-        table = soup.find('table', id='dersProgramContainer')
-        if table is None:
-            return DersListesi(ders_program_list=[], guncellenme_saati="")
-        tbody = table.find('tbody')
-        if tbody is None:
-            return DersListesi(ders_program_list=[], guncellenme_saati="")
-
-        dersler = []
-        for tr in tbody.find_all('tr'):
-            tds = tr.find_all('td')
-            if len(tds) < 11:
-                continue
+# Şube bazında kontenjan durum tablosu (yeniden başlatmada veritabanından yüklenir)
+KONTENJAN_DEBOUNCE = float(os.getenv('KONTENJAN_DEBOUNCE', '600'))  # Aynı şube için bildirimler arası en kısa süre (sn)
+section_states = SectionStateTable(debounce=KONTENJAN_DEBOUNCE)
 
-            def td_text(idx):
-                if idx >= len(tds):
-                    return "-"
-                return tds[idx].get_text(strip=True).replace('\r', ' ').replace('\n', ' ')
-
-            crn_text = td_text(0)
-            ders_kodu_text = tds[1].get_text(strip=True) if len(tds) > 1 else "-"
-            ders_adi_text = td_text(2)
-            ogretim_yontemi_text = td_text(3)
-            ad_soyad_text = td_text(4)
-            bina_kodu_text = tds[5].get_text(strip=True) if len(tds) > 5 else "-"
-            gun_text = td_text(6)
-            saat_text = td_text(7)
-            derslik_text = td_text(8)
-            kontenjan_text = td_text(9)
-            ogrenci_sayisi_text = td_text(10)
-            rezervasyon_text = td_text(11) if len(tds) > 11 else "-"
-            programlar_text = td_text(12) if len(tds) > 12 else "-"
-            on_sart_text = td_text(13) if len(tds) > 13 else "-"
-            sinif_onsart_text = td_text(14) if len(tds) > 14 else "-"
+def repair_branch_ids(database):
+    """Eski elle yazılmış eşlemeyle kaydedilmiş yanlış branş ID'lerini katalogdaki doğru ID'lerle düzelt"""
+    fixes = {}
+    for course_code, branch_id in database.get_course_branches():
+        expected = CourseValidator.branch_id_for(course_code)
+        if expected is None:
+            logger.warning(f"{course_code} dersinin branşı katalogda yok (kayıtlı ID {branch_id})")
+        elif expected != branch_id:
+            fixes[course_code] = expected
+    if fixes:
+        updated = database.update_course_branches(fixes)
+        logger.info(f"{len(fixes)} dersin branş ID'si düzeltildi ({updated} abonelik): {sorted(fixes)}")
 
-            try:
-                crn = int(crn_text) if crn_text.isdigit() else 0
-            except Exception:
-                crn = 0
+# Abonelik indeksi (branş -> ders -> sohbetler); komutlar günceller, veritabanıyla periyodik eşitlenir
+subscriptions = SubscriptionIndex()
 
-            try:
-                kontenjan = int(kontenjan_text) if kontenjan_text.isdigit() else 0
-            except Exception:
-                kontenjan = 0
+NOTIFICATION_TITLES = {
+    OPENED: "🎓 **Kontenjan Açıldı!**",
+    INCREASED: "📈 **Kontenjan Arttı!**",
+}
 
-            try:
-                ogrenci_sayisi = int(ogrenci_sayisi_text) if ogrenci_sayisi_text.isdigit() else 0
-            except Exception:
-                ogrenci_sayisi = 0
-
-            baslangic = "-"
-            bitis = "-"
-            if '/' in saat_text:
-                parts = saat_text.split('/')
-                if len(parts) >= 2:
-                    baslangic = parts[0]
-                    bitis = parts[1]
-
-            ders = DersProgramList(
-                ders_tanimi_id=0,
-                akademik_donem_kodu=0,
-                crn=crn,
-                ders_kodu=ders_kodu_text,
-                ders_brans_kodu_id=branscode,
-                dil_kodu="",
-                program_seviye_tipi="LS",
-                ders_adi=ders_adi_text,
-                ogretim_yontemi=ogretim_yontemi_text,
-                ad_soyad=ad_soyad_text,
-                mekan_adi=derslik_text,
-                gun_adi_tr=gun_text,
-                gun_adi_en="",
-                baslangic_saati=baslangic,
-                bitis_saati=bitis,
-                webde_goster=True,
-                bina_kodu=bina_kodu_text,
-                kontenjan=kontenjan,
-                ogrenci_sayisi=ogrenci_sayisi,
-                program_seviye_tipi_id=2,
-                rezervasyon=rezervasyon_text,
-                sinif_program=programlar_text,
-                on_sart=on_sart_text,
-                sinif_onsart=sinif_onsart_text
-            )
-            dersler.append(ders)
-
-        return DersListesi(ders_program_list=dersler, guncellenme_saati="")
-    except Exception:
-        return DersListesi(ders_program_list=[], guncellenme_saati="")
+def render_event(event):
+    """Kontenjan olayının bildirim metni"""
+    i = event.ders
+    return f"{NOTIFICATION_TITLES[event.tur]}\n\n" \
+           f"📚 **Ders:** {i.ders_adi}\n" \
+           f"🔢 **Ders Kodu:** {i.ders_kodu}\n" \
+           f"📊 **Mevcut Kontenjan:** {event.bos}\n" \
+           f"🏫 **CRN:** {i.crn}\n" \
+           f"👨‍🏫 **Öğretim Üyesi:** {i.ad_soyad}\n" \
+           f"📍 **Derslik:** {i.mekan_adi}\n" \
+           f"🕐 **Saat:** {i.baslangic_saati} - {i.bitis_saati}\n" \
+           f"📅 **Gün:** {i.gun_adi_tr}"
 
-async def check_contenjan(derscode, derslistmy, branch_id, telegram_bot):
-    """Kontenjan kontrolü - çok kullanıcılı"""
+async def check_contenjan(derscode, derslistmy, branch_id, telegram_bot, outbox=None):
+    """
+    Kontenjan kontrolü - çok kullanıcılı
+    Sadece gerçek durum değişikliklerinde (dolu -> açık, yer arttı) takipçiler için bildirim satırı üretir.
+    outbox: bildirim satırlarının ekleneceği liste (şube durumlarıyla birlikte veritabanına yazılır)
+    Returns: oluşan kontenjan olayları
+    """
     if derslistmy is None:
-        return
+        return []
     
-    # Bu dersi takip eden kullanıcıları getir
-    users = db.get_users_by_course(derscode, branch_id)
-    
-    if not users:
-        return  # Kimse bu dersi takip etmiyor
-    
-    for i in derslistmy.ders_program_list:
-        if (i.ders_kodu == derscode) and (i.ogrenci_sayisi != i.kontenjan):
-            available_spots = i.kontenjan - i.ogrenci_sayisi
-            
-            # Her kullanıcıya ayrı ayrı bildirim gönder
-            for user in users:
-                message = f"🎓 **Kontenjan Açıldı!**\n\n" \
-                         f"📚 **Ders:** {i.ders_adi}\n" \
-                         f"🔢 **Ders Kodu:** {i.ders_kodu}\n" \
-                         f"📊 **Mevcut Kontenjan:** {available_spots}\n" \
-                         f"🏫 **CRN:** {i.crn}\n" \
-                         f"👨‍🏫 **Öğretim Üyesi:** {i.ad_soyad}\n" \
-                         f"📍 **Derslik:** {i.mekan_adi}\n" \
-                         f"🕐 **Saat:** {i.baslangic_saati} - {i.bitis_saati}\n" \
-                         f"📅 **Gün:** {i.gun_adi_tr}"
-                
-                try:
-                    await telegram_bot.send_notification(user['chat_id'], message)
-                    logger.info(f"Bildirim gönderildi: {derscode} -> {user['first_name']} ({user['chat_id']})")
-                except Exception as e:
-                    logger.error(f"Bildirim gönderme hatası: {e}")
+    dersler = derslistmy.sections_for(derscode)
+    events = section_states.update(branch_id, dersler)
+    notify_events = [e for e in events if e.tur in NOTIFY_EVENTS]
+    
+    for event in events:
+        logger.info(f"Kontenjan olayı: {event.ders_kodu} CRN {event.crn} {event.tur} ({event.onceki_bos} -> {event.bos})")
+    
+    if not notify_events:
+        return events
+    
+    # Bu dersi takip eden sohbetler (bellekteki abonelik indeksinden)
+    chat_ids = subscriptions.chats_for(branch_id, derscode)
+    
+    if not chat_ids or outbox is None:
+        return events  # Kimse bu dersi takip etmiyor
+    
+    for event in notify_events:
+        # Metin bir kez oluşturulur, tüm takipçilerin satırında aynı nesne kullanılır
+        message = render_event(event)
+        for chat_id in chat_ids:
+            outbox.append({
+                'dedupe_key': f"{chat_id}:{event.crn}:{event.tur}:{int(event.zaman)}",
+                'chat_id': chat_id,
+                'text': message,
+                'created_at': event.zaman
+            })
+    logger.info(f"{derscode}: {len(notify_events)} bildirim {len(chat_ids)} sohbet için kuyruğa alındı")
+    
+    return events
+
+# OBS HTTP ayarları
+HTTP_CONCURRENCY = int(os.getenv('HTTP_CONCURRENCY', '8'))  # Aynı anda çekilecek en fazla branş
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '10'))
+HTTP_KEEPALIVE_CONNECTIONS = int(os.getenv('HTTP_KEEPALIVE_CONNECTIONS', '10'))
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '20'))
+STREAM_PARSE = os.getenv('STREAM_PARSE', '0') == '1'  # HTML'i indirilirken artımlı ayrıştır (olay döngüsünde)
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', str(min(4, os.cpu_count() or 1))))  # 0: ayrıştırma aynı süreçte
+# Ayrıştırma süreçlerinin başlatılma yöntemi; fork iş parçacıklı süreçten kopyalar, spawn her platformda aynı davranır
+PARSE_START_METHOD = os.getenv('PARSE_START_METHOD', 'spawn')
+
+OBS_URL = "https://obs.itu.edu.tr/public/DersProgram/DersProgramSearch"
+
+# OBS'ye aynı anda yapılan istek sınırı (takip sorguları ve ders kataloğu yenilemesi paylaşır)
+obs_semaphore = asyncio.Semaphore(HTTP_CONCURRENCY)
+
+# Süreç boyunca paylaşılan HTTP istemcisi (keep-alive ile bağlantılar yeniden kullanılır)
+_http_client = None
+
+def get_http_client():
+    """Paylaşılan httpx istemcisini getir, yoksa oluştur"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS
+            ),
+            timeout=httpx.Timeout(HTTP_TIMEOUT)
+        )
+    return _http_client
+
+async def close_http_client():
+    """Paylaşılan httpx istemcisini kapat"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+# Branş bazında yanıt parmak izleri (değişmeyen yanıtlar ayrıştırılmaz)
+fingerprints = FingerprintStore()
+
+# Ayrıştırma işçi havuzu (BeautifulSoup/from_dict olay döngüsünü bloklamasın diye)
+_parse_executor = None
+
+def get_parse_executor():
+    """Ayrıştırma süreç havuzunu getir, yoksa oluştur"""
+    global _parse_executor
+    if _parse_executor is None:
+        _parse_executor = ProcessPoolExecutor(
+            max_workers=PARSE_WORKERS,
+            mp_context=multiprocessing.get_context(PARSE_START_METHOD)
+        )
+    return _parse_executor
+
+def start_parse_executor():
+    """Ayrıştırma süreçlerini iş parçacıkları (sqlite, to_thread, PTB) başlamadan önce başlat"""
+    if PARSE_WORKERS > 0:
+        get_parse_executor().submit(os.getpid).result()
+
+def shutdown_parse_executor():
+    """Ayrıştırma süreç havuzunu kapat"""
+    global _parse_executor
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=False, cancel_futures=True)
+        _parse_executor = None
 
-async def check_list(branscode):
+# Çözme yolu (json/html) başına süre istatistikleri
+decode_stats = DecodeStats()
+
+# Bildirim ve durum takibi için gereken alanlar (diğer alanlar çözülmez)
+SNAPSHOT_FIELDS = (
+    'crn', 'ders_kodu', 'ders_adi', 'ad_soyad', 'mekan_adi', 'gun_adi_tr',
+    'baslangic_saati', 'bitis_saati', 'kontenjan', 'ogrenci_sayisi'
+)
+
+async def decode_response(response, branscode, wanted_codes=None):
+    """
+    Tamamı okunmuş yanıtı DersListesi'ne çevir
+    wanted_codes verilirse sadece bu derslerin satırları çözülür
+    """
+    content = response.content
+    content_type = response.headers.get('content-type')
+    logger.debug(f"Branş {branscode} yanıt uzunluğu: {len(content)}")
+    
+    fields = SNAPSHOT_FIELDS if wanted_codes is not None else None
+    if PARSE_WORKERS <= 0:
+        result = decode_snapshot(content, response.encoding, branscode, content_type, wanted_codes, fields)
+    else:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            get_parse_executor(), decode_snapshot, content, response.encoding, branscode, content_type,
+            wanted_codes, fields
+        )
+    guncellenme_saati, rows, kind, elapsed = result
+    decode_stats.record(kind, elapsed)
+    derslist = DersListesi.from_rows(rows, guncellenme_saati)
+    
+    logger.debug(f"Branş {branscode}: {kind} ayrıştırma ile {len(derslist.ders_program_list)} ders bulundu ({elapsed * 1000:.1f} ms)")
+    return derslist
+
+async def check_list_stream(branscode, params, wanted_codes=None):
+    """Yanıtı akış halinde al, HTML tablosunu indirme sürerken ayrıştır"""
+    client = get_http_client()
+    async with client.stream('GET', OBS_URL, params=params,
+                             headers=fingerprints.conditional_headers(branscode)) as response:
+        logger.debug(f"Branş {branscode} API durum kodu: {response.status_code}")
+        
+        if response.status_code == 304 and fingerprints.is_unchanged(branscode, response):
+            return UNCHANGED
+        if response.status_code != 200:
+            logger.warning(f"Branş {branscode} için {response.status_code} hatası alındı.")
+            return None
+        
+        if 'json' in response.headers.get('content-type', '').lower():
+            await response.aread()
+            if fingerprints.is_unchanged(branscode, response):
+                return UNCHANGED
+            derslist = await decode_response(response, branscode, wanted_codes)
+            fingerprints.remember(branscode, response)
+            return derslist
+        
+        # Gövde özeti akış sonunda belli olur; değişmediyse satırlar atılır ve diff yapılmaz
+        hasher = new_hasher()
+        parse_start = time.perf_counter()
+        dersler = [ders async for ders in aiter_ders_rows(
+            response, branscode, hasher, wanted_codes, SNAPSHOT_FIELDS if wanted_codes is not None else None
+        )]
+        digest = hasher.digest()
+        if fingerprints.is_unchanged(branscode, response, digest):
+            return UNCHANGED
+        
+        decode_stats.record('html_stream', time.perf_counter() - parse_start)  # İndirme süresi dahil
+        logger.debug(f"Branş {branscode}: HTML akış ayrıştırma ile {len(dersler)} ders bulundu")
+        fingerprints.remember(branscode, response, digest)
+        return DersListesi(ders_program_list=dersler, guncellenme_saati="")
+
+async def check_list(branscode, wanted_codes=None):
+    """
+    Branşın ders listesini çek
+    wanted_codes: verilirse sadece bu ders kodlarının satırları çözülür (None: tüm branş)
+    Returns: DersListesi, yanıt değişmediyse UNCHANGED, hata durumunda None
+    """
+    params = {
+        'ProgramSeviyeTipiAnahtari': 'LS',
+        'dersBransKoduId': branscode
+    }
     try:
-        async with httpx.AsyncClient() as client:
-            link = f"https://obs.itu.edu.tr/public/DersProgram/DersProgramSearch?ProgramSeviyeTipiAnahtari=LS&dersBransKoduId={branscode}"
-            response = await client.get(link)
-            print(f"API Status Code: {response.status_code}")
-            
-            if response.status_code == 200:
-                response_text = response.text
-                print(f"Response Length: {len(response_text)}")
-                
-                try:
-                    response_json = response.json()
-                    print("JSON parsing başarılı")
-                    derslist = DersListesi.from_dict(response_json)
-                    return derslist
-                except Exception as json_error:
-                    print(f"JSON parsing hatası: {json_error}")
-                    derslist = parse_html_ders_list(response_text, branscode)
-                    print(f"HTML parse ile {len(derslist.ders_program_list)} ders bulundu")
-                    return derslist
-            else:
-                print(f"Hata: {response.status_code} hatası aldınız.")
-                return None
-    except Exception as e:
-        print(f"API çağrısında hata: {e}")
+        if STREAM_PARSE:
+            return await check_list_stream(branscode, params, wanted_codes)
+        
+        client = get_http_client()
+        response = await client.get(OBS_URL, params=params,
+                                    headers=fingerprints.conditional_headers(branscode))
+        logger.debug(f"Branş {branscode} API durum kodu: {response.status_code}")
+        
+        if response.status_code in (200, 304) and fingerprints.is_unchanged(branscode, response):
+            return UNCHANGED
+        
+        if response.status_code == 200:
+            derslist = await decode_response(response, branscode, wanted_codes)
+            fingerprints.remember(branscode, response)
+            return derslist
+        else:
+            logger.warning(f"Branş {branscode} için {response.status_code} hatası alındı.")
+            return None
+    except Exception:
+        logger.exception(f"Branş {branscode} API çağrısında hata")
         return None
 
 # Telegram bot API token
 API_TOKEN = os.getenv('BOT_TOKEN', '8354560097:AAHifiQmARkiVHj4IUHtsvE3iNgIeT4BpuU')
 
-# Telegram bot oluştur
-telegram_bot = TelegramBot(API_TOKEN)
+# Branş başına gerçek ders kodları (/add doğrulaması için; diskten yüklenir, arka planda TTL'e göre yenilenir)
+COURSE_CATALOG_REFRESH_INTERVAL = float(os.getenv('COURSE_CATALOG_REFRESH_INTERVAL', '60'))  # İki yenileme arası (sn)
+COURSE_CATALOG_BATCH = int(os.getenv('COURSE_CATALOG_BATCH', '1'))  # Her yenilemede çekilen en fazla branş
+# Katalog istekleri OBS_REQUESTS_PER_MINUTE bütçesinden düşülür; kovada takip sorguları için bu oranda hak kalmalı
+COURSE_CATALOG_BUDGET_RESERVE = float(os.getenv('COURSE_CATALOG_BUDGET_RESERVE', '0.5'))
+course_catalog = CourseCatalog()
 
-async def main():
-    """Ana kontrol fonksiyonu - çok kullanıcılı"""
+# Inline ders araması için kelime indeksi (katalog her yenilendiğinde yeniden kurulur)
+course_search = CourseSearchIndex()
+
+async def fetch_full_list(branscode):
+    """
+    Branşın tüm derslerini çek (ders kataloğu için)
+    Parmak izi kullanılmaz, takip sorgularının değişiklik tespitini etkilemez
+    Returns: DersListesi, hata durumunda None
+    """
+    params = {
+        'ProgramSeviyeTipiAnahtari': 'LS',
+        'dersBransKoduId': branscode
+    }
     try:
-        logger.info("Ders programı kontrol ediliyor...")
-        
-        # Tüm aktif kullanıcıları ve derslerini getir
-        all_users = db.get_all_active_users()
-        
-        if not all_users:
-            logger.info("Takip edilen ders bulunmuyor.")
-            return
+        response = await get_http_client().get(OBS_URL, params=params)
+        if response.status_code != 200:
+            logger.warning(f"Branş {branscode} ders listesi alınamadı: {response.status_code}")
+            return None
+        return await decode_response(response, branscode)
+    except Exception as e:
+        logger.error(f"Branş {branscode} ders listesi alınırken hata: {e}")
+        return None
+
+async def refresh_course_catalog():
+    """
+    Eskimiş branş listelerinden en fazla COURSE_CATALOG_BATCH tanesini yenile, diske yaz ve arama indeksini yeniden kur
+    Returns: yenilenen branş sayısı
+    """
+    refreshed = 0
+    for branscode in course_catalog.stale_branches(BRANCH_CATALOG.by_id)[:COURSE_CATALOG_BATCH]:
+        # Takip sorgularıyla aynı istek bütçesi ve eşzamanlılık sınırı
+        if not scheduler.try_acquire(reserve=OBS_REQUESTS_PER_MINUTE * COURSE_CATALOG_BUDGET_RESERVE):
+            logger.debug("İstek bütçesi takip sorgularına ayrıldı, ders kataloğu yenilemesi ertelendi.")
+            break
+        async with obs_semaphore:
+            derslist = await fetch_full_list(branscode)
+        if derslist:
+            course_catalog.update(branscode, derslist)
+            refreshed += 1
+    if refreshed:
+        await asyncio.to_thread(course_catalog.save)
+        await asyncio.to_thread(course_search.rebuild, course_catalog.entries())
+    return refreshed
+
+async def run_course_catalog():
+    """Ders kataloğu yenileme döngüsü (kullanıcıların sorduğu branşlar önce)"""
+    while True:
+        try:
+            await refresh_course_catalog()
+        except Exception as e:
+            logger.error(f"Ders kataloğu yenilenirken hata: {e}")
+        await asyncio.sleep(COURSE_CATALOG_REFRESH_INTERVAL)
+
+# Telegram botu ve bildirim kuyruğu (initialize()'da oluşturulur)
+telegram_bot = None
+notifier = None
+
+# Bildirim kuyruğu ayarları
+NOTIFY_WORKERS = int(os.getenv('NOTIFY_WORKERS', '8'))
+NOTIFY_RATE = float(os.getenv('NOTIFY_RATE', '30'))  # Telegram genel sınırı (mesaj/sn)
+NOTIFY_CHAT_INTERVAL = float(os.getenv('NOTIFY_CHAT_INTERVAL', '1'))  # Aynı sohbete iki mesaj arası (sn)
+NOTIFY_MAX_RETRIES = int(os.getenv('NOTIFY_MAX_RETRIES', '5'))
+
+# Bildirim outbox'ı (veritabanında; yeniden başlatmada gönderilmemiş bildirimler kaybolmaz)
+NOTIFY_DIGEST_WINDOW = float(os.getenv('NOTIFY_DIGEST_WINDOW', '10'))  # Yeni bildirimler sohbet başına bu süre toplanır (sn)
+OUTBOX_POLL_INTERVAL = float(os.getenv('OUTBOX_POLL_INTERVAL', '30'))  # Yeniden denemeler için kontrol aralığı (sn)
+OUTBOX_BATCH = int(os.getenv('OUTBOX_BATCH', '500'))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+OUTBOX_RETRY_BASE = float(os.getenv('OUTBOX_RETRY_BASE', '30'))  # İlk yeniden deneme gecikmesi (sn), her denemede iki katı
+OUTBOX_RETENTION = float(os.getenv('OUTBOX_RETENTION', '86400'))  # Gönderilmiş satırların saklanma süresi (sn)
+
+outbox_wakeup = asyncio.Event()
+
+async def deliver_outbox():
+    """
+    Bekleyen bildirimleri sohbet başına özet mesajlarda gönder
+    Gönderilen satırlar işaretlenir, gönderilemeyenler artan beklemeyle yeniden denenir.
+    Returns: gönderilen bildirim sayısı
+    """
+    rows = await db.get_pending_notifications(time.time(), OUTBOX_MAX_ATTEMPTS, OUTBOX_BATCH)
+    if not rows:
+        return 0
+    
+    rows_by_chat = {}
+    attempts = {}
+    for row in rows:
+        rows_by_chat.setdefault(row['chat_id'], []).append((row['id'], row['text']))
+        attempts[row['id']] = row['attempts']
+    
+    sends = [
+        (chat_id, ids, notifier.submit(chat_id, text))
+        for chat_id, items in rows_by_chat.items()
+        for ids, text in pack_digest(items)
+    ]
+    
+    sent = 0
+    unreachable = set()
+    for chat_id, ids, future in sends:
+        try:
+            await future
+            await db.mark_notifications_sent(ids, time.time())
+            sent += len(ids)
+        except Exception as e:
+            if is_unreachable_chat(e):
+                # Engellenmiş / silinmiş sohbet: yeniden deneme yok, kullanıcı pasif yapılır
+                unreachable.add(chat_id)
+                continue
+            delay = OUTBOX_RETRY_BASE * 2 ** max(attempts[i] for i in ids)
+            await db.mark_notifications_failed(ids, str(e), time.time() + delay)
+    
+    if unreachable:
+        deactivated = await db.deactivate_chats(sorted(unreachable))
+        subscriptions.deactivate_chats(unreachable)
+        logger.info(f"Ulaşılamayan {len(unreachable)} sohbet için {deactivated} kullanıcı pasif yapıldı")
+    
+    logger.info(f"Outbox: {sent}/{len(rows)} bildirim {len(rows_by_chat)} sohbete gönderildi")
+    return sent
+
+async def run_outbox():
+    """Outbox teslimat döngüsü - açılışta bekleyenleri, sonra yeni eklenenleri gönderir"""
+    while True:
+        outbox_wakeup.clear()
+        try:
+            await deliver_outbox()
+        except Exception as e:
+            logger.error(f"Outbox teslimatında hata: {e}")
         
-        # Dersleri branş ID'lerine göre grupla
-        courses_by_branch = {}
-        for user in all_users:
-            branch_id = user['branch_id']
-            course_code = user['course_code']
-            
-            if branch_id not in courses_by_branch:
-                courses_by_branch[branch_id] = set()
-            courses_by_branch[branch_id].add(course_code)
+        try:
+            await asyncio.wait_for(outbox_wakeup.wait(), timeout=OUTBOX_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            continue
+        await asyncio.sleep(NOTIFY_DIGEST_WINDOW)  # Aynı pencerede oluşan bildirimleri topla
+
+# Olay döngüsü gecikme ölçer (komutların ne kadar bekletildiğini gösterir)
+loop_monitor = LoopLagMonitor(interval=float(os.getenv('LOOP_LAG_INTERVAL', '0.1')))
+
+# Zamanlayıcı ayarları
+POLL_BASE_INTERVAL = float(os.getenv('POLL_BASE_INTERVAL', '240'))  # 1 takipçili branş için aralık (sn)
+POLL_MIN_INTERVAL = float(os.getenv('POLL_MIN_INTERVAL', '30'))
+POLL_MAX_INTERVAL = float(os.getenv('POLL_MAX_INTERVAL', '900'))
+OBS_REQUESTS_PER_MINUTE = int(os.getenv('OBS_REQUESTS_PER_MINUTE', '60'))  # OBS'ye toplam istek bütçesi
+REGISTRATION_WINDOWS = os.getenv('REGISTRATION_WINDOWS', '')  # "2026-09-22T10:00/2026-09-26T17:00;..."
+PLAN_REFRESH_INTERVAL = float(os.getenv('PLAN_REFRESH_INTERVAL', '60'))  # Takip listesini yenileme (sn)
+SUBSCRIPTION_RECONCILE_INTERVAL = float(os.getenv('SUBSCRIPTION_RECONCILE_INTERVAL', '900'))  # İndeks/veritabanı eşitleme (sn)
+SCHEDULER_STATS_INTERVAL = float(os.getenv('SCHEDULER_STATS_INTERVAL', '300'))  # Zamanlayıcı özetinin loglanma aralığı (sn)
+
+scheduler = PollScheduler(
+    base_interval=POLL_BASE_INTERVAL,
+    min_interval=POLL_MIN_INTERVAL,
+    max_interval=POLL_MAX_INTERVAL,
+    requests_per_minute=OBS_REQUESTS_PER_MINUTE,
+    registration_windows=parse_registration_windows(REGISTRATION_WINDOWS)
+)
+
+# Branş bazında son sorgudaki takip edilen dersler
+tracked_courses = {}
+
+# Branş bazında veritabanına yazılamamış outbox satırları (kayıt hatasında kaybolmasın)
+unsaved_notifications = {}
+
+# Takip edilen şubelerin sütun tabanlı özeti (numpy kuruluysa ve COLUMNAR_SUMMARY=1 ise)
+# Sorgular sadece takip edilen derslerin satırlarını çözer, özet tüm kataloğu değil bu şubeleri kapsar
+COLUMNAR_SUMMARY = os.getenv('COLUMNAR_SUMMARY', '0') == '1' and HAS_NUMPY
+latest_snapshots = {}  # Takip edilen branş -> son görüntü (takipten çıkan branşlar silinir)
+columnar_vocabulary = CourseCodeVocabulary()
+previous_columnar = None
+
+def log_columnar_summary():
+    """Son görüntülerden takip edilen şubelerin boş yer, fazla kayıt ve doluluk özetini logla"""
+    global previous_columnar
+    if not COLUMNAR_SUMMARY or not latest_snapshots:
+        return
+    
+    columnar = ColumnarSnapshot.from_snapshots(latest_snapshots, columnar_vocabulary)
+    summary = columnar.summary(previous_columnar)
+    fullest = sorted(columnar.fill_ratios().items(), key=lambda item: item[1], reverse=True)[:5]
+    logger.info(f"Takip edilen şubelerin özeti: {summary}, "
+                f"en dolu branşlar: {[(b, round(r, 2)) for b, r in fullest]}")
+    previous_columnar = columnar
+
+def prune_snapshots(tracked_branches):
+    """Artık takip edilmeyen branşların son görüntülerini at"""
+    for branscode in [b for b in latest_snapshots if b not in tracked_branches]:
+        del latest_snapshots[branscode]
+
+def build_work_plan():
+    """Takip edilen dersleri ve takipçi sayılarını branş ID'lerine göre grupla (bellekteki indeksten)"""
+    return subscriptions.work_plan()
+
+async def reconcile_subscriptions():
+    """Abonelik indeksini veritabanıyla eşitle (kaçırılmış güncellemeleri düzeltir)"""
+    version = subscriptions.version
+    rows = await db.get_all_active_users()
+    drift = subscriptions.reconcile(rows, version)
+    if drift:
+        logger.warning(f"Abonelik indeksi veritabanından farklıydı, {drift} abonelik düzeltildi")
+    return drift
+
+async def check_branch(branscode, ders_kodlari, semaphore):
+    """
+    Tek bir branşı çek ve takip edilen derslerin kontenjanını kontrol et
+    Returns: kontenjan durumu bir önceki sorgudan farklı mı
+    """
+    try:
+        # Takip edilen dersler değiştiyse yanıt aynı olsa bile yeniden ayrıştır
+        if tracked_courses.get(branscode) != ders_kodlari:
+            fingerprints.invalidate(branscode)
+            tracked_courses[branscode] = set(ders_kodlari)
+        # Ertelenmiş bildirimin süresi dolduysa yanıt aynı olsa bile yeniden değerlendir
+        if section_states.has_due_notification(branscode, ders_kodlari):
+            fingerprints.invalidate(branscode)
         
-        # Her branş için kontrol yap
-        for branscode, ders_kodlari in courses_by_branch.items():
+        async with semaphore:
             logger.info(f"Branş {branscode} kontrol ediliyor: {list(ders_kodlari)}")
-            derslistmy = await check_list(branscode=branscode)
-            
-            if derslistmy:
-                for ders_kodu in ders_kodlari:
-                    await check_contenjan(derscode=ders_kodu, derslistmy=derslistmy, 
-                                        branch_id=branscode, telegram_bot=telegram_bot)
+            fetch_start = time.perf_counter()
+            derslistmy = await check_list(branscode=branscode, wanted_codes=frozenset(ders_kodlari))
+            logger.debug(f"Branş {branscode} {time.perf_counter() - fetch_start:.2f} sn'de çekildi.")
+        
+        if derslistmy is UNCHANGED:
+            logger.debug(f"Branş {branscode} değişmedi, ayrıştırma atlandı.")
+            return False
+        if not derslistmy:
+            return False
+        if COLUMNAR_SUMMARY:
+            latest_snapshots[branscode] = derslistmy
         
-        logger.info("Kontrol tamamlandı.")
+        # Önceki sorguda kaydedilemeyen bildirimler bu kayıtla tekrar denenir (dedupe_key çift eklemeyi önler)
+        notifications = unsaved_notifications.pop(branscode, [])
+        for ders_kodu in ders_kodlari:
+            await check_contenjan(derscode=ders_kodu, derslistmy=derslistmy, 
+                                branch_id=branscode, telegram_bot=telegram_bot, outbox=notifications)
         
+        # Değişen şube durumlarını bildirimleriyle birlikte kaydet
+        # (yeniden başlatmada aynı olay tekrar bildirilmesin, bildirim de kaybolmasın)
+        changed_states = section_states.dirty_rows(branscode)
+        try:
+            await db.save_section_states(changed_states, notifications)
+        except Exception:
+            # Durumlar kirli kalır, bildirimler saklanır; yanıt aynı olsa da bir sonraki sorgu yeniden kaydeder
+            unsaved_notifications[branscode] = notifications
+            fingerprints.invalidate(branscode)
+            raise
+        section_states.mark_saved(changed_states)
+        if notifications:
+            outbox_wakeup.set()
+        return bool(changed_states)
     except Exception as e:
-        logger.error(f"Ana fonksiyonda hata: {e}")
+        logger.error(f"Branş {branscode} kontrolünde hata: {e}")
+        return False
+
+def log_scheduler_stats():
+    """Sorgu süreleri, gecikmeler ve planlanan/bütçelenen istek hızı"""
+    stats = scheduler.stats()
+    logger.info(f"Zamanlayıcı: {stats['branches']} branş, {stats['polls']} sorgu "
+                f"(ort. {stats['avg_poll_seconds']} sn, en uzun {stats['max_poll_seconds']} sn), "
+                f"plan {stats['planned_rpm']}/dk, bütçe {stats['budget_rpm']}/dk, "
+                f"katalog istekleri {stats['background_requests']}, "
+                f"geciken {stats['overruns']} (en fazla {stats['max_lateness']} sn)")
+
+async def poll_branch(branscode, ders_kodlari, semaphore, wakeup):
+    """Zamanlayıcının seçtiği branşı sorgula ve sonucu zamanlayıcıya bildir"""
+    changed = False
+    try:
+        changed = await check_branch(branscode, ders_kodlari, semaphore)
+    finally:
+        scheduler.record_result(branscode, changed)
+        wakeup.set()  # Yeni zamanlamayı döngüye haber ver
 
 async def run_monitoring():
-    """Monitoring döngüsü"""
+    """Monitoring döngüsü - her branş kendi aralığında sorgulanır"""
     logger.info("Kontenjan kontrol botu başlatıldı.")
     
-    while True:
-        try:
-            await main()
-            await asyncio.sleep(240)  # 4 dakika bekle
-        except KeyboardInterrupt:
-            logger.info("Bot durduruldu.")
-            break
-        except Exception as e:
-            logger.error(f"Bot çalışırken hata: {e}")
-            await asyncio.sleep(60)  # Hata durumunda 1 dakika bekle
+    semaphore = obs_semaphore
+    wakeup = asyncio.Event()
+    tasks = set()
+    courses_by_branch = {}
+    next_plan_refresh = 0.0
+    next_reconcile = time.monotonic() + SUBSCRIPTION_RECONCILE_INTERVAL  # Açılışta indeks zaten yeni kuruldu
+    next_stats_log = time.monotonic() + SCHEDULER_STATS_INTERVAL
+    
+    try:
+        while True:
+            try:
+                # Takip listesini periyodik olarak yenile
+                if time.monotonic() >= next_plan_refresh:
+                    if time.monotonic() >= next_reconcile:
+                        await reconcile_subscriptions()
+                        next_reconcile = time.monotonic() + SUBSCRIPTION_RECONCILE_INTERVAL
+                    courses_by_branch, subscribers_by_branch = build_work_plan()
+                    scheduler.sync_branches(subscribers_by_branch)
+                    prune_snapshots(subscribers_by_branch)
+                    next_plan_refresh = time.monotonic() + PLAN_REFRESH_INTERVAL
+                    
+                    stats = scheduler.stats()
+                    logger.info(f"Değişiklik tespiti: {fingerprints.stats()}")
+                    logger.info(f"Ayrıştırma: {decode_stats.stats()}")
+                    logger.info(f"Bildirim kuyruğu: {notifier.stats()}")
+                    logger.info(f"Kullanıcı önbelleği: {db.cache_stats()}")
+                    logger.info(f"Ders kataloğu: {course_catalog.stats()}")
+                    await db.purge_sent_notifications(time.time() - OUTBOX_RETENTION)
+                    log_columnar_summary()
+                    logger.info(f"Olay döngüsü gecikmesi: {loop_monitor.stats()}")
+                    loop_monitor.reset()
+                    if stats['planned_rpm'] > stats['budget_rpm']:
+                        logger.warning(f"Planlanan yük ({stats['planned_rpm']}/dk) istek bütçesini "
+                                       f"({stats['budget_rpm']}/dk) aşıyor, sorgular gecikecek.")
+                
+                if time.monotonic() >= next_stats_log:
+                    log_scheduler_stats()
+                    next_stats_log = time.monotonic() + SCHEDULER_STATS_INTERVAL
+                
+                for branscode in scheduler.pop_due():
+                    ders_kodlari = courses_by_branch.get(branscode, set())
+                    task = asyncio.create_task(poll_branch(branscode, ders_kodlari, semaphore, wakeup))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                
+                # Bir sonraki sorgu zamanına veya bir sorgu bitene kadar bekle
+                wait = min(scheduler.seconds_until_next(), next_plan_refresh - time.monotonic(),
+                           next_stats_log - time.monotonic())
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=max(1.0, wait))
+                except asyncio.TimeoutError:
+                    pass
+            except KeyboardInterrupt:
+                logger.info("Bot durduruldu.")
+                break
+            except Exception as e:
+                logger.error(f"Bot çalışırken hata: {e}")
+                await asyncio.sleep(60)  # Hata durumunda 1 dakika bekle
+    finally:
+        for task in tasks:
+            task.cancel()
+        await notifier.close()
+        await close_http_client()
+        shutdown_parse_executor()
 
 async def run_telegram_bot():
     """Telegram bot'u çalıştır"""
     await telegram_bot.run_async()
 
+def initialize():
+    """
+    Veritabanını, durum tablolarını, katalogları, Telegram botunu ve bildirim kuyruğunu hazırla
+    Modül seviyesinde yapılmaz: spawn/forkserver ile başlayan ayrıştırma süreçleri bot.py'yi
+    yeniden içe aktardığında veritabanına yazmasın, bot kurmasın
+    """
+    global db, telegram_bot, notifier
+    start_parse_executor()  # Süreç havuzu her şeyden önce, henüz başka iş parçacığı yokken
+    
+    database = get_database()
+    db = get_async_database()
+    section_states.load(database.get_section_states())
+    repair_branch_ids(database)
+    subscriptions.load(database.get_all_active_users())
+    logger.info(f"Ders kataloğu: {course_catalog.load()} branş diskten yüklendi")
+    course_search.rebuild(course_catalog.entries())
+    
+    telegram_bot = TelegramBot(API_TOKEN, subscriptions=subscriptions, course_catalog=course_catalog,
+                               course_search=course_search)
+    notifier = NotificationDispatcher(
+        telegram_bot.deliver,
+        workers=NOTIFY_WORKERS,
+        rate=NOTIFY_RATE,
+        per_chat_interval=NOTIFY_CHAT_INTERVAL,
+        max_retries=NOTIFY_MAX_RETRIES
+    )
+
 async def main_async():
     """Ana async fonksiyon - hem Telegram bot hem de monitoring"""
-    # İki görevi paralel çalıştır
+    initialize()
+    
+    # Görevleri paralel çalıştır
     await asyncio.gather(
         run_monitoring(),
-        run_telegram_bot()
+        run_outbox(),
+        run_course_catalog(),
+        run_telegram_bot(),
+        loop_monitor.run()
     )
 
 if __name__ == "__main__":
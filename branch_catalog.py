@@ -0,0 +1,147 @@
+"""
+Branş kataloğu: ders branş kodu (EHB, YZV, X100...) <-> OBS branş ID
+Tek kaynak ders_codeleri.BRANS_KODLARI; açılışta bir kez yüklenir ve değiştirilemez haritalarda tutulur.
+Yenileme: python branch_catalog.py refresh
+"""
+import argparse
+import os
+import re
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from course_catalog import edit_distance
+from ders_codeleri import BRANS_KODLARI
+
+BRANCH_CATALOG_URL = os.getenv(
+    'BRANCH_CATALOG_URL',
+    'https://obs.itu.edu.tr/public/DersProgram/SearchBransKoduByProgramSeviye'
+)
+PROGRAM_SEVIYE = 'LS'  # Lisans
+CATALOG_MODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ders_codeleri.py')
+
+MIN_CODE_LENGTH = 2
+MAX_CODE_LENGTH = 4
+
+
+class BranchCatalog:
+    """Branş kodu -> ID ve ID -> branş kodu haritaları (salt okunur)"""
+
+    def __init__(self, entries: Iterable[Dict]):
+        by_code = {}
+        by_id = {}
+        for entry in entries:
+            code = entry['dersBransKodu'].strip().upper()
+            branch_id = int(entry['bransKoduId'])
+            if not MIN_CODE_LENGTH <= len(code) <= MAX_CODE_LENGTH:
+                raise ValueError(f"Geçersiz branş kodu uzunluğu: {code}")
+            if by_code.get(code, branch_id) != branch_id:
+                raise ValueError(f"{code} için iki farklı branş ID: {by_code[code]}, {branch_id}")
+            by_code[code] = branch_id
+            by_id.setdefault(branch_id, code)
+
+        self.by_code = MappingProxyType(by_code)
+        self.by_id = MappingProxyType(by_id)
+        # Bitişik yazılmış kodlarda en uzun önek önce denenir (X100101 -> X100 101)
+        self._code_lengths = tuple(sorted({len(code) for code in by_code}, reverse=True))
+
+    def branch_id(self, branch_code: str) -> Optional[int]:
+        return self.by_code.get(branch_code.upper())
+
+    def branch_code(self, branch_id: int) -> Optional[str]:
+        return self.by_id.get(branch_id)
+
+    def split_course_code(self, course_code: str) -> Optional[Tuple[str, str]]:
+        """
+        Ders kodunu branş kodu ve numaraya ayır: 'EHB 313E', 'ehb313e', 'X100 101', 'YZV102E'
+        Returns: (branş kodu, ders numarası), branş bilinmiyorsa None
+        """
+        parts = course_code.strip().upper().split()
+        if len(parts) == 2:
+            return (parts[0], parts[1]) if parts[0] in self.by_code else None
+        if len(parts) != 1:
+            return None
+
+        text = parts[0]
+        for length in self._code_lengths:
+            prefix, number = text[:length], text[length:]
+            if prefix in self.by_code and number[:1].isdigit():
+                return prefix, number
+        return None
+
+    def suggest(self, course_code: str, limit: int = 5, max_distance: int = 1) -> List[str]:
+        """Yazılan branş koduna en yakın bilinen kodlar ('EHBB 313' -> ['EHB'])"""
+        text = course_code.strip().upper()
+        typed = text.split()[0] if len(text.split()) > 1 else re.match(r'[^\d]*', text).group()
+        if not typed:
+            return []
+        scored = []
+        for code in self.by_code:
+            distance = edit_distance(typed, code, max_distance)
+            if distance <= max_distance:
+                scored.append((distance, code))
+        scored.sort()
+        return [code for _, code in scored[:limit]]
+
+    def codes(self) -> List[str]:
+        """Alfabetik sırada branş kodları"""
+        return sorted(self.by_code)
+
+    def __contains__(self, branch_code: str) -> bool:
+        return branch_code in self.by_code
+
+    def __len__(self) -> int:
+        return len(self.by_code)
+
+
+CATALOG = BranchCatalog(BRANS_KODLARI)
+
+
+def fetch_catalog(program_seviye: str = PROGRAM_SEVIYE) -> List[Dict]:
+    """OBS'nin branş kodu uç noktasından kataloğu çek"""
+    import httpx
+
+    response = httpx.get(BRANCH_CATALOG_URL, params={'programSeviyeTipiAnahtari': program_seviye}, timeout=20)
+    response.raise_for_status()
+    entries = [
+        {'bransKoduId': int(item['bransKoduId']), 'dersBransKodu': item['dersBransKodu'].strip().upper()}
+        for item in response.json()
+    ]
+    BranchCatalog(entries)  # Tekrarlanan / çelişen kodlar varsa yazmadan önce hata ver
+    return sorted(entries, key=lambda item: item['dersBransKodu'])
+
+
+def write_catalog_module(entries: List[Dict], path: str = CATALOG_MODULE):
+    """ders_codeleri.py'yi verilen kayıtlarla yeniden üret"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('# Bu dosya "python branch_catalog.py refresh" ile OBS\'den üretilir, elle düzenlemeyin.\n')
+        f.write(f'# Kaynak: {BRANCH_CATALOG_URL}?programSeviyeTipiAnahtari={PROGRAM_SEVIYE}\n')
+        f.write('BRANS_KODLARI = [\n')
+        for entry in entries:
+            f.write(f"    {{'bransKoduId': {entry['bransKoduId']}, 'dersBransKodu': {entry['dersBransKodu']!r}}},\n")
+        f.write(']\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İTÜ OBS branş kataloğu")
+    parser.add_argument('command', choices=['refresh', 'show'])
+    parser.add_argument('--dry-run', action='store_true', help="Değişiklikleri göster, dosyayı yazma")
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        for code in CATALOG.codes():
+            print(f"{code:5} {CATALOG.by_code[code]}")
+        return
+
+    entries = fetch_catalog()
+    fresh = BranchCatalog(entries)
+    added = sorted(set(fresh.by_code) - set(CATALOG.by_code))
+    removed = sorted(set(CATALOG.by_code) - set(fresh.by_code))
+    changed = sorted(c for c in set(fresh.by_code) & set(CATALOG.by_code) if fresh.by_code[c] != CATALOG.by_code[c])
+    print(f"{len(fresh)} branş; eklenen: {added}, kaldırılan: {removed}, ID'si değişen: {changed}")
+    if not args.dry_run:
+        write_catalog_module(entries)
+        print(f"{CATALOG_MODULE} güncellendi")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
-from typing import Any, List, TypeVar, Callable, Type, cast
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Set, TypeVar, Callable, Type, cast
 
 
 T = TypeVar("T")
@@ -30,6 +31,9 @@ def to_class(c: Type[T], x: Any) -> dict:
 
 
 class DersProgramList:
+    # Her sorguda binlerce nesne oluşuyor: __dict__ yerine __slots__ ile daha az bellek
+    __slots__ = ('ders_tanimi_id', 'akademik_donem_kodu', 'crn', 'ders_kodu', 'ders_brans_kodu_id', 'dil_kodu', 'program_seviye_tipi', 'ders_adi', 'ogretim_yontemi', 'ad_soyad', 'mekan_adi', 'gun_adi_tr', 'gun_adi_en', 'baslangic_saati', 'bitis_saati', 'webde_goster', 'bina_kodu', 'kontenjan', 'ogrenci_sayisi', 'program_seviye_tipi_id', 'rezervasyon', 'sinif_program', 'on_sart', 'sinif_onsart')
+
     ders_tanimi_id: int
     akademik_donem_kodu: int
     crn: int
@@ -56,33 +60,37 @@ class DersProgramList:
     sinif_onsart: str
 
     def __init__(self, ders_tanimi_id: int, akademik_donem_kodu: int, crn: int, ders_kodu: str, ders_brans_kodu_id: int, dil_kodu: str, program_seviye_tipi: str, ders_adi: str, ogretim_yontemi: str, ad_soyad: str, mekan_adi: str, gun_adi_tr: str, gun_adi_en: str, baslangic_saati: str, bitis_saati: str, webde_goster: bool, bina_kodu: str, kontenjan: int, ogrenci_sayisi: int, program_seviye_tipi_id: int, rezervasyon: str, sinif_program: str, on_sart: str, sinif_onsart: str) -> None:
+        # Çok tekrar eden metinler (gün, bina, öğretim üyesi, ders kodu...) tek kopya olarak tutulur
+        intern = sys.intern
         self.ders_tanimi_id = ders_tanimi_id
         self.akademik_donem_kodu = akademik_donem_kodu
         self.crn = crn
-        self.ders_kodu = ders_kodu
+        self.ders_kodu = intern(ders_kodu)
         self.ders_brans_kodu_id = ders_brans_kodu_id
-        self.dil_kodu = dil_kodu
-        self.program_seviye_tipi = program_seviye_tipi
-        self.ders_adi = ders_adi
-        self.ogretim_yontemi = ogretim_yontemi
-        self.ad_soyad = ad_soyad
-        self.mekan_adi = mekan_adi
-        self.gun_adi_tr = gun_adi_tr
-        self.gun_adi_en = gun_adi_en
-        self.baslangic_saati = baslangic_saati
-        self.bitis_saati = bitis_saati
+        self.dil_kodu = intern(dil_kodu)
+        self.program_seviye_tipi = intern(program_seviye_tipi)
+        self.ders_adi = intern(ders_adi)
+        self.ogretim_yontemi = intern(ogretim_yontemi)
+        self.ad_soyad = intern(ad_soyad)
+        self.mekan_adi = intern(mekan_adi)
+        self.gun_adi_tr = intern(gun_adi_tr)
+        self.gun_adi_en = intern(gun_adi_en)
+        self.baslangic_saati = intern(baslangic_saati)
+        self.bitis_saati = intern(bitis_saati)
         self.webde_goster = webde_goster
-        self.bina_kodu = bina_kodu
+        self.bina_kodu = intern(bina_kodu)
         self.kontenjan = kontenjan
         self.ogrenci_sayisi = ogrenci_sayisi
         self.program_seviye_tipi_id = program_seviye_tipi_id
-        self.rezervasyon = rezervasyon
-        self.sinif_program = sinif_program
-        self.on_sart = on_sart
-        self.sinif_onsart = sinif_onsart
+        self.rezervasyon = intern(rezervasyon)
+        self.sinif_program = intern(sinif_program)
+        self.on_sart = intern(on_sart)
+        self.sinif_onsart = intern(sinif_onsart)
 
     @staticmethod
-    def from_dict(obj: Any) -> 'DersProgramList':
+    def from_dict(obj: Any, fields: Optional[Iterable[str]] = None) -> 'DersProgramList':
+        if fields is not None:
+            return DersProgramList.from_dict_projected(obj, fields)
         assert isinstance(obj, dict)
         ders_tanimi_id = from_int(obj.get("dersTanimiId"))
         akademik_donem_kodu = int(from_str(obj.get("akademikDonemKodu")))
@@ -110,6 +118,14 @@ class DersProgramList:
         sinif_onsart = from_str(obj.get("sinifOnsart"))
         return DersProgramList(ders_tanimi_id, akademik_donem_kodu, crn, ders_kodu, ders_brans_kodu_id, dil_kodu, program_seviye_tipi, ders_adi, ogretim_yontemi, ad_soyad, mekan_adi, gun_adi_tr, gun_adi_en, baslangic_saati, bitis_saati, webde_goster, bina_kodu, kontenjan, ogrenci_sayisi, program_seviye_tipi_id, rezervasyon, sinif_program, on_sart, sinif_onsart)
 
+    @staticmethod
+    def from_dict_projected(obj: Any, fields: Iterable[str]) -> 'DersProgramList':
+        """Sadece istenen alanları dönüştür; diğerleri varsayılan değerde kalır"""
+        assert isinstance(obj, dict)
+        fields = set(fields)
+        values = [convert(obj.get(key)) if name in fields else default for name, key, convert, default in _FIELD_SPECS]
+        return DersProgramList(*values)
+
     def to_dict(self) -> dict:
         result: dict = {}
         result["dersTanimiId"] = from_int(self.ders_tanimi_id)
@@ -138,6 +154,42 @@ class DersProgramList:
         result["sinifOnsart"] = from_str(self.sinif_onsart)
         return result
 
+    def to_tuple(self) -> tuple:
+        return (self.ders_tanimi_id, self.akademik_donem_kodu, self.crn, self.ders_kodu, self.ders_brans_kodu_id, self.dil_kodu, self.program_seviye_tipi, self.ders_adi, self.ogretim_yontemi, self.ad_soyad, self.mekan_adi, self.gun_adi_tr, self.gun_adi_en, self.baslangic_saati, self.bitis_saati, self.webde_goster, self.bina_kodu, self.kontenjan, self.ogrenci_sayisi, self.program_seviye_tipi_id, self.rezervasyon, self.sinif_program, self.on_sart, self.sinif_onsart)
+
+
+def _str_int(x: Any) -> int:
+    return int(from_str(x))
+
+
+# (alan, JSON anahtarı, dönüştürücü, projeksiyon dışında kalırsa varsayılan) - __init__ sırasıyla
+_FIELD_SPECS = [
+    ("ders_tanimi_id", "dersTanimiId", from_int, 0),
+    ("akademik_donem_kodu", "akademikDonemKodu", _str_int, 0),
+    ("crn", "crn", _str_int, 0),
+    ("ders_kodu", "dersKodu", from_str, "-"),
+    ("ders_brans_kodu_id", "dersBransKoduId", from_int, 0),
+    ("dil_kodu", "dilKodu", from_str, ""),
+    ("program_seviye_tipi", "programSeviyeTipi", from_str, ""),
+    ("ders_adi", "dersAdi", from_str, "-"),
+    ("ogretim_yontemi", "ogretimYontemi", from_str, "-"),
+    ("ad_soyad", "adSoyad", from_str, "-"),
+    ("mekan_adi", "mekanAdi", from_str, "-"),
+    ("gun_adi_tr", "gunAdiTR", from_str, "-"),
+    ("gun_adi_en", "gunAdiEN", from_str, ""),
+    ("baslangic_saati", "baslangicSaati", from_str, "-"),
+    ("bitis_saati", "bitisSaati", from_str, "-"),
+    ("webde_goster", "webdeGoster", from_bool, True),
+    ("bina_kodu", "binaKodu", from_str, "-"),
+    ("kontenjan", "kontenjan", from_int, 0),
+    ("ogrenci_sayisi", "ogrenciSayisi", from_int, 0),
+    ("program_seviye_tipi_id", "programSeviyeTipiId", from_int, 0),
+    ("rezervasyon", "rezervasyon", from_str, "-"),
+    ("sinif_program", "sinifProgram", from_str, "-"),
+    ("on_sart", "onSart", from_str, "-"),
+    ("sinif_onsart", "sinifOnsart", from_str, "-"),
+]
+
 
 class DersListesi:
     ders_program_list: List[DersProgramList]
@@ -146,14 +198,53 @@ class DersListesi:
     def __init__(self, ders_program_list: List[DersProgramList], guncellenme_saati: str) -> None:
         self.ders_program_list = ders_program_list
         self.guncellenme_saati = guncellenme_saati
+        self._by_course: Optional[Dict[str, List[DersProgramList]]] = None
+        self._by_crn: Optional[Dict[int, DersProgramList]] = None
+
+    def _build_index(self) -> None:
+        by_course: Dict[str, List[DersProgramList]] = {}
+        by_crn: Dict[int, DersProgramList] = {}
+        for x in self.ders_program_list:
+            by_course.setdefault(x.ders_kodu, []).append(x)
+            by_crn[x.crn] = x
+        self._by_course = by_course
+        self._by_crn = by_crn
+
+    def sections_for(self, ders_kodu: str) -> List[DersProgramList]:
+        """Ders koduna ait şubeler (indeks ilk çağrıda bir kez kurulur)"""
+        if self._by_course is None:
+            self._build_index()
+        return self._by_course.get(ders_kodu, [])
+
+    def section_by_crn(self, crn: int) -> Optional[DersProgramList]:
+        """CRN'e ait şube"""
+        if self._by_crn is None:
+            self._build_index()
+        return self._by_crn.get(crn)
 
     @staticmethod
-    def from_dict(obj: Any) -> 'DersListesi':
+    def from_dict(obj: Any, wanted_codes: Optional[Set[str]] = None,
+                  fields: Optional[Iterable[str]] = None) -> 'DersListesi':
+        """
+        wanted_codes: verilirse sadece bu ders kodlarının satırları çözülür (diğerlerinde sadece dersKodu okunur)
+        fields: verilirse her satırda sadece bu alanlar dönüştürülür
+        """
         assert isinstance(obj, dict)
-        ders_program_list = from_list(DersProgramList.from_dict, obj.get("dersProgramList"))
+        rows = obj.get("dersProgramList")
+        if wanted_codes is not None:
+            assert isinstance(rows, list)
+            rows = [x for x in rows if isinstance(x, dict) and x.get("dersKodu") in wanted_codes]
+        ders_program_list = from_list(lambda x: DersProgramList.from_dict(x, fields), rows)
         guncellenme_saati = from_str(obj.get("guncellenmeSaati"))
         return DersListesi(ders_program_list, guncellenme_saati)
 
+    @staticmethod
+    def from_rows(rows: List[tuple], guncellenme_saati: str) -> 'DersListesi':
+        return DersListesi([DersProgramList(*row) for row in rows], guncellenme_saati)
+
+    def to_rows(self) -> List[tuple]:
+        return [x.to_tuple() for x in self.ders_program_list]
+
     def to_dict(self) -> dict:
         result: dict = {}
         result["dersProgramList"] = from_list(lambda x: to_class(DersProgramList, x), self.ders_program_list)
@@ -0,0 +1,139 @@
+"""
+DersListesi anlık görüntülerinin sütun tabanlı (NumPy) hali
+Boş kontenjan, fazla kayıt, önceki görüntüye göre değişim ve branş doluluk oranları
+tüm branşlar için birkaç vektörel işlemle hesaplanır. NumPy kurulu değilse kullanılamaz.
+"""
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # İsteğe bağlı bağımlılık
+    np = None
+
+from class_yapisi import DersListesi
+
+HAS_NUMPY = np is not None
+
+
+class CourseCodeVocabulary:
+    """Ders kodu <-> tamsayı eşlemesi (görüntüler arasında sabit kalır)"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._codes: List[str] = []
+
+    def id_for(self, code: str) -> int:
+        code_id = self._ids.get(code)
+        if code_id is None:
+            code_id = len(self._codes)
+            self._ids[code] = code_id
+            self._codes.append(code)
+        return code_id
+
+    def code(self, code_id: int) -> str:
+        return self._codes[code_id]
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+
+class ColumnarSnapshot:
+    """Tüm branşların şubeleri için CRN, kontenjan, öğrenci sayısı, ders kodu ve branş sütunları"""
+
+    def __init__(self, crn, kontenjan, ogrenci_sayisi, course_code, branch, vocabulary: CourseCodeVocabulary):
+        self.crn = crn
+        self.kontenjan = kontenjan
+        self.ogrenci_sayisi = ogrenci_sayisi
+        self.course_code = course_code
+        self.branch = branch
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Dict[int, DersListesi],
+                       vocabulary: Optional[CourseCodeVocabulary] = None) -> 'ColumnarSnapshot':
+        """Branş ID -> DersListesi sözlüğünden sütunları oluştur"""
+        if not HAS_NUMPY:
+            raise RuntimeError("ColumnarSnapshot için numpy gerekli")
+
+        vocabulary = vocabulary or CourseCodeVocabulary()
+        total = sum(len(s.ders_program_list) for s in snapshots.values())
+        crn = np.empty(total, dtype=np.int64)
+        kontenjan = np.empty(total, dtype=np.int32)
+        ogrenci_sayisi = np.empty(total, dtype=np.int32)
+        course_code = np.empty(total, dtype=np.int32)
+        branch = np.empty(total, dtype=np.int32)
+
+        pos = 0
+        id_for = vocabulary.id_for
+        for branch_id, snapshot in snapshots.items():
+            rows = snapshot.ders_program_list
+            end = pos + len(rows)
+            if rows:
+                # Tek geçişte sayısal alanları al, sonra sütunlara dağıt
+                values = np.array([(x.crn, x.kontenjan, x.ogrenci_sayisi, id_for(x.ders_kodu)) for x in rows],
+                                  dtype=np.int64)
+                crn[pos:end] = values[:, 0]
+                kontenjan[pos:end] = values[:, 1]
+                ogrenci_sayisi[pos:end] = values[:, 2]
+                course_code[pos:end] = values[:, 3]
+            branch[pos:end] = branch_id
+            pos = end
+
+        return cls(crn, kontenjan, ogrenci_sayisi, course_code, branch, vocabulary)
+
+    def __len__(self) -> int:
+        return len(self.crn)
+
+    def open_seats(self):
+        """Şube başına boş yer (fazla kayıtlıysa 0)"""
+        return np.maximum(self.kontenjan - self.ogrenci_sayisi, 0)
+
+    def over_enrolled(self):
+        """Kontenjanından fazla öğrenci kayıtlı şubeler (maske)"""
+        return self.ogrenci_sayisi > self.kontenjan
+
+    def open_seat_deltas(self, previous: 'ColumnarSnapshot'):
+        """
+        Önceki görüntüye göre boş yer değişimi
+        Returns: (CRN'ler, değişim) - sadece iki görüntüde de bulunan ve değişen şubeler
+        """
+        if not len(self) or not len(previous):
+            return self.crn[:0], np.zeros(0, dtype=np.int32)
+
+        order = np.argsort(previous.crn)
+        prev_crn = previous.crn[order]
+        prev_open = previous.open_seats()[order]
+
+        # CRN'leri sıralı önceki görüntüde ara
+        idx = np.minimum(np.searchsorted(prev_crn, self.crn), len(prev_crn) - 1)
+        found = prev_crn[idx] == self.crn
+
+        delta = np.zeros(len(self), dtype=np.int32)
+        delta[found] = self.open_seats()[found] - prev_open[idx[found]]
+        changed = delta != 0
+        return self.crn[changed], delta[changed]
+
+    def fill_ratios(self) -> Dict[int, float]:
+        """Branş başına doluluk oranı (toplam öğrenci / toplam kontenjan)"""
+        if not len(self):
+            return {}
+        branches, inverse = np.unique(self.branch, return_inverse=True)
+        capacity = np.bincount(inverse, weights=self.kontenjan)
+        enrolled = np.bincount(inverse, weights=np.minimum(self.ogrenci_sayisi, self.kontenjan))
+        ratios = np.divide(enrolled, capacity, out=np.ones_like(capacity), where=capacity > 0)
+        return dict(zip(branches.tolist(), ratios.tolist()))
+
+    def summary(self, previous: Optional['ColumnarSnapshot'] = None) -> dict:
+        """Tüm katalog için kısa özet"""
+        open_seats = self.open_seats()
+        result = {
+            'sections': len(self),
+            'open_sections': int(np.count_nonzero(open_seats)),
+            'open_seats': int(open_seats.sum()),
+            'over_enrolled': int(np.count_nonzero(self.over_enrolled())),
+        }
+        if previous is not None:
+            crns, delta = self.open_seat_deltas(previous)
+            result['changed_sections'] = len(crns)
+            result['seats_opened'] = int(delta[delta > 0].sum())
+        return result
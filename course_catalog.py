@@ -0,0 +1,196 @@
+"""
+Branş başına gerçekte açılan ders kodlarının önbelleği
+Tam (tüm dersleri çözülmüş) DersListesi görüntülerinden doldurulur, TTL ile diske (JSON) yazılır.
+/add yolunda ağ isteği yapılmaz: ders kodu bellekteki küme ve sıralı listede aranır,
+bulunamazsa aynı branştaki en yakın kodlar (düzenleme uzaklığı) önerilir.
+"""
+import bisect
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from class_yapisi import DersListesi
+
+logger = logging.getLogger(__name__)
+
+COURSE_CATALOG_PATH = os.getenv('COURSE_CATALOG_PATH', 'course_catalog.json')
+COURSE_CATALOG_TTL = float(os.getenv('COURSE_CATALOG_TTL', '86400'))  # Branş listesinin taze sayıldığı süre (sn)
+
+FORMAT_VERSION = 1
+
+
+def normalize_code(course_code: str) -> str:
+    """'ehb  313e' -> 'EHB 313E'"""
+    return ' '.join(course_code.upper().split())
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein uzaklığı; limit aşılınca erken durur
+    Returns: uzaklık (limit'ten büyükse limit + 1)
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class _BranchCourses:
+    """Bir branşın ders kodları: üyelik için küme, önek araması için sıralı liste"""
+    __slots__ = ('names', 'codes', 'instructors', 'updated_at')
+
+    def __init__(self, names: Dict[str, str], updated_at: float, instructors: Optional[Dict[str, List[str]]] = None):
+        self.names = names                    # ders kodu -> ders adı
+        self.codes = sorted(names)
+        self.instructors = instructors or {}  # ders kodu -> öğretim üyeleri (ders araması için)
+        self.updated_at = updated_at
+
+
+class CourseCatalog:
+    """Branş ID -> gerçek ders kodları (TTL'li, diske yazılabilir)"""
+
+    def __init__(self, ttl: float = COURSE_CATALOG_TTL):
+        self.ttl = ttl
+        self._branches: Dict[int, _BranchCourses] = {}
+        self._wanted = set()  # Kullanıcıların sorduğu ama listesi taze olmayan branşlar (önce yenilenir)
+
+    def update(self, branch_id: int, derslist: DersListesi, now: Optional[float] = None):
+        """Branşın ders listesini tam görüntüden yenile"""
+        names = {}
+        instructors = {}
+        for ders in derslist.ders_program_list:
+            code = normalize_code(ders.ders_kodu)
+            names.setdefault(code, ders.ders_adi)
+            hocalar = instructors.setdefault(code, [])
+            if ders.ad_soyad and ders.ad_soyad != '-' and ders.ad_soyad not in hocalar:
+                hocalar.append(ders.ad_soyad)
+        self._branches[branch_id] = _BranchCourses(names, time.time() if now is None else now, instructors)
+        self._wanted.discard(branch_id)
+
+    def is_fresh(self, branch_id: int, now: Optional[float] = None) -> bool:
+        branch = self._branches.get(branch_id)
+        now = time.time() if now is None else now
+        return branch is not None and now - branch.updated_at < self.ttl
+
+    def contains(self, branch_id: int, course_code: str, now: Optional[float] = None) -> Optional[bool]:
+        """
+        Ders bu branşta açılıyor mu
+        Returns: True/False, branşın listesi yoksa veya eskiyse None (karar verilemez)
+        """
+        if not self.is_fresh(branch_id, now):
+            self._wanted.add(branch_id)
+            return None
+        return normalize_code(course_code) in self._branches[branch_id].names
+
+    def course_name(self, branch_id: int, course_code: str) -> Optional[str]:
+        branch = self._branches.get(branch_id)
+        return branch.names.get(normalize_code(course_code)) if branch else None
+
+    def with_prefix(self, branch_id: int, prefix: str, limit: int = 10) -> List[str]:
+        """Sıralı listede önekle başlayan ders kodları"""
+        branch = self._branches.get(branch_id)
+        if branch is None:
+            return []
+        prefix = normalize_code(prefix)
+        start = bisect.bisect_left(branch.codes, prefix)
+        result = []
+        for code in branch.codes[start:start + limit]:
+            if not code.startswith(prefix):
+                break
+            result.append(code)
+        return result
+
+    def suggest(self, branch_id: int, course_code: str, limit: int = 3, max_distance: int = 2) -> List[str]:
+        """Aynı branşta yazılana en yakın ders kodları (uzaklık, sonra alfabetik sıra)"""
+        branch = self._branches.get(branch_id)
+        if branch is None:
+            return []
+        # Branştaki tüm kodlar aynı branş önekiyle başlar: sadece ders numaraları karşılaştırılır
+        number = normalize_code(course_code).partition(' ')[2]
+        scored = []
+        for code in branch.codes:
+            distance = edit_distance(number, code.partition(' ')[2], max_distance)
+            if distance <= max_distance:
+                scored.append((distance, code))
+        scored.sort()
+        return [code for _, code in scored[:limit]]
+
+    def entries(self) -> Iterator[Tuple[int, str, str, List[str]]]:
+        """Tüm dersler: (branş ID, ders kodu, ders adı, öğretim üyeleri)"""
+        for branch_id, branch in list(self._branches.items()):
+            for code in branch.codes:
+                yield branch_id, code, branch.names[code], branch.instructors.get(code, [])
+
+    def stale_branches(self, branch_ids: Iterable[int], now: Optional[float] = None) -> List[int]:
+        """
+        Listesi olmayan veya eskimiş branşlar, yenileme sırasıyla
+        Önce kullanıcıların sorduğu branşlar, sonra hiç çekilmemişler, sonra en eskiler
+        """
+        now = time.time() if now is None else now
+        stale = [b for b in branch_ids if not self.is_fresh(b, now)]
+
+        def order(branch_id):
+            branch = self._branches.get(branch_id)
+            return branch_id not in self._wanted, branch is not None, branch.updated_at if branch else 0.0
+
+        return sorted(stale, key=order)
+
+    def load(self, path: str = COURSE_CATALOG_PATH) -> int:
+        """
+        Diskteki kataloğu yükle (dosya yoksa veya bozuksa boş başlar)
+        Returns: yüklenen branş sayısı
+        """
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ders kataloğu okunamadı ({path}): {e}")
+            return 0
+        if data.get('version') != FORMAT_VERSION:
+            return 0
+
+        self._branches = {
+            int(branch_id): _BranchCourses(branch['courses'], branch['updated_at'], branch.get('instructors'))
+            for branch_id, branch in data['branches'].items()
+        }
+        return len(self._branches)
+
+    def save(self, path: str = COURSE_CATALOG_PATH):
+        """Kataloğu diske yaz (önce geçici dosyaya, yarım dosya kalmaz)"""
+        # Ayrı iş parçacığında çağrılabilir: güncellemeler dict'leri değiştirmez, yenisini koyar
+        branches = list(self._branches.items())
+        data = {
+            'version': FORMAT_VERSION,
+            'branches': {
+                str(branch_id): {'updated_at': branch.updated_at, 'courses': branch.names,
+                                 'instructors': branch.instructors}
+                for branch_id, branch in branches
+            }
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def stats(self, now: Optional[float] = None) -> dict:
+        now = time.time() if now is None else now
+        return {
+            'branches': len(self._branches),
+            'fresh': sum(1 for b in self._branches if self.is_fresh(b, now)),
+            'courses': sum(len(b.codes) for b in self._branches.values()),
+            'wanted': len(self._wanted),
+        }
+
+    def __len__(self) -> int:
+        return len(self._branches)
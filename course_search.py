@@ -0,0 +1,120 @@
+"""
+Ders arama indeksi (Telegram inline sorguları için)
+Ders kodu, ders adı ve öğretim üyesi kelimeleri sıralı bir kelime listesinde tutulur;
+sorgudaki her kelime önek olarak aranır. İndeks ders kataloğundan (son tam branş
+görüntüleri) kurulur, sorgu yolunda OBS'ye istek atılmaz.
+"""
+import bisect
+import heapq
+import re
+from typing import Iterable, List, NamedTuple, Tuple
+
+# Türkçe harfler aramada ASCII karşılıklarıyla eşleşir ("ogr" -> "Öğretim", "isik" -> "Işık")
+_FOLD = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i', 'Ç': 'c', 'ç': 'c', 'Ğ': 'g', 'ğ': 'g',
+    'Ö': 'o', 'ö': 'o', 'Ş': 's', 'ş': 's', 'Ü': 'u', 'ü': 'u', 'Â': 'a', 'â': 'a', 'Î': 'i', 'î': 'i',
+})
+_WORD = re.compile(r'[a-z0-9]+')
+
+MIN_QUERY_LENGTH = 2
+CHECK_RATIO = 4  # Kelimenin eşleşmesi aday sayısının bu katından fazlaysa kesişim yerine metin kontrolü
+
+
+def fold_words(text: str) -> List[str]:
+    """Metni aramada kullanılan küçük harfli ASCII kelimelere ayır"""
+    return _WORD.findall(text.translate(_FOLD).lower())
+
+
+class CourseResult(NamedTuple):
+    branch_id: int
+    course_code: str
+    ders_adi: str
+    instructors: List[str]
+
+
+class CourseSearchIndex:
+    """Ders kodu, ders adı ve öğretim üyesi üzerinde kelime öneki araması"""
+
+    def __init__(self):
+        # (dersler, derslerin arama metni, sıralı boşluksuz kodlar, sıralı kelimeler, kelime -> ders ID'leri,
+        #  kümülatif eşleşme sayıları); rebuild() tek atamayla değiştirir, aramalar tutarlı bir kopya görür
+        self._state = ([], [], [], [], [], [0])
+
+    def rebuild(self, entries: Iterable[Tuple[int, str, str, List[str]]]):
+        """
+        İndeksi (branş ID, ders kodu, ders adı, öğretim üyeleri) kayıtlarından baştan kur
+        Ders ID'leri ders kodu sırasındadır, sonuçlar da bu sırayla döner
+        """
+        courses = sorted((CourseResult(*entry) for entry in entries), key=lambda c: c.course_code)
+        texts = []
+        compact_codes = []
+        postings = {}
+        for course_id, course in enumerate(courses):
+            code_words = fold_words(course.course_code)
+            compact = ''.join(code_words)
+            words = set(code_words)
+            words.add(compact)  # "ehb313" gibi bitişik yazılan kodlar için
+            words.update(fold_words(course.ders_adi))
+            for instructor in course.instructors:
+                words.update(fold_words(instructor))
+            for word in words:
+                postings.setdefault(word, []).append(course_id)
+            texts.append(' ' + ' '.join(words))
+            compact_codes.append(compact)
+
+        words = sorted(postings)
+        word_postings = [postings[word] for word in words]
+        cumulative = [0]
+        for ids in word_postings:
+            cumulative.append(cumulative[-1] + len(ids))
+        self._state = (courses, texts, compact_codes, words, word_postings, cumulative)
+
+    def search(self, query: str, limit: int = 20) -> List[CourseResult]:
+        """
+        Sorgudaki tüm kelimelerle (önek olarak) eşleşen dersler
+        Ders kodu sorguyla başlayanlar önce, sonra ders kodu sırası
+        """
+        terms = fold_words(query)
+        if sum(len(term) for term in terms) < MIN_QUERY_LENGTH:
+            return []
+        courses, texts, compact_codes, words, word_postings, cumulative = self._state
+
+        # Kodu sorguyla başlayan dersler: boşluksuz kodlar sıralı, aralık doğrudan bulunur
+        compact = ''.join(terms)
+        start = bisect.bisect_left(compact_codes, compact)
+        results = []
+        for course_id in range(start, min(start + limit, len(compact_codes))):
+            if not compact_codes[course_id].startswith(compact):
+                break
+            results.append(course_id)
+        if len(results) >= limit:
+            return [courses[i] for i in results]
+
+        # Her kelime için önek aralığı; kesişim en az eşleşen kelimeden başlar
+        ranges = []
+        for term in terms:
+            lo = bisect.bisect_left(words, term)
+            hi = bisect.bisect_left(words, term + '\x7f', lo)
+            if lo == hi:
+                return [courses[i] for i in results]
+            ranges.append((cumulative[hi] - cumulative[lo], lo, hi, term))
+        ranges.sort()
+
+        candidates = None
+        for count, lo, hi, term in ranges:
+            if candidates is not None and len(candidates) * CHECK_RATIO < count:
+                # Az aday kaldı: büyük kümeyi kurmak yerine kelime adayların metninde aranır
+                check = ' ' + term
+                candidates = {i for i in candidates if check in texts[i]}
+            else:
+                matched = set().union(*word_postings[lo:hi])
+                candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                break
+
+        candidates.difference_update(results)
+        results.extend(heapq.nsmallest(limit - len(results), candidates))
+        return [courses[i] for i in results]
+
+    def __len__(self) -> int:
+        return len(self._state[0])
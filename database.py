@@ -1,68 +1,182 @@
+import os
+import asyncio
+import functools
+import logging
 import sqlite3
+import threading
 import json
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bağlantı ayarları
+SQLITE_CACHE_KIB = int(os.getenv('SQLITE_CACHE_KIB', '16384'))  # Sayfa önbelleği (KiB)
+SQLITE_CACHED_STATEMENTS = int(os.getenv('SQLITE_CACHED_STATEMENTS', '256'))  # Hazır ifade önbelleği
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '10000'))  # Önbellekteki en fazla kullanıcı profili / ders listesi
+
+
+def _migrate_user_courses_unique(cursor):
+    """Tekrarlanan (kullanıcı, ders) satırlarını temizle, benzersizlik ve ders/branş indeksini ekle"""
+    cursor.execute('''
+        DELETE FROM user_courses
+        WHERE id NOT IN (SELECT MIN(id) FROM user_courses GROUP BY user_id, course_code)
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_user_courses_user_course ON user_courses (user_id, course_code)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_user_courses_course_branch ON user_courses (course_code, branch_id)
+    ''')
+
+
+def _migrate_section_notify_pending(cursor):
+    """Debounce ile ertelenen bildirimler yeniden başlatmada kaybolmasın"""
+    cursor.execute('ALTER TABLE section_states ADD COLUMN notify_pending INTEGER DEFAULT 0')
+
+
+# Şema geçişleri: (sürüm, geçiş); PRAGMA user_version'dan büyük olanlar sırayla ve bir kez uygulanır
+MIGRATIONS = [
+    (1, _migrate_user_courses_unique),
+    (2, _migrate_section_notify_pending),
+]
+
 
 class DatabaseManager:
     def __init__(self, db_path: str = "users.db"):
         self.db_path = db_path
+        # Süreç boyunca tek bağlantı; iş parçacıkları arasında kilitle paylaşılır
+        self._lock = threading.RLock()
+        self.conn = self._connect()
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Bağlantıyı aç ve ayarla (WAL, synchronous=NORMAL, sayfa önbelleği)"""
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,  # İşlemler _transaction ile açıkça başlatılır
+            check_same_thread=False,
+            cached_statements=SQLITE_CACHED_STATEMENTS
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{SQLITE_CACHE_KIB}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+        return conn
+    
+    @contextmanager
+    def _transaction(self):
+        """Yazma işlemi: BEGIN IMMEDIATE ... COMMIT, hata olursa ROLLBACK"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+            cursor.execute('COMMIT')
+    
+    def close(self):
+        """Bağlantıyı kapat"""
+        with self._lock:
+            self.conn.close()
+    
     def init_database(self):
         """Veritabanını başlat"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Kullanıcılar tablosu
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                user_id INTEGER PRIMARY KEY,
-                chat_id INTEGER UNIQUE,
-                username TEXT,
-                first_name TEXT,
-                last_name TEXT,
-                is_active INTEGER DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Kullanıcı dersleri tablosu
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_courses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                course_code TEXT,
-                branch_id INTEGER,
-                FOREIGN KEY (user_id) REFERENCES users (user_id)
-            )
-        ''')
+        with self._transaction() as cursor:
+            # Kullanıcılar tablosu
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    user_id INTEGER PRIMARY KEY,
+                    chat_id INTEGER UNIQUE,
+                    username TEXT,
+                    first_name TEXT,
+                    last_name TEXT,
+                    is_active INTEGER DEFAULT 1,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Kullanıcı dersleri tablosu
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS user_courses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    course_code TEXT,
+                    branch_id INTEGER,
+                    FOREIGN KEY (user_id) REFERENCES users (user_id)
+                )
+            ''')
+            
+            # Şube (CRN) bazında son görülen kontenjan durumu
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS section_states (
+                    crn INTEGER PRIMARY KEY,
+                    branch_id INTEGER,
+                    course_code TEXT,
+                    kontenjan INTEGER,
+                    ogrenci_sayisi INTEGER,
+                    last_notified_at REAL DEFAULT 0,
+                    changed_at REAL DEFAULT 0
+                )
+            ''')
+            
+            # Gönderilecek bildirimler (dedupe_key: sohbet:CRN:olay:zaman, aynı bildirim iki kez eklenmez)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dedupe_key TEXT UNIQUE,
+                    chat_id INTEGER,
+                    text TEXT,
+                    created_at REAL,
+                    attempts INTEGER DEFAULT 0,
+                    next_attempt_at REAL DEFAULT 0,
+                    sent_at REAL,
+                    last_error TEXT
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (sent_at, next_attempt_at)
+            ''')
         
-        conn.commit()
-        conn.close()
+        self.migrate()
+    
+    def schema_version(self) -> int:
+        """Veritabanının şema sürümü (PRAGMA user_version)"""
+        with self._lock:
+            return self.conn.execute('PRAGMA user_version').fetchone()[0]
+    
+    def migrate(self):
+        """Uygulanmamış şema geçişlerini uygula (her geçiş ve sürüm güncellemesi tek işlemde)"""
+        for version, migration in MIGRATIONS:
+            if version <= self.schema_version():
+                continue
+            with self._transaction() as cursor:
+                migration(cursor)
+                cursor.execute(f'PRAGMA user_version = {version}')
+            logger.info(f"Veritabanı şeması {version}. sürüme güncellendi ({migration.__name__})")
     
     def add_user(self, user_id: int, chat_id: int, username: str = None, 
                  first_name: str = None, last_name: str = None):
         """Kullanıcı ekle veya güncelle"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO users 
-            (user_id, chat_id, username, first_name, last_name, is_active)
-            VALUES (?, ?, ?, ?, ?, 1)
-        ''', (user_id, chat_id, username, first_name, last_name))
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            cursor.execute('''
+                INSERT OR REPLACE INTO users 
+                (user_id, chat_id, username, first_name, last_name, is_active)
+                VALUES (?, ?, ?, ?, ?, 1)
+            ''', (user_id, chat_id, username, first_name, last_name))
     
     def get_user(self, user_id: int) -> Optional[Dict]:
         """Kullanıcı bilgilerini getir"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
-        result = cursor.fetchone()
-        
-        conn.close()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
+            result = cursor.fetchone()
         
         if result:
             return {
@@ -78,70 +192,108 @@ class DatabaseManager:
     
     def add_course_to_user(self, user_id: int, course_code: str, branch_id: int):
         """Kullanıcıya ders ekle"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Aynı ders zaten ekli mi kontrol et
-        cursor.execute('''
-            SELECT id FROM user_courses 
-            WHERE user_id = ? AND course_code = ?
-        ''', (user_id, course_code))
-        
-        if cursor.fetchone():
-            conn.close()
-            return False  # Ders zaten ekli
+        with self._transaction() as cursor:
+            # Ders zaten ekliyse benzersizlik kısıtı eklemeyi engeller
+            cursor.execute('''
+                INSERT INTO user_courses (user_id, course_code, branch_id)
+                VALUES (?, ?, ?)
+                ON CONFLICT (user_id, course_code) DO NOTHING
+            ''', (user_id, course_code, branch_id))
+            
+            return cursor.rowcount == 1
+    
+    def add_courses(self, user_id: int, courses: List[Tuple[str, int]]) -> List[str]:
+        """
+        Kullanıcıya birden fazla dersi tek işlemde ekle
+        courses: (ders kodu, branş ID) listesi
+        Returns: yeni eklenen ders kodları (zaten ekli olanlar hariç)
+        """
+        if not courses:
+            return []
         
-        cursor.execute('''
-            INSERT INTO user_courses (user_id, course_code, branch_id)
-            VALUES (?, ?, ?)
-        ''', (user_id, course_code, branch_id))
+        with self._transaction() as cursor:
+            # İşlem yazma kilidini tuttuğu için mevcut dersler arada değişemez
+            cursor.execute('SELECT course_code FROM user_courses WHERE user_id = ?', (user_id,))
+            existing = {row[0] for row in cursor.fetchall()}
+            
+            new_courses = {}
+            for course_code, branch_id in courses:
+                if course_code not in existing and course_code not in new_courses:
+                    new_courses[course_code] = branch_id
+            
+            cursor.executemany('''
+                INSERT INTO user_courses (user_id, course_code, branch_id)
+                VALUES (?, ?, ?)
+                ON CONFLICT (user_id, course_code) DO NOTHING
+            ''', [(user_id, code, branch_id) for code, branch_id in new_courses.items()])
         
-        conn.commit()
-        conn.close()
-        return True
+        return list(new_courses)
     
     def remove_course_from_user(self, user_id: int, course_code: str):
         """Kullanıcıdan ders kaldır"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            DELETE FROM user_courses 
-            WHERE user_id = ? AND course_code = ?
-        ''', (user_id, course_code))
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            cursor.execute('''
+                DELETE FROM user_courses 
+                WHERE user_id = ? AND course_code = ?
+            ''', (user_id, course_code))
+    
+    def remove_all_courses(self, user_id: int) -> int:
+        """
+        Kullanıcının tüm derslerini tek sorguda kaldır
+        Returns: kaldırılan ders sayısı
+        """
+        with self._transaction() as cursor:
+            cursor.execute('DELETE FROM user_courses WHERE user_id = ?', (user_id,))
+            return cursor.rowcount
     
     def get_user_courses(self, user_id: int) -> List[Dict]:
         """Kullanıcının derslerini getir"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT course_code, branch_id FROM user_courses 
-            WHERE user_id = ?
-        ''', (user_id,))
-        
-        results = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT course_code, branch_id FROM user_courses 
+                WHERE user_id = ?
+            ''', (user_id,))
+            
+            results = cursor.fetchall()
         
         return [{'course_code': row[0], 'branch_id': row[1]} for row in results]
     
+    def get_course_branches(self) -> List[Tuple[str, int]]:
+        """Takip edilen (ders kodu, branş ID) çiftleri"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT DISTINCT course_code, branch_id FROM user_courses')
+            return cursor.fetchall()
+    
+    def update_course_branches(self, branch_ids: Dict[str, int]) -> int:
+        """
+        Derslerin kayıtlı branş ID'lerini düzelt
+        branch_ids: ders kodu -> doğru branş ID
+        Returns: güncellenen satır sayısı
+        """
+        if not branch_ids:
+            return 0
+        
+        with self._transaction() as cursor:
+            cursor.executemany('''
+                UPDATE user_courses SET branch_id = ?
+                WHERE course_code = ? AND branch_id != ?
+            ''', [(branch_id, code, branch_id) for code, branch_id in branch_ids.items()])
+            return cursor.rowcount
+    
     def get_all_active_users(self) -> List[Dict]:
         """Tüm aktif kullanıcıları getir"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT u.user_id, u.chat_id, uc.course_code, uc.branch_id
-            FROM users u
-            JOIN user_courses uc ON u.user_id = uc.user_id
-            WHERE u.is_active = 1
-        ''')
-        
-        results = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT u.user_id, u.chat_id, uc.course_code, uc.branch_id
+                FROM users u
+                JOIN user_courses uc ON u.user_id = uc.user_id
+                WHERE u.is_active = 1
+            ''')
+            
+            results = cursor.fetchall()
         
         return [{
             'user_id': row[0],
@@ -152,21 +304,285 @@ class DatabaseManager:
     
     def get_users_by_course(self, course_code: str, branch_id: int) -> List[Dict]:
         """Belirli bir dersi takip eden kullanıcıları getir"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT u.user_id, u.chat_id, u.first_name
-            FROM users u
-            JOIN user_courses uc ON u.user_id = uc.user_id
-            WHERE uc.course_code = ? AND uc.branch_id = ? AND u.is_active = 1
-        ''', (course_code, branch_id))
-        
-        results = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT u.user_id, u.chat_id, u.first_name
+                FROM users u
+                JOIN user_courses uc ON u.user_id = uc.user_id
+                WHERE uc.course_code = ? AND uc.branch_id = ? AND u.is_active = 1
+            ''', (course_code, branch_id))
+            
+            results = cursor.fetchall()
         
         return [{
             'user_id': row[0],
             'chat_id': row[1],
             'first_name': row[2]
         } for row in results]
+    
+    def get_section_states(self) -> List[Dict]:
+        """Kaydedilmiş şube kontenjan durumlarını getir"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT crn, branch_id, course_code, kontenjan, ogrenci_sayisi, last_notified_at, changed_at,
+                       notify_pending
+                FROM section_states
+            ''')
+            
+            results = cursor.fetchall()
+        
+        return [{
+            'crn': row[0],
+            'branch_id': row[1],
+            'course_code': row[2],
+            'kontenjan': row[3],
+            'ogrenci_sayisi': row[4],
+            'last_notified_at': row[5],
+            'changed_at': row[6],
+            'notify_pending': row[7]
+        } for row in results]
+    
+    def save_section_states(self, states: List[Dict], notifications: List[Dict] = ()):
+        """
+        Şube kontenjan durumlarını ve bu değişikliklerin bildirimlerini tek işlemde kaydet
+        (durum kaydedilip bildirim kaybolamaz, bildirim eklenip durum geri kalamaz)
+        notifications: dedupe_key, chat_id, text, created_at alanlı outbox satırları
+        """
+        if not states and not notifications:
+            return
+        
+        with self._transaction() as cursor:
+            cursor.executemany('''
+                INSERT OR REPLACE INTO section_states
+                (crn, branch_id, course_code, kontenjan, ogrenci_sayisi, last_notified_at, changed_at, notify_pending)
+                VALUES (:crn, :branch_id, :course_code, :kontenjan, :ogrenci_sayisi, :last_notified_at, :changed_at,
+                        :notify_pending)
+            ''', states)
+            
+            cursor.executemany('''
+                INSERT OR IGNORE INTO outbox (dedupe_key, chat_id, text, created_at)
+                VALUES (:dedupe_key, :chat_id, :text, :created_at)
+            ''', notifications)
+    
+    def get_pending_notifications(self, now: float, max_attempts: int, limit: int = 500) -> List[Dict]:
+        """Gönderilmemiş ve yeniden deneme zamanı gelmiş bildirimleri eklenme sırasıyla getir"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT id, chat_id, text, attempts FROM outbox
+                WHERE sent_at IS NULL AND next_attempt_at <= ? AND attempts < ?
+                ORDER BY id
+                LIMIT ?
+            ''', (now, max_attempts, limit))
+            
+            results = cursor.fetchall()
+        
+        return [{
+            'id': row[0],
+            'chat_id': row[1],
+            'text': row[2],
+            'attempts': row[3]
+        } for row in results]
+    
+    def mark_notifications_sent(self, ids: List[int], sent_at: float):
+        """Bildirimleri gönderildi olarak işaretle"""
+        with self._transaction() as cursor:
+            cursor.executemany('UPDATE outbox SET sent_at = ? WHERE id = ?', [(sent_at, i) for i in ids])
+    
+    def mark_notifications_failed(self, ids: List[int], error: str, next_attempt_at: float):
+        """Gönderilemeyen bildirimlerin deneme sayısını artır ve sonraki denemeyi planla"""
+        with self._transaction() as cursor:
+            cursor.executemany('''
+                UPDATE outbox SET attempts = attempts + 1, next_attempt_at = ?, last_error = ?
+                WHERE id = ?
+            ''', [(next_attempt_at, error, i) for i in ids])
+    
+    def deactivate_chats(self, chat_ids: List[int]) -> int:
+        """
+        Ulaşılamayan sohbetlerin kullanıcılarını pasif yap ve gönderilmemiş bildirimlerini sil
+        (/start ile tekrar aktif olurlar)
+        Returns: pasif yapılan kullanıcı sayısı
+        """
+        if not chat_ids:
+            return 0
+        
+        with self._transaction() as cursor:
+            params = [(chat_id,) for chat_id in chat_ids]
+            cursor.executemany('UPDATE users SET is_active = 0 WHERE chat_id = ? AND is_active = 1', params)
+            deactivated = cursor.rowcount
+            cursor.executemany('DELETE FROM outbox WHERE chat_id = ? AND sent_at IS NULL', params)
+        
+        return deactivated
+    
+    def purge_sent_notifications(self, older_than: float) -> int:
+        """Belirli zamandan önce gönderilmiş bildirimleri sil"""
+        with self._transaction() as cursor:
+            cursor.execute('DELETE FROM outbox WHERE sent_at IS NOT NULL AND sent_at < ?', (older_than,))
+            deleted = cursor.rowcount
+        
+        return deleted
+
+
+# Dosya başına paylaşılan yöneticiler (bot.py ve TelegramBot aynı bağlantıyı kullanır)
+_shared_databases = {}
+_shared_lock = threading.Lock()
+
+def get_database(db_path: str = "users.db") -> DatabaseManager:
+    """Süreç içinde paylaşılan DatabaseManager'ı getir, yoksa oluştur"""
+    with _shared_lock:
+        db = _shared_databases.get(db_path)
+        if db is None:
+            db = DatabaseManager(db_path)
+            _shared_databases[db_path] = db
+        return db
+
+
+class LRUCache:
+    """Boyutu sınırlı, en uzun süre kullanılmayanı atan önbellek"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, default=None):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def invalidate(self, key):
+        self._data.pop(key, None)
+    
+    def clear(self):
+        self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+_MISSING = object()
+
+class AsyncDatabaseManager:
+    """
+    DatabaseManager'ın async karşılığı (aynı metotlar, await ile çağrılır)
+    Sorgular tek bir veritabanı iş parçacığında sırayla çalışır; yavaş disk veya yazma
+    kilidi olay döngüsünü (komutları ve kontenjan takibini) bekletmez.
+    Kullanıcı profilleri ve ders listeleri önbellekten okunur, yazmalarda geçersiz kılınır.
+    """
+    
+    def __init__(self, db: DatabaseManager, cache_size: int = USER_CACHE_SIZE):
+        self.db = db
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+        self.user_cache = LRUCache(cache_size)
+        self.course_cache = LRUCache(cache_size)
+    
+    async def run(self, func, *args, **kwargs):
+        """func'ı veritabanı iş parçacığında çalıştır ve sonucunu bekle"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
+    def __getattr__(self, name):
+        attr = getattr(self.db, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+        return call
+    
+    # Önbellekli okumalar (dönen değerler paylaşılır, değiştirilmemeli)
+    
+    async def get_user(self, user_id: int) -> Optional[Dict]:
+        user = self.user_cache.get(user_id, _MISSING)
+        if user is _MISSING:
+            user = await self.run(self.db.get_user, user_id)
+            self.user_cache.put(user_id, user)
+        return user
+    
+    async def get_user_courses(self, user_id: int) -> List[Dict]:
+        courses = self.course_cache.get(user_id)
+        if courses is None:
+            courses = await self.run(self.db.get_user_courses, user_id)
+            self.course_cache.put(user_id, courses)
+        return courses
+    
+    # Önbelleği geçersiz kılan yazmalar (yazma bittikten sonra; önceki okumalar eski değeri geri koyamaz)
+    
+    async def add_user(self, user_id: int, *args, **kwargs):
+        try:
+            return await self.run(self.db.add_user, user_id, *args, **kwargs)
+        finally:
+            self.user_cache.invalidate(user_id)
+    
+    async def add_course_to_user(self, user_id: int, *args, **kwargs):
+        try:
+            return await self.run(self.db.add_course_to_user, user_id, *args, **kwargs)
+        finally:
+            self.course_cache.invalidate(user_id)
+    
+    async def remove_course_from_user(self, user_id: int, *args, **kwargs):
+        try:
+            return await self.run(self.db.remove_course_from_user, user_id, *args, **kwargs)
+        finally:
+            self.course_cache.invalidate(user_id)
+    
+    async def add_courses(self, user_id: int, *args, **kwargs) -> List[str]:
+        try:
+            return await self.run(self.db.add_courses, user_id, *args, **kwargs)
+        finally:
+            self.course_cache.invalidate(user_id)
+    
+    async def remove_all_courses(self, user_id: int) -> int:
+        try:
+            return await self.run(self.db.remove_all_courses, user_id)
+        finally:
+            self.course_cache.invalidate(user_id)
+    
+    async def deactivate_chats(self, chat_ids: List[int]) -> int:
+        try:
+            return await self.run(self.db.deactivate_chats, chat_ids)
+        finally:
+            self.user_cache.clear()  # Sohbet -> kullanıcı eşlemesi tutulmuyor, nadir bir işlem
+    
+    def cache_stats(self) -> dict:
+        """Önbellek boyutu ve isabet oranları"""
+        return {'users': self.user_cache.stats(), 'courses': self.course_cache.stats()}
+    
+    def close(self):
+        """İş parçacığını bekleyen sorgular bitince kapat"""
+        self._executor.shutdown(wait=True)
+
+_shared_async_databases = {}
+
+def get_async_database(db_path: str = "users.db") -> AsyncDatabaseManager:
+    """Süreç içinde paylaşılan AsyncDatabaseManager'ı getir (aynı dosya için tek iş parçacığı)"""
+    with _shared_lock:
+        adb = _shared_async_databases.get(db_path)
+    if adb is None:
+        adb = AsyncDatabaseManager(get_database(db_path))
+        with _shared_lock:
+            adb = _shared_async_databases.setdefault(db_path, adb)
+    return adb
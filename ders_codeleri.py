@@ -1,646 +1,165 @@
-[
-    {
-        "bransKoduId": 42,
-        "dersBransKodu": "AKM"
-    },
-    {
-        "bransKoduId": 227,
-        "dersBransKodu": "ALM"
-    },
-    {
-        "bransKoduId": 305,
-        "dersBransKodu": "ARB"
-    },
-    {
-        "bransKoduId": 302,
-        "dersBransKodu": "ARC"
-    },
-    {
-        "bransKoduId": 43,
-        "dersBransKodu": "ATA"
-    },
-    {
-        "bransKoduId": 310,
-        "dersBransKodu": "BBF"
-    },
-    {
-        "bransKoduId": 200,
-        "dersBransKodu": "BEB"
-    },
-    {
-        "bransKoduId": 149,
-        "dersBransKodu": "BED"
-    },
-    {
-        "bransKoduId": 165,
-        "dersBransKodu": "BEN"
-    },
-    {
-        "bransKoduId": 38,
-        "dersBransKodu": "BIL"
-    },
-    {
-        "bransKoduId": 30,
-        "dersBransKodu": "BIO"
-    },
-    {
-        "bransKoduId": 3,
-        "dersBransKodu": "BLG"
-    },
-    {
-        "bransKoduId": 180,
-        "dersBransKodu": "BLS"
-    },
-    {
-        "bransKoduId": 155,
-        "dersBransKodu": "BUS"
-    },
-    {
-        "bransKoduId": 127,
-        "dersBransKodu": "CAB"
-    },
-    {
-        "bransKoduId": 304,
-        "dersBransKodu": "CEN"
-    },
-    {
-        "bransKoduId": 7,
-        "dersBransKodu": "CEV"
-    },
-    {
-        "bransKoduId": 169,
-        "dersBransKodu": "CHA"
-    },
-    {
-        "bransKoduId": 137,
-        "dersBransKodu": "CHE"
-    },
-    {
-        "bransKoduId": 81,
-        "dersBransKodu": "CHZ"
-    },
-    {
-        "bransKoduId": 142,
-        "dersBransKodu": "CIE"
-    },
-    {
-        "bransKoduId": 245,
-        "dersBransKodu": "CIN"
-    },
-    {
-        "bransKoduId": 146,
-        "dersBransKodu": "CMP"
-    },
-    {
-        "bransKoduId": 208,
-        "dersBransKodu": "COM"
-    },
-    {
-        "bransKoduId": 168,
-        "dersBransKodu": "CVH"
-    },
-    {
-        "bransKoduId": 243,
-        "dersBransKodu": "DAN"
-    },
-    {
-        "bransKoduId": 10,
-        "dersBransKodu": "DEN"
-    },
-    {
-        "bransKoduId": 163,
-        "dersBransKodu": "DFH"
-    },
-    {
-        "bransKoduId": 181,
-        "dersBransKodu": "DGH"
-    },
-    {
-        "bransKoduId": 44,
-        "dersBransKodu": "DNK"
-    },
-    {
-        "bransKoduId": 32,
-        "dersBransKodu": "DUI"
-    },
-    {
-        "bransKoduId": 141,
-        "dersBransKodu": "EAS"
-    },
-    {
-        "bransKoduId": 232,
-        "dersBransKodu": "ECN"
-    },
-    {
-        "bransKoduId": 154,
-        "dersBransKodu": "ECO"
-    },
-    {
-        "bransKoduId": 289,
-        "dersBransKodu": "EEE"
-    },
-    {
-        "bransKoduId": 294,
-        "dersBransKodu": "EEF"
-    },
-    {
-        "bransKoduId": 297,
-        "dersBransKodu": "EFN"
-    },
-    {
-        "bransKoduId": 182,
-        "dersBransKodu": "EHA"
-    },
-    {
-        "bransKoduId": 196,
-        "dersBransKodu": "EHB"
-    },
-    {
-        "bransKoduId": 241,
-        "dersBransKodu": "EHN"
-    },
-    {
-        "bransKoduId": 39,
-        "dersBransKodu": "EKO"
-    },
-    {
-        "bransKoduId": 59,
-        "dersBransKodu": "ELE"
-    },
-    {
-        "bransKoduId": 2,
-        "dersBransKodu": "ELH"
-    },
-    {
-        "bransKoduId": 1,
-        "dersBransKodu": "ELK"
-    },
-    {
-        "bransKoduId": 178,
-        "dersBransKodu": "ELT"
-    },
-    {
-        "bransKoduId": 15,
-        "dersBransKodu": "END"
-    },
-    {
-        "bransKoduId": 183,
-        "dersBransKodu": "ENE"
-    },
-    {
-        "bransKoduId": 179,
-        "dersBransKodu": "ENG"
-    },
-    {
-        "bransKoduId": 207,
-        "dersBransKodu": "ENR"
-    },
-    {
-        "bransKoduId": 225,
-        "dersBransKodu": "ENT"
-    },
-    {
-        "bransKoduId": 140,
-        "dersBransKodu": "ESL"
-    },
-    {
-        "bransKoduId": 164,
-        "dersBransKodu": "ESM"
-    },
-    {
-        "bransKoduId": 110,
-        "dersBransKodu": "ETK"
-    },
-    {
-        "bransKoduId": 22,
-        "dersBransKodu": "EUT"
-    },
-    {
-        "bransKoduId": 28,
-        "dersBransKodu": "FIZ"
-    },
-    {
-        "bransKoduId": 226,
-        "dersBransKodu": "FRA"
-    },
-    {
-        "bransKoduId": 175,
-        "dersBransKodu": "FZK"
-    },
-    {
-        "bransKoduId": 138,
-        "dersBransKodu": "GED"
-    },
-    {
-        "bransKoduId": 11,
-        "dersBransKodu": "GEM"
-    },
-    {
-        "bransKoduId": 74,
-        "dersBransKodu": "GEO"
-    },
-    {
-        "bransKoduId": 4,
-        "dersBransKodu": "GID"
-    },
-    {
-        "bransKoduId": 162,
-        "dersBransKodu": "GLY"
-    },
-    {
-        "bransKoduId": 46,
-        "dersBransKodu": "GMI"
-    },
-    {
-        "bransKoduId": 176,
-        "dersBransKodu": "GMK"
-    },
-    {
-        "bransKoduId": 109,
-        "dersBransKodu": "GMZ"
-    },
-    {
-        "bransKoduId": 53,
-        "dersBransKodu": "GSB"
-    },
-    {
-        "bransKoduId": 173,
-        "dersBransKodu": "GSN"
-    },
-    {
-        "bransKoduId": 31,
-        "dersBransKodu": "GUV"
-    },
-    {
-        "bransKoduId": 177,
-        "dersBransKodu": "GVT"
-    },
-    {
-        "bransKoduId": 111,
-        "dersBransKodu": "GVZ"
-    },
-    {
-        "bransKoduId": 256,
-        "dersBransKodu": "HSS"
-    },
-    {
-        "bransKoduId": 41,
-        "dersBransKodu": "HUK"
-    },
-    {
-        "bransKoduId": 301,
-        "dersBransKodu": "IAD"
-    },
-    {
-        "bransKoduId": 63,
-        "dersBransKodu": "ICM"
-    },
-    {
-        "bransKoduId": 253,
-        "dersBransKodu": "ILT"
-    },
-    {
-        "bransKoduId": 112,
-        "dersBransKodu": "IML"
-    },
-    {
-        "bransKoduId": 300,
-        "dersBransKodu": "IND"
-    },
-    {
-        "bransKoduId": 33,
-        "dersBransKodu": "ING"
-    },
-    {
-        "bransKoduId": 8,
-        "dersBransKodu": "INS"
-    },
-    {
-        "bransKoduId": 153,
-        "dersBransKodu": "ISE"
-    },
-    {
-        "bransKoduId": 231,
-        "dersBransKodu": "ISH"
-    },
-    {
-        "bransKoduId": 14,
-        "dersBransKodu": "ISL"
-    },
-    {
-        "bransKoduId": 228,
-        "dersBransKodu": "ISP"
-    },
-    {
-        "bransKoduId": 255,
-        "dersBransKodu": "ITA"
-    },
-    {
-        "bransKoduId": 50,
-        "dersBransKodu": "ITB"
-    },
-    {
-        "bransKoduId": 9,
-        "dersBransKodu": "JDF"
-    },
-    {
-        "bransKoduId": 19,
-        "dersBransKodu": "JEF"
-    },
-    {
-        "bransKoduId": 18,
-        "dersBransKodu": "JEO"
-    },
-    {
-        "bransKoduId": 202,
-        "dersBransKodu": "JPN"
-    },
-    {
-        "bransKoduId": 27,
-        "dersBransKodu": "KIM"
-    },
-    {
-        "bransKoduId": 6,
-        "dersBransKodu": "KMM"
-    },
-    {
-        "bransKoduId": 125,
-        "dersBransKodu": "KMP"
-    },
-    {
-        "bransKoduId": 58,
-        "dersBransKodu": "KON"
-    },
-    {
-        "bransKoduId": 156,
-        "dersBransKodu": "LAT"
-    },
-    {
-        "bransKoduId": 16,
-        "dersBransKodu": "MAD"
-    },
-    {
-        "bransKoduId": 12,
-        "dersBransKodu": "MAK"
-    },
-    {
-        "bransKoduId": 48,
-        "dersBransKodu": "MAL"
-    },
-    {
-        "bransKoduId": 148,
-        "dersBransKodu": "MAR"
-    },
-    {
-        "bransKoduId": 26,
-        "dersBransKodu": "MAT"
-    },
-    {
-        "bransKoduId": 160,
-        "dersBransKodu": "MCH"
-    },
-    {
-        "bransKoduId": 293,
-        "dersBransKodu": "MDN"
-    },
-    {
-        "bransKoduId": 47,
-        "dersBransKodu": "MEK"
-    },
-    {
-        "bransKoduId": 258,
-        "dersBransKodu": "MEN"
-    },
-    {
-        "bransKoduId": 5,
-        "dersBransKodu": "MET"
-    },
-    {
-        "bransKoduId": 20,
-        "dersBransKodu": "MIM"
-    },
-    {
-        "bransKoduId": 184,
-        "dersBransKodu": "MKN"
-    },
-    {
-        "bransKoduId": 290,
-        "dersBransKodu": "MMD"
-    },
-    {
-        "bransKoduId": 150,
-        "dersBransKodu": "MOD"
-    },
-    {
-        "bransKoduId": 157,
-        "dersBransKodu": "MRE"
-    },
-    {
-        "bransKoduId": 158,
-        "dersBransKodu": "MRT"
-    },
-    {
-        "bransKoduId": 257,
-        "dersBransKodu": "MST"
-    },
-    {
-        "bransKoduId": 143,
-        "dersBransKodu": "MTH"
-    },
-    {
-        "bransKoduId": 174,
-        "dersBransKodu": "MTK"
-    },
-    {
-        "bransKoduId": 260,
-        "dersBransKodu": "MTM"
-    },
-    {
-        "bransKoduId": 23,
-        "dersBransKodu": "MTO"
-    },
-    {
-        "bransKoduId": 199,
-        "dersBransKodu": "MTR"
-    },
-    {
-        "bransKoduId": 29,
-        "dersBransKodu": "MUH"
-    },
-    {
-        "bransKoduId": 40,
-        "dersBransKodu": "MUK"
-    },
-    {
-        "bransKoduId": 126,
-        "dersBransKodu": "MUT"
-    },
-    {
-        "bransKoduId": 128,
-        "dersBransKodu": "MUZ"
-    },
-    {
-        "bransKoduId": 309,
-        "dersBransKodu": "MYZ"
-    },
-    {
-        "bransKoduId": 259,
-        "dersBransKodu": "NAE"
-    },
-    {
-        "bransKoduId": 263,
-        "dersBransKodu": "NTH"
-    },
-    {
-        "bransKoduId": 161,
-        "dersBransKodu": "ODS"
-    },
-    {
-        "bransKoduId": 151,
-        "dersBransKodu": "PAZ"
-    },
-    {
-        "bransKoduId": 64,
-        "dersBransKodu": "PEM"
-    },
-    {
-        "bransKoduId": 17,
-        "dersBransKodu": "PET"
-    },
-    {
-        "bransKoduId": 262,
-        "dersBransKodu": "PHE"
-    },
-    {
-        "bransKoduId": 147,
-        "dersBransKodu": "PHY"
-    },
-    {
-        "bransKoduId": 203,
-        "dersBransKodu": "PREP"
-    },
-    {
-        "bransKoduId": 36,
-        "dersBransKodu": "RES"
-    },
-    {
-        "bransKoduId": 307,
-        "dersBransKodu": "ROS"
-    },
-    {
-        "bransKoduId": 237,
-        "dersBransKodu": "RUS"
-    },
-    {
-        "bransKoduId": 21,
-        "dersBransKodu": "SBP"
-    },
-    {
-        "bransKoduId": 308,
-        "dersBransKodu": "SEC"
-    },
-    {
-        "bransKoduId": 288,
-        "dersBransKodu": "SED"
-    },
-    {
-        "bransKoduId": 171,
-        "dersBransKodu": "SEN"
-    },
-    {
-        "bransKoduId": 124,
-        "dersBransKodu": "SES"
-    },
-    {
-        "bransKoduId": 291,
-        "dersBransKodu": "SGI"
-    },
-    {
-        "bransKoduId": 193,
-        "dersBransKodu": "SNT"
-    },
-    {
-        "bransKoduId": 172,
-        "dersBransKodu": "SPA"
-    },
-    {
-        "bransKoduId": 37,
-        "dersBransKodu": "STA"
-    },
-    {
-        "bransKoduId": 159,
-        "dersBransKodu": "STI"
-    },
-    {
-        "bransKoduId": 261,
-        "dersBransKodu": "TDW"
-    },
-    {
-        "bransKoduId": 121,
-        "dersBransKodu": "TEB"
-    },
-    {
-        "bransKoduId": 13,
-        "dersBransKodu": "TEK"
-    },
-    {
-        "bransKoduId": 57,
-        "dersBransKodu": "TEL"
-    },
-    {
-        "bransKoduId": 49,
-        "dersBransKodu": "TER"
-    },
-    {
-        "bransKoduId": 269,
-        "dersBransKodu": "TES"
-    },
-    {
-        "bransKoduId": 129,
-        "dersBransKodu": "THO"
-    },
-    {
-        "bransKoduId": 65,
-        "dersBransKodu": "TRN"
-    },
-    {
-        "bransKoduId": 215,
-        "dersBransKodu": "TRS"
-    },
-    {
-        "bransKoduId": 170,
-        "dersBransKodu": "TRZ"
-    },
-    {
-        "bransKoduId": 34,
-        "dersBransKodu": "TUR"
-    },
-    {
-        "bransKoduId": 25,
-        "dersBransKodu": "UCK"
-    },
-    {
-        "bransKoduId": 195,
-        "dersBransKodu": "ULP"
-    },
-    {
-        "bransKoduId": 24,
-        "dersBransKodu": "UZB"
-    },
-    {
-        "bransKoduId": 306,
-        "dersBransKodu": "VBA"
-    },
-    {
-        "bransKoduId": 198,
-        "dersBransKodu": "X100"
-    },
-    {
-        "bransKoduId": 213,
-        "dersBransKodu": "YTO"
-    },
-    {
-        "bransKoduId": 221,
-        "dersBransKodu": "YZV"
-    }
-]
\ No newline at end of file
+# Bu dosya "python branch_catalog.py refresh" ile OBS'den üretilir, elle düzenlemeyin.
+# Kaynak: https://obs.itu.edu.tr/public/DersProgram/SearchBransKoduByProgramSeviye?programSeviyeTipiAnahtari=LS
+BRANS_KODLARI = [
+    {'bransKoduId': 42, 'dersBransKodu': 'AKM'},
+    {'bransKoduId': 227, 'dersBransKodu': 'ALM'},
+    {'bransKoduId': 305, 'dersBransKodu': 'ARB'},
+    {'bransKoduId': 302, 'dersBransKodu': 'ARC'},
+    {'bransKoduId': 43, 'dersBransKodu': 'ATA'},
+    {'bransKoduId': 310, 'dersBransKodu': 'BBF'},
+    {'bransKoduId': 200, 'dersBransKodu': 'BEB'},
+    {'bransKoduId': 149, 'dersBransKodu': 'BED'},
+    {'bransKoduId': 165, 'dersBransKodu': 'BEN'},
+    {'bransKoduId': 38, 'dersBransKodu': 'BIL'},
+    {'bransKoduId': 30, 'dersBransKodu': 'BIO'},
+    {'bransKoduId': 3, 'dersBransKodu': 'BLG'},
+    {'bransKoduId': 180, 'dersBransKodu': 'BLS'},
+    {'bransKoduId': 155, 'dersBransKodu': 'BUS'},
+    {'bransKoduId': 127, 'dersBransKodu': 'CAB'},
+    {'bransKoduId': 304, 'dersBransKodu': 'CEN'},
+    {'bransKoduId': 7, 'dersBransKodu': 'CEV'},
+    {'bransKoduId': 169, 'dersBransKodu': 'CHA'},
+    {'bransKoduId': 137, 'dersBransKodu': 'CHE'},
+    {'bransKoduId': 81, 'dersBransKodu': 'CHZ'},
+    {'bransKoduId': 142, 'dersBransKodu': 'CIE'},
+    {'bransKoduId': 245, 'dersBransKodu': 'CIN'},
+    {'bransKoduId': 146, 'dersBransKodu': 'CMP'},
+    {'bransKoduId': 208, 'dersBransKodu': 'COM'},
+    {'bransKoduId': 168, 'dersBransKodu': 'CVH'},
+    {'bransKoduId': 243, 'dersBransKodu': 'DAN'},
+    {'bransKoduId': 10, 'dersBransKodu': 'DEN'},
+    {'bransKoduId': 163, 'dersBransKodu': 'DFH'},
+    {'bransKoduId': 181, 'dersBransKodu': 'DGH'},
+    {'bransKoduId': 44, 'dersBransKodu': 'DNK'},
+    {'bransKoduId': 32, 'dersBransKodu': 'DUI'},
+    {'bransKoduId': 141, 'dersBransKodu': 'EAS'},
+    {'bransKoduId': 232, 'dersBransKodu': 'ECN'},
+    {'bransKoduId': 154, 'dersBransKodu': 'ECO'},
+    {'bransKoduId': 289, 'dersBransKodu': 'EEE'},
+    {'bransKoduId': 294, 'dersBransKodu': 'EEF'},
+    {'bransKoduId': 297, 'dersBransKodu': 'EFN'},
+    {'bransKoduId': 182, 'dersBransKodu': 'EHA'},
+    {'bransKoduId': 196, 'dersBransKodu': 'EHB'},
+    {'bransKoduId': 241, 'dersBransKodu': 'EHN'},
+    {'bransKoduId': 39, 'dersBransKodu': 'EKO'},
+    {'bransKoduId': 59, 'dersBransKodu': 'ELE'},
+    {'bransKoduId': 2, 'dersBransKodu': 'ELH'},
+    {'bransKoduId': 1, 'dersBransKodu': 'ELK'},
+    {'bransKoduId': 178, 'dersBransKodu': 'ELT'},
+    {'bransKoduId': 15, 'dersBransKodu': 'END'},
+    {'bransKoduId': 183, 'dersBransKodu': 'ENE'},
+    {'bransKoduId': 179, 'dersBransKodu': 'ENG'},
+    {'bransKoduId': 207, 'dersBransKodu': 'ENR'},
+    {'bransKoduId': 225, 'dersBransKodu': 'ENT'},
+    {'bransKoduId': 140, 'dersBransKodu': 'ESL'},
+    {'bransKoduId': 164, 'dersBransKodu': 'ESM'},
+    {'bransKoduId': 110, 'dersBransKodu': 'ETK'},
+    {'bransKoduId': 22, 'dersBransKodu': 'EUT'},
+    {'bransKoduId': 28, 'dersBransKodu': 'FIZ'},
+    {'bransKoduId': 226, 'dersBransKodu': 'FRA'},
+    {'bransKoduId': 175, 'dersBransKodu': 'FZK'},
+    {'bransKoduId': 138, 'dersBransKodu': 'GED'},
+    {'bransKoduId': 11, 'dersBransKodu': 'GEM'},
+    {'bransKoduId': 74, 'dersBransKodu': 'GEO'},
+    {'bransKoduId': 4, 'dersBransKodu': 'GID'},
+    {'bransKoduId': 162, 'dersBransKodu': 'GLY'},
+    {'bransKoduId': 46, 'dersBransKodu': 'GMI'},
+    {'bransKoduId': 176, 'dersBransKodu': 'GMK'},
+    {'bransKoduId': 109, 'dersBransKodu': 'GMZ'},
+    {'bransKoduId': 53, 'dersBransKodu': 'GSB'},
+    {'bransKoduId': 173, 'dersBransKodu': 'GSN'},
+    {'bransKoduId': 31, 'dersBransKodu': 'GUV'},
+    {'bransKoduId': 177, 'dersBransKodu': 'GVT'},
+    {'bransKoduId': 111, 'dersBransKodu': 'GVZ'},
+    {'bransKoduId': 256, 'dersBransKodu': 'HSS'},
+    {'bransKoduId': 41, 'dersBransKodu': 'HUK'},
+    {'bransKoduId': 301, 'dersBransKodu': 'IAD'},
+    {'bransKoduId': 63, 'dersBransKodu': 'ICM'},
+    {'bransKoduId': 253, 'dersBransKodu': 'ILT'},
+    {'bransKoduId': 112, 'dersBransKodu': 'IML'},
+    {'bransKoduId': 300, 'dersBransKodu': 'IND'},
+    {'bransKoduId': 33, 'dersBransKodu': 'ING'},
+    {'bransKoduId': 8, 'dersBransKodu': 'INS'},
+    {'bransKoduId': 153, 'dersBransKodu': 'ISE'},
+    {'bransKoduId': 231, 'dersBransKodu': 'ISH'},
+    {'bransKoduId': 14, 'dersBransKodu': 'ISL'},
+    {'bransKoduId': 228, 'dersBransKodu': 'ISP'},
+    {'bransKoduId': 255, 'dersBransKodu': 'ITA'},
+    {'bransKoduId': 50, 'dersBransKodu': 'ITB'},
+    {'bransKoduId': 9, 'dersBransKodu': 'JDF'},
+    {'bransKoduId': 19, 'dersBransKodu': 'JEF'},
+    {'bransKoduId': 18, 'dersBransKodu': 'JEO'},
+    {'bransKoduId': 202, 'dersBransKodu': 'JPN'},
+    {'bransKoduId': 27, 'dersBransKodu': 'KIM'},
+    {'bransKoduId': 6, 'dersBransKodu': 'KMM'},
+    {'bransKoduId': 125, 'dersBransKodu': 'KMP'},
+    {'bransKoduId': 58, 'dersBransKodu': 'KON'},
+    {'bransKoduId': 156, 'dersBransKodu': 'LAT'},
+    {'bransKoduId': 16, 'dersBransKodu': 'MAD'},
+    {'bransKoduId': 12, 'dersBransKodu': 'MAK'},
+    {'bransKoduId': 48, 'dersBransKodu': 'MAL'},
+    {'bransKoduId': 148, 'dersBransKodu': 'MAR'},
+    {'bransKoduId': 26, 'dersBransKodu': 'MAT'},
+    {'bransKoduId': 160, 'dersBransKodu': 'MCH'},
+    {'bransKoduId': 293, 'dersBransKodu': 'MDN'},
+    {'bransKoduId': 47, 'dersBransKodu': 'MEK'},
+    {'bransKoduId': 258, 'dersBransKodu': 'MEN'},
+    {'bransKoduId': 5, 'dersBransKodu': 'MET'},
+    {'bransKoduId': 20, 'dersBransKodu': 'MIM'},
+    {'bransKoduId': 184, 'dersBransKodu': 'MKN'},
+    {'bransKoduId': 290, 'dersBransKodu': 'MMD'},
+    {'bransKoduId': 150, 'dersBransKodu': 'MOD'},
+    {'bransKoduId': 157, 'dersBransKodu': 'MRE'},
+    {'bransKoduId': 158, 'dersBransKodu': 'MRT'},
+    {'bransKoduId': 257, 'dersBransKodu': 'MST'},
+    {'bransKoduId': 143, 'dersBransKodu': 'MTH'},
+    {'bransKoduId': 174, 'dersBransKodu': 'MTK'},
+    {'bransKoduId': 260, 'dersBransKodu': 'MTM'},
+    {'bransKoduId': 23, 'dersBransKodu': 'MTO'},
+    {'bransKoduId': 199, 'dersBransKodu': 'MTR'},
+    {'bransKoduId': 29, 'dersBransKodu': 'MUH'},
+    {'bransKoduId': 40, 'dersBransKodu': 'MUK'},
+    {'bransKoduId': 126, 'dersBransKodu': 'MUT'},
+    {'bransKoduId': 128, 'dersBransKodu': 'MUZ'},
+    {'bransKoduId': 309, 'dersBransKodu': 'MYZ'},
+    {'bransKoduId': 259, 'dersBransKodu': 'NAE'},
+    {'bransKoduId': 263, 'dersBransKodu': 'NTH'},
+    {'bransKoduId': 161, 'dersBransKodu': 'ODS'},
+    {'bransKoduId': 151, 'dersBransKodu': 'PAZ'},
+    {'bransKoduId': 64, 'dersBransKodu': 'PEM'},
+    {'bransKoduId': 17, 'dersBransKodu': 'PET'},
+    {'bransKoduId': 262, 'dersBransKodu': 'PHE'},
+    {'bransKoduId': 147, 'dersBransKodu': 'PHY'},
+    {'bransKoduId': 203, 'dersBransKodu': 'PREP'},
+    {'bransKoduId': 36, 'dersBransKodu': 'RES'},
+    {'bransKoduId': 307, 'dersBransKodu': 'ROS'},
+    {'bransKoduId': 237, 'dersBransKodu': 'RUS'},
+    {'bransKoduId': 21, 'dersBransKodu': 'SBP'},
+    {'bransKoduId': 308, 'dersBransKodu': 'SEC'},
+    {'bransKoduId': 288, 'dersBransKodu': 'SED'},
+    {'bransKoduId': 171, 'dersBransKodu': 'SEN'},
+    {'bransKoduId': 124, 'dersBransKodu': 'SES'},
+    {'bransKoduId': 291, 'dersBransKodu': 'SGI'},
+    {'bransKoduId': 193, 'dersBransKodu': 'SNT'},
+    {'bransKoduId': 172, 'dersBransKodu': 'SPA'},
+    {'bransKoduId': 37, 'dersBransKodu': 'STA'},
+    {'bransKoduId': 159, 'dersBransKodu': 'STI'},
+    {'bransKoduId': 261, 'dersBransKodu': 'TDW'},
+    {'bransKoduId': 121, 'dersBransKodu': 'TEB'},
+    {'bransKoduId': 13, 'dersBransKodu': 'TEK'},
+    {'bransKoduId': 57, 'dersBransKodu': 'TEL'},
+    {'bransKoduId': 49, 'dersBransKodu': 'TER'},
+    {'bransKoduId': 269, 'dersBransKodu': 'TES'},
+    {'bransKoduId': 129, 'dersBransKodu': 'THO'},
+    {'bransKoduId': 65, 'dersBransKodu': 'TRN'},
+    {'bransKoduId': 215, 'dersBransKodu': 'TRS'},
+    {'bransKoduId': 170, 'dersBransKodu': 'TRZ'},
+    {'bransKoduId': 34, 'dersBransKodu': 'TUR'},
+    {'bransKoduId': 25, 'dersBransKodu': 'UCK'},
+    {'bransKoduId': 195, 'dersBransKodu': 'ULP'},
+    {'bransKoduId': 24, 'dersBransKodu': 'UZB'},
+    {'bransKoduId': 306, 'dersBransKodu': 'VBA'},
+    {'bransKoduId': 198, 'dersBransKodu': 'X100'},
+    {'bransKoduId': 213, 'dersBransKodu': 'YTO'},
+    {'bransKoduId': 221, 'dersBransKodu': 'YZV'},
+]
@@ -0,0 +1,600 @@
+import codecs
+import json
+import logging
+import os
+import re
+import time
+from html.parser import HTMLParser
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from bs4 import BeautifulSoup
+from class_yapisi import DersProgramList, DersListesi
+
+try:
+    import orjson
+except ImportError:  # İsteğe bağlı hızlı JSON çözücü
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+TABLE_ID = 'dersProgramContainer'
+MIN_CELLS = 11
+
+# HTML ayrıştırıcı seçimi: auto, selectolax, lxml veya bs4
+HTML_PARSER_BACKEND = os.getenv('HTML_PARSER_BACKEND', 'auto')
+# 1 ise seçilen ayrıştırıcının çıktısı her sayfada BeautifulSoup çıktısıyla karşılaştırılır
+HTML_PARSER_VERIFY = os.getenv('HTML_PARSER_VERIFY', '0') == '1'
+
+# Sütun adı -> OBS tablosundaki varsayılan sıra (başlık okunamazsa kullanılır)
+DEFAULT_COLUMNS: Dict[str, int] = {
+    'crn': 0,
+    'ders_kodu': 1,
+    'ders_adi': 2,
+    'ogretim_yontemi': 3,
+    'ad_soyad': 4,
+    'bina_kodu': 5,
+    'gun': 6,
+    'saat': 7,
+    'derslik': 8,
+    'kontenjan': 9,
+    'ogrenci_sayisi': 10,
+    'rezervasyon': 11,
+    'programlar': 12,
+    'on_sart': 13,
+    'sinif_onsart': 14,
+}
+
+# Normalize edilmiş başlık metni -> sütun adı
+HEADER_ALIASES: Dict[str, str] = {
+    'crn': 'crn',
+    'derskodu': 'ders_kodu',
+    'coursecode': 'ders_kodu',
+    'dersadi': 'ders_adi',
+    'coursetitle': 'ders_adi',
+    'coursename': 'ders_adi',
+    'ogretimyontemi': 'ogretim_yontemi',
+    'teachingmethod': 'ogretim_yontemi',
+    'egitmen': 'ad_soyad',
+    'ogretimuyesi': 'ad_soyad',
+    'ogretimelemani': 'ad_soyad',
+    'instructor': 'ad_soyad',
+    'bina': 'bina_kodu',
+    'building': 'bina_kodu',
+    'gun': 'gun',
+    'day': 'gun',
+    'saat': 'saat',
+    'time': 'saat',
+    'derslik': 'derslik',
+    'room': 'derslik',
+    'kontenjan': 'kontenjan',
+    'capacity': 'kontenjan',
+    'yazilan': 'ogrenci_sayisi',
+    'ogrencisayisi': 'ogrenci_sayisi',
+    'enrolled': 'ogrenci_sayisi',
+    'rezervasyon': 'rezervasyon',
+    'reservation': 'rezervasyon',
+    'dersialabilenprogramlar': 'programlar',
+    'programlar': 'programlar',
+    'majorrestriction': 'programlar',
+    'dersonsartlari': 'on_sart',
+    'onsartlar': 'on_sart',
+    'prerequisites': 'on_sart',
+    'sinifonsarti': 'sinif_onsart',
+    'classrestriction': 'sinif_onsart',
+}
+
+# Bu sütunlar başlıkta bulunamazsa başlık güvenilmez sayılır
+REQUIRED_COLUMNS = ('crn', 'ders_kodu', 'kontenjan', 'ogrenci_sayisi')
+
+_TR_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+
+def normalize_header(text: str) -> str:
+    """Başlık metnini karşılaştırma için sadeleştir ("Ders Ön Şartları" -> "dersonsartlari")"""
+    return _NON_ALNUM.sub('', text.replace('İ', 'i').lower().translate(_TR_FOLD))
+
+
+def resolve_columns(headers: List[str]) -> Dict[str, int]:
+    """Tablo başlığından sütun sıralarını çıkar; başlık eksikse varsayılan sırayı kullan"""
+    columns: Dict[str, int] = {}
+    for idx, header in enumerate(headers):
+        key = HEADER_ALIASES.get(normalize_header(header))
+        if key is not None and key not in columns:
+            columns[key] = idx
+
+    if not all(key in columns for key in REQUIRED_COLUMNS):
+        if headers:
+            logger.warning(f"Tablo başlığı tanınamadı, varsayılan sütun sırası kullanılıyor: {headers}")
+        return DEFAULT_COLUMNS
+    return columns
+
+
+def _clean(text: str) -> str:
+    return text.replace('\r', ' ').replace('\n', ' ')
+
+
+def _to_int(text: str) -> int:
+    return int(text) if text.isdigit() else 0
+
+
+def _cell(cells: List[str], idx: Optional[int]) -> str:
+    if idx is None or idx >= len(cells):
+        return "-"
+    return cells[idx]
+
+
+def ders_from_cells(cells: List[str], branscode,
+                    columns: Dict[str, int] = DEFAULT_COLUMNS) -> Optional[DersProgramList]:
+    """
+    Bir tablo satırının hücre metinlerinden DersProgramList oluştur
+    cells: her <td> için get_text(strip=True) karşılığı metin
+    columns: resolve_columns ile sayfa başına bir kez çözülen sütun sıraları
+    """
+    if len(cells) < MIN_CELLS:
+        return None
+
+    get = columns.get
+    saat_text = _clean(_cell(cells, get('saat')))
+    baslangic = "-"
+    bitis = "-"
+    if '/' in saat_text:
+        parts = saat_text.split('/')
+        if len(parts) >= 2:
+            baslangic = parts[0]
+            bitis = parts[1]
+
+    return DersProgramList(
+        ders_tanimi_id=0,
+        akademik_donem_kodu=0,
+        crn=_to_int(_clean(_cell(cells, get('crn')))),
+        ders_kodu=_cell(cells, get('ders_kodu')),
+        ders_brans_kodu_id=branscode,
+        dil_kodu="",
+        program_seviye_tipi="LS",
+        ders_adi=_clean(_cell(cells, get('ders_adi'))),
+        ogretim_yontemi=_clean(_cell(cells, get('ogretim_yontemi'))),
+        ad_soyad=_clean(_cell(cells, get('ad_soyad'))),
+        mekan_adi=_clean(_cell(cells, get('derslik'))),
+        gun_adi_tr=_clean(_cell(cells, get('gun'))),
+        gun_adi_en="",
+        baslangic_saati=baslangic,
+        bitis_saati=bitis,
+        webde_goster=True,
+        bina_kodu=_cell(cells, get('bina_kodu')),
+        kontenjan=_to_int(_clean(_cell(cells, get('kontenjan')))),
+        ogrenci_sayisi=_to_int(_clean(_cell(cells, get('ogrenci_sayisi')))),
+        program_seviye_tipi_id=2,
+        rezervasyon=_clean(_cell(cells, get('rezervasyon'))),
+        sinif_program=_clean(_cell(cells, get('programlar'))),
+        on_sart=_clean(_cell(cells, get('on_sart'))),
+        sinif_onsart=_clean(_cell(cells, get('sinif_onsart')))
+    )
+
+
+# Tablo çıkarıcılar: HTML -> (başlık metinleri, satırlar)
+# Satırlar hücre düğümlerinden oluşur; metin, backend'in metin fonksiyonuyla sadece gerektiğinde okunur.
+# Hücre metinleri BeautifulSoup get_text(strip=True) ile aynı olmalıdır.
+TableRows = Tuple[List[str], List[list]]
+
+
+def _bs4_text(node) -> str:
+    return node.get_text(strip=True)
+
+
+def extract_table_bs4(html_text: str) -> TableRows:
+    """Saf Python yedek ayrıştırıcı (BeautifulSoup + html.parser)"""
+    soup = BeautifulSoup(html_text, 'html.parser')
+    table = soup.find('table', id=TABLE_ID)
+    if table is None:
+        return [], []
+
+    headers = []
+    thead = table.find('thead')
+    if thead is not None:
+        header_row = thead.find('tr')
+        if header_row is not None:
+            headers = [_bs4_text(th) for th in header_row.find_all(['th', 'td'])]
+
+    tbody = table.find('tbody')
+    if tbody is None:
+        return headers, []
+    return headers, [tr.find_all('td') for tr in tbody.find_all('tr')]
+
+
+def _lxml_text(node) -> str:
+    return ''.join(part for part in (t.strip() for t in node.itertext()) if part)
+
+
+def extract_table_lxml(html_text: str) -> TableRows:
+    """lxml tabanlı hızlı ayrıştırıcı"""
+    import lxml.html
+
+    doc = lxml.html.fromstring(html_text)
+    tables = doc.xpath(f'//table[@id="{TABLE_ID}"]')
+    if not tables:
+        return [], []
+    table = tables[0]
+
+    header_cells = table.xpath('.//thead[1]//tr[1]')
+    headers = [_lxml_text(th) for th in header_cells[0] if th.tag in ('th', 'td')] if header_cells else []
+
+    tbodies = table.xpath('.//tbody')
+    if not tbodies:
+        return headers, []
+    return headers, [list(tr.iter('td')) for tr in tbodies[0].iter('tr')]
+
+
+def _selectolax_text(node) -> str:
+    return node.text(deep=True, separator='', strip=True)
+
+
+def extract_table_selectolax(html_text: str) -> TableRows:
+    """selectolax (Lexbor) tabanlı hızlı ayrıştırıcı"""
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html_text)
+    table = tree.css_first(f'table#{TABLE_ID}')
+    if table is None:
+        return [], []
+
+    headers = []
+    header_row = table.css_first('thead tr')
+    if header_row is not None:
+        headers = [_selectolax_text(th) for th in header_row.css('th, td')]
+
+    tbody = table.css_first('tbody')
+    if tbody is None:
+        return headers, []
+    return headers, [tr.css('td') for tr in tbody.css('tr')]
+
+
+# Backend adı -> (gerekli modül, tablo çıkarıcı, hücre metni fonksiyonu)
+TABLE_BACKENDS = {
+    'selectolax': ('selectolax', extract_table_selectolax, _selectolax_text),
+    'lxml': ('lxml', extract_table_lxml, _lxml_text),
+    'bs4': ('bs4', extract_table_bs4, _bs4_text),
+}
+
+
+def _is_installed(module_name: str) -> bool:
+    try:
+        __import__(module_name)
+        return True
+    except ImportError:
+        return False
+
+
+def select_backend(name: str = HTML_PARSER_BACKEND) -> str:
+    """Kullanılacak ayrıştırıcıyı seç; kurulu değilse bs4'e düş"""
+    if name == 'auto':
+        for candidate in ('selectolax', 'lxml'):
+            if _is_installed(TABLE_BACKENDS[candidate][0]):
+                return candidate
+        return 'bs4'
+
+    if name not in TABLE_BACKENDS:
+        logger.warning(f"Bilinmeyen HTML ayrıştırıcı '{name}', bs4 kullanılıyor.")
+        return 'bs4'
+    if not _is_installed(TABLE_BACKENDS[name][0]):
+        logger.warning(f"HTML ayrıştırıcı '{name}' kurulu değil, bs4 kullanılıyor.")
+        return 'bs4'
+    return name
+
+
+ACTIVE_BACKEND = select_backend()
+
+# DersProgramList alanı -> HTML tablosundaki sütun (alan projeksiyonu için)
+FIELD_COLUMNS: Dict[str, str] = {
+    'crn': 'crn',
+    'ders_kodu': 'ders_kodu',
+    'ders_adi': 'ders_adi',
+    'ogretim_yontemi': 'ogretim_yontemi',
+    'ad_soyad': 'ad_soyad',
+    'mekan_adi': 'derslik',
+    'gun_adi_tr': 'gun',
+    'baslangic_saati': 'saat',
+    'bitis_saati': 'saat',
+    'bina_kodu': 'bina_kodu',
+    'kontenjan': 'kontenjan',
+    'ogrenci_sayisi': 'ogrenci_sayisi',
+    'rezervasyon': 'rezervasyon',
+    'sinif_program': 'programlar',
+    'on_sart': 'on_sart',
+    'sinif_onsart': 'sinif_onsart',
+}
+
+
+def needed_columns(columns: Dict[str, int], fields: Optional[Iterable[str]]) -> Optional[Set[int]]:
+    """İstenen alanlar için okunması gereken sütun sıraları (None: hepsi)"""
+    if fields is None:
+        return None
+    keys = {FIELD_COLUMNS[field] for field in fields if field in FIELD_COLUMNS}
+    keys.add('ders_kodu')
+    return {columns[key] for key in keys if key in columns}
+
+
+def rows_to_ders_listesi(headers: List[str], rows: List[list], branscode, text=_bs4_text,
+                         wanted_codes: Optional[Set[str]] = None,
+                         fields: Optional[Iterable[str]] = None) -> DersListesi:
+    """
+    Çıkarılan tablo satırlarını DersListesi'ne çevir
+    wanted_codes: verilirse sadece bu ders kodlarının satırları oluşturulur (diğerlerinde sadece ders kodu okunur)
+    fields: verilirse sadece bu alanların sütunları okunur, diğerleri "-"/0 kalır
+    """
+    columns = resolve_columns(headers)
+    code_idx = columns.get('ders_kodu')
+    needed = needed_columns(columns, fields)
+
+    dersler = []
+    for cells in rows:
+        if len(cells) < MIN_CELLS:
+            continue
+        if wanted_codes is not None:
+            if code_idx is None or code_idx >= len(cells) or text(cells[code_idx]) not in wanted_codes:
+                continue
+        if needed is None:
+            texts = [text(cell) for cell in cells]
+        else:
+            texts = [text(cell) if idx in needed else "-" for idx, cell in enumerate(cells)]
+        ders = ders_from_cells(texts, branscode, columns)
+        if ders is not None:
+            dersler.append(ders)
+    return DersListesi(ders_program_list=dersler, guncellenme_saati="")
+
+
+def check_backend_equivalence(html_text: str, branscode, backend: str) -> List[str]:
+    """Seçilen ayrıştırıcının çıktısını BeautifulSoup çıktısıyla karşılaştır, farkları döndür"""
+    _, extract, text = TABLE_BACKENDS[backend]
+    expected = [d.to_dict() for d in rows_to_ders_listesi(*extract_table_bs4(html_text), branscode).ders_program_list]
+    actual = [d.to_dict() for d in rows_to_ders_listesi(*extract(html_text), branscode, text).ders_program_list]
+
+    differences = []
+    if len(expected) != len(actual):
+        differences.append(f"satır sayısı: bs4={len(expected)} {backend}={len(actual)}")
+    for idx, (exp, act) in enumerate(zip(expected, actual)):
+        for key in exp:
+            if exp[key] != act[key]:
+                differences.append(f"satır {idx} {key}: bs4={exp[key]!r} {backend}={act[key]!r}")
+    return differences
+
+
+def parse_html_ders_list(html_text, branscode, backend: Optional[str] = None,
+                         wanted_codes: Optional[Set[str]] = None, fields: Optional[Iterable[str]] = None):
+    """
+    OBS ders programı sayfasını seçili ayrıştırıcı ile DersListesi'ne çevir
+    wanted_codes/fields verilmezse tam çözümleme yapılır (katalog gibi tüm satırlara ihtiyaç duyan kullanımlar için).
+    """
+    backend = backend or ACTIVE_BACKEND
+    try:
+        try:
+            _, extract, text = TABLE_BACKENDS[backend]
+            headers, rows = extract(html_text)
+        except Exception as e:
+            if backend == 'bs4':
+                raise
+            logger.error(f"{backend} ayrıştırma hatası, bs4 kullanılıyor: {e}")
+            backend, text = 'bs4', _bs4_text
+            headers, rows = extract_table_bs4(html_text)
+
+        if HTML_PARSER_VERIFY and backend != 'bs4':
+            differences = check_backend_equivalence(html_text, branscode, backend)
+            if differences:
+                logger.warning(f"{backend} çıktısı bs4'ten farklı ({len(differences)} fark): {differences[:5]}")
+
+        return rows_to_ders_listesi(headers, rows, branscode, text, wanted_codes, fields)
+    except Exception:
+        return DersListesi(ders_program_list=[], guncellenme_saati="")
+
+
+def loads_json(content: bytes):
+    """JSON çöz (orjson kuruluysa onunla, değilse standart kütüphaneyle)"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def detect_payload_kind(content_type: Optional[str], content: bytes) -> str:
+    """Yanıtın JSON mu HTML mi olduğunu Content-Type ve ilk baytlara bakarak belirle"""
+    head = content[:64].lstrip(b'\xef\xbb\xbf \t\r\n')[:1]
+    if head in (b'{', b'['):
+        return 'json'
+    if head == b'<':
+        return 'html'
+    if content_type and 'json' in content_type.lower():
+        return 'json'
+    return 'html'
+
+
+def decode_payload(content: bytes, encoding: Optional[str], branscode,
+                   content_type: Optional[str] = None, wanted_codes: Optional[Set[str]] = None,
+                   fields: Optional[Iterable[str]] = None) -> Tuple[DersListesi, str]:
+    """
+    Ham OBS yanıtını (JSON veya HTML) DersListesi'ne çevir
+    wanted_codes/fields: sadece takip edilen derslerin satırlarını (ve istenen alanlarını) çöz
+    Returns: (ders listesi, kullanılan yol: 'json', 'html' veya 'json_error')
+    """
+    kind = detect_payload_kind(content_type, content)
+    if kind == 'json':
+        try:
+            return DersListesi.from_dict(loads_json(content), wanted_codes, fields), 'json'
+        except Exception as json_error:
+            # Beklenmedik durum: JSON gibi görünen yanıt çözülemedi, HTML olarak dene
+            logger.warning(f"JSON parsing hatası: {json_error}")
+            kind = 'json_error'
+
+    text = content.decode(encoding or 'utf-8', errors='replace')
+    return parse_html_ders_list(text, branscode, wanted_codes=wanted_codes, fields=fields), kind
+
+
+def decode_snapshot(content: bytes, encoding: Optional[str], branscode,
+                    content_type: Optional[str] = None, wanted_codes: Optional[Set[str]] = None,
+                    fields: Optional[Iterable[str]] = None) -> Tuple[str, List[tuple], str, float]:
+    """
+    İşçi süreçte çalışan ayrıştırma görevi
+    Nesneler yerine düz tuple'lar döndürür (pickle maliyeti düşük olsun diye).
+    Returns: (güncellenme saati, satırlar, kullanılan yol, süre)
+    """
+    start = time.perf_counter()
+    derslist, kind = decode_payload(content, encoding, branscode, content_type, wanted_codes, fields)
+    return derslist.guncellenme_saati, derslist.to_rows(), kind, time.perf_counter() - start
+
+
+class DecodeStats:
+    """Çözme yolu başına sayı ve süre istatistikleri"""
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._seconds: Dict[str, float] = {}
+
+    def record(self, kind: str, elapsed: float):
+        self._counts[kind] = self._counts.get(kind, 0) + 1
+        self._seconds[kind] = self._seconds.get(kind, 0.0) + elapsed
+
+    def stats(self) -> dict:
+        """Yol başına çağrı sayısı ve ortalama süre (ms)"""
+        return {
+            kind: {
+                'count': count,
+                'avg_ms': round(self._seconds[kind] / count * 1000, 2)
+            }
+            for kind, count in self._counts.items()
+        }
+
+
+class StreamingDersParser(HTMLParser):
+    """
+    dersProgramContainer tablosunu parça parça ayrıştıran artımlı parser
+    DOM ağacı kurmaz; her </tr> kapandığında satır pop_rows() ile alınabilir.
+    """
+
+    def __init__(self, branscode, wanted_codes: Optional[Set[str]] = None,
+                 fields: Optional[Iterable[str]] = None):
+        super().__init__(convert_charrefs=True)
+        self.branscode = branscode
+        self.wanted_codes = wanted_codes
+        self.fields = fields
+        self._needed = needed_columns(DEFAULT_COLUMNS, fields)
+        self._rows: List[DersProgramList] = []
+        self._table_depth = 0  # Hedef tablo içindeki <table> derinliği
+        self._in_thead = False
+        self._in_tbody = False
+        self._header_row = False
+        self._columns = DEFAULT_COLUMNS
+        self._cells: Optional[List[str]] = None
+        self._fragments: Optional[List[str]] = None
+        self._text: List[str] = []  # Henüz kapanmamış metin düğümü (parça sınırında bölünebilir)
+
+    def handle_starttag(self, tag, attrs):
+        self._end_text()
+        if tag == 'table':
+            if self._table_depth:
+                self._table_depth += 1
+            elif dict(attrs).get('id') == TABLE_ID:
+                self._table_depth = 1
+            return
+        if not self._table_depth:
+            return
+
+        if tag == 'thead':
+            self._in_thead = True
+        elif tag == 'tbody':
+            self._close_row()
+            self._in_thead = False
+            self._in_tbody = True
+        elif tag == 'tr' and (self._in_tbody or self._in_thead):
+            self._close_row()
+            self._cells = []
+            self._header_row = not self._in_tbody
+        elif (tag == 'td' or (tag == 'th' and self._header_row)) and self._cells is not None:
+            self._close_cell()
+            self._fragments = []
+
+    def handle_endtag(self, tag):
+        self._end_text()
+        if not self._table_depth:
+            return
+
+        if tag in ('td', 'th'):
+            self._close_cell()
+        elif tag == 'tr':
+            self._close_row()
+        elif tag == 'thead':
+            self._close_row()
+            self._in_thead = False
+        elif tag == 'tbody':
+            self._close_row()
+            self._in_tbody = False
+        elif tag == 'table':
+            self._table_depth -= 1
+            if not self._table_depth:
+                self._close_row()
+                self._in_tbody = False
+
+    def handle_data(self, data):
+        if self._fragments is not None:
+            self._text.append(data)
+
+    def _end_text(self):
+        if self._text:
+            if self._fragments is not None:
+                self._fragments.append(''.join(self._text))
+            self._text = []
+
+    def _close_cell(self):
+        self._end_text()
+        if self._fragments is not None and self._cells is not None:
+            # BeautifulSoup get_text(strip=True) ile aynı: parçaları kırp, boşları at, birleştir
+            self._cells.append(''.join(part for part in (f.strip() for f in self._fragments) if part))
+        self._fragments = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self._cells is not None:
+            if self._header_row:
+                # Sütun sıraları ilk başlık satırından bir kez çözülür
+                if self._columns is DEFAULT_COLUMNS:
+                    self._columns = resolve_columns(self._cells)
+                    self._needed = needed_columns(self._columns, self.fields)
+            else:
+                self._emit_row(self._cells)
+        self._cells = None
+        self._header_row = False
+
+    def _emit_row(self, cells: List[str]):
+        if len(cells) < MIN_CELLS:
+            return
+        if self.wanted_codes is not None and _cell(cells, self._columns.get('ders_kodu')) not in self.wanted_codes:
+            return
+        if self._needed is not None:
+            cells = [text if idx in self._needed else "-" for idx, text in enumerate(cells)]
+        ders = ders_from_cells(cells, self.branscode, self._columns)
+        if ders is not None:
+            self._rows.append(ders)
+
+    def pop_rows(self) -> List[DersProgramList]:
+        """Şimdiye kadar tamamlanan satırları al"""
+        rows, self._rows = self._rows, []
+        return rows
+
+
+async def aiter_ders_rows(response, branscode, hasher=None, wanted_codes: Optional[Set[str]] = None,
+                          fields: Optional[Iterable[str]] = None) -> AsyncIterator[DersProgramList]:
+    """
+    httpx akış yanıtını indirilirken ayrıştır ve satırları kapandıkça döndür
+    hasher verilirse ham gövde parçaları ona da beslenir (parmak izi için).
+    """
+    parser = StreamingDersParser(branscode, wanted_codes, fields)
+    decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+
+    async for chunk in response.aiter_bytes():
+        if hasher is not None:
+            hasher.update(chunk)
+        parser.feed(decoder.decode(chunk))
+        for ders in parser.pop_rows():
+            yield ders
+
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    for ders in parser.pop_rows():
+        yield ders
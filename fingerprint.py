@@ -0,0 +1,90 @@
+import hashlib
+from typing import Dict, Optional
+
+
+# check_list'in "yanıt bir önceki sorgudan farksız" dönüş değeri
+UNCHANGED = object()
+
+
+class BranchFingerprint:
+    """Bir branşın son yanıtına ait doğrulayıcılar"""
+    __slots__ = ('etag', 'last_modified', 'digest')
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], digest: bytes):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+
+
+def new_hasher():
+    """Parça parça beslenebilen gövde özetleyici"""
+    return hashlib.blake2b(digest_size=16)
+
+
+def content_digest(content: bytes) -> bytes:
+    """Ham yanıt gövdesinin hızlı özeti"""
+    hasher = new_hasher()
+    hasher.update(content)
+    return hasher.digest()
+
+
+class FingerprintStore:
+    """Branş bazında yanıt parmak izi deposu (değişmeyen yanıtları ayrıştırmadan atlamak için)"""
+
+    def __init__(self):
+        self._entries: Dict[int, BranchFingerprint] = {}
+        self.not_modified = 0  # Sunucunun 304 döndürdüğü sorgular
+        self.hash_hits = 0     # Gövde özeti aynı çıkan sorgular
+        self.misses = 0        # Ayrıştırılması gereken sorgular
+
+    def conditional_headers(self, branch_id: int) -> Dict[str, str]:
+        """Koşullu GET için istek başlıkları"""
+        entry = self._entries.get(branch_id)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def is_unchanged(self, branch_id: int, response, digest: Optional[bytes] = None) -> bool:
+        """
+        Yanıt bir önceki yanıtla aynı mı? (İstatistikleri de günceller)
+        digest: akış modunda okunurken hesaplanan gövde özeti
+        """
+        entry = self._entries.get(branch_id)
+        if entry is not None:
+            if response.status_code == 304:
+                self.not_modified += 1
+                return True
+            if digest is None:
+                digest = content_digest(response.content)
+            if entry.digest == digest:
+                self.hash_hits += 1
+                return True
+        self.misses += 1
+        return False
+
+    def remember(self, branch_id: int, response, digest: Optional[bytes] = None):
+        """Başarıyla ayrıştırılan yanıtın parmak izini sakla"""
+        self._entries[branch_id] = BranchFingerprint(
+            etag=response.headers.get('etag'),
+            last_modified=response.headers.get('last-modified'),
+            digest=digest if digest is not None else content_digest(response.content)
+        )
+
+    def invalidate(self, branch_id: int):
+        """Branşın parmak izini sil (bir sonraki yanıt mutlaka ayrıştırılır)"""
+        self._entries.pop(branch_id, None)
+
+    def stats(self) -> dict:
+        """İsabet/ıska sayıları"""
+        hits = self.not_modified + self.hash_hits
+        total = hits + self.misses
+        return {
+            'not_modified': self.not_modified,
+            'hash_hits': self.hash_hits,
+            'misses': self.misses,
+            'hit_ratio': round(hits / total, 3) if total else 0.0
+        }
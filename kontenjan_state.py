@@ -0,0 +1,190 @@
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+# Olay türleri
+OPENED = 'acildi'       # Dolu -> boş yer var
+FILLED = 'doldu'        # Boş yer var -> dolu
+INCREASED = 'artti'     # Boş yer sayısı arttı
+DECREASED = 'azaldi'    # Boş yer sayısı azaldı (hala yer var)
+
+# Kullanıcıya bildirilen olaylar
+NOTIFY_EVENTS = (OPENED, INCREASED)
+
+
+class KontenjanOlayi(NamedTuple):
+    """Bir şubenin (CRN) kontenjan durumundaki değişiklik"""
+    tur: str
+    crn: int
+    ders_kodu: str
+    branch_id: int
+    onceki_bos: int
+    bos: int
+    zaman: float
+    ders: object  # Olayı üreten DersProgramList satırı
+
+
+class SectionState:
+    """Bir şubenin son görülen kontenjan durumu"""
+    __slots__ = ('crn', 'branch_id', 'course_code', 'kontenjan', 'ogrenci_sayisi',
+                 'last_notified_at', 'changed_at', 'notify_pending')
+
+    def __init__(self, crn: int, branch_id: int, course_code: str, kontenjan: int,
+                 ogrenci_sayisi: int, last_notified_at: float = 0.0, changed_at: float = 0.0,
+                 notify_pending: bool = False):
+        self.crn = crn
+        self.branch_id = branch_id
+        self.course_code = course_code
+        self.kontenjan = kontenjan
+        self.ogrenci_sayisi = ogrenci_sayisi
+        self.last_notified_at = last_notified_at
+        self.changed_at = changed_at
+        self.notify_pending = notify_pending  # Bildirimi debounce yüzünden ertelendi, süre dolunca verilecek
+
+    @property
+    def bos(self) -> int:
+        """Boş yer sayısı (fazla kayıtlı şubelerde 0)"""
+        return max(0, self.kontenjan - self.ogrenci_sayisi)
+
+
+class SectionStateTable:
+    """
+    CRN bazında kontenjan durum tablosu
+    Her sorguda önceki durumla karşılaştırıp olay üretir; aynı açık kontenjan
+    için tekrar tekrar bildirim gönderilmez. Debounce süresi içindeki bildirim
+    atılmaz, ertelenir: süre dolduğunda şube hala açıksa OPENED üretilir.
+    """
+
+    def __init__(self, debounce: float = 600):
+        self.debounce = debounce  # Aynı şube için iki bildirim arasındaki en kısa süre (sn)
+        self._states: Dict[int, SectionState] = {}
+        self._dirty: Dict[int, SectionState] = {}
+        self._pending: Dict[int, SectionState] = {}  # Bildirimi ertelenmiş şubeler
+        self.suppressed = 0
+
+    def load(self, rows: Iterable[Dict]):
+        """Veritabanından kaydedilmiş durumları yükle"""
+        for row in rows:
+            state = SectionState(
+                crn=row['crn'],
+                branch_id=row['branch_id'],
+                course_code=row['course_code'],
+                kontenjan=row['kontenjan'],
+                ogrenci_sayisi=row['ogrenci_sayisi'],
+                last_notified_at=row['last_notified_at'] or 0.0,
+                changed_at=row['changed_at'] or 0.0,
+                notify_pending=bool(row.get('notify_pending'))
+            )
+            self._states[row['crn']] = state
+            if state.notify_pending:
+                self._pending[state.crn] = state
+
+    def get(self, crn: int) -> Optional[SectionState]:
+        return self._states.get(crn)
+
+    def update(self, branch_id: int, dersler: Iterable, now: Optional[float] = None) -> List[KontenjanOlayi]:
+        """Şubelerin yeni durumunu kaydet ve oluşan olayları döndür"""
+        now = now if now is not None else time.time()
+        events = []
+
+        for ders in dersler:
+            state = self._states.get(ders.crn)
+            if state is None:
+                state = SectionState(ders.crn, branch_id, ders.ders_kodu, ders.kontenjan, ders.ogrenci_sayisi,
+                                     changed_at=now)
+                self._states[ders.crn] = state
+                self._dirty[ders.crn] = state
+                # İlk kez görülen şubede yer varsa bir kez bildir
+                if state.bos > 0:
+                    events.append(self._event(OPENED, state, 0, ders, now))
+                continue
+
+            if state.kontenjan != ders.kontenjan or state.ogrenci_sayisi != ders.ogrenci_sayisi:
+                events.append(self._transition(state, branch_id, ders, now))
+
+            if state.notify_pending and now - state.last_notified_at >= self.debounce:
+                # Ertelenen bildirimin süresi doldu, şube hala açık
+                self._dirty[ders.crn] = state
+                events.append(self._event(OPENED, state, 0, ders, now))
+
+        return [event for event in events if event is not None]
+
+    def _transition(self, state: SectionState, branch_id: int, ders, now: float) -> Optional[KontenjanOlayi]:
+        """Değişen şubenin yeni sayılarını kaydet ve olayını üret"""
+        onceki_bos = state.bos
+        state.kontenjan = ders.kontenjan
+        state.ogrenci_sayisi = ders.ogrenci_sayisi
+        state.branch_id = branch_id
+        state.course_code = ders.ders_kodu
+        state.changed_at = now
+        self._dirty[ders.crn] = state
+
+        bos = state.bos
+        if bos == 0:
+            self._clear_pending(state)  # Doldu: ertelenen bildirim artık geçersiz
+        if onceki_bos == 0 and bos > 0:
+            return self._event(OPENED, state, onceki_bos, ders, now)
+        if onceki_bos > 0 and bos == 0:
+            return self._event(FILLED, state, onceki_bos, ders, now)
+        if bos > onceki_bos:
+            return self._event(INCREASED, state, onceki_bos, ders, now)
+        if bos < onceki_bos:
+            return self._event(DECREASED, state, onceki_bos, ders, now)
+        return None
+
+    def _clear_pending(self, state: SectionState):
+        state.notify_pending = False
+        self._pending.pop(state.crn, None)
+
+    def _event(self, tur: str, state: SectionState, onceki_bos: int, ders, now: float) -> Optional[KontenjanOlayi]:
+        if tur in NOTIFY_EVENTS:
+            # Dalgalanmaya karşı: yakın zamanda bildirilen şube için yeni bildirim üretme
+            if state.last_notified_at and now - state.last_notified_at < self.debounce:
+                # Atılmaz, ertelenir: süre dolunca şube hala açıksa update() OPENED üretir
+                self.suppressed += 1
+                state.notify_pending = True
+                self._pending[state.crn] = state
+                return None
+            state.last_notified_at = now
+            self._clear_pending(state)
+        return KontenjanOlayi(tur, state.crn, state.course_code, state.branch_id, onceki_bos, state.bos, now, ders)
+
+    def has_due_notification(self, branch_id: int, course_codes: Iterable[str], now: Optional[float] = None) -> bool:
+        """Branşın takip edilen derslerinde ertelenip süresi dolmuş bildirim var mı (yanıt değişmese de ayrıştırılmalı)"""
+        now = now if now is not None else time.time()
+        course_codes = set(course_codes)
+        return any(
+            state.branch_id == branch_id and state.course_code in course_codes
+            and now - state.last_notified_at >= self.debounce
+            for state in self._pending.values()
+        )
+
+    def dirty_rows(self, branch_id: Optional[int] = None) -> List[Dict]:
+        """
+        Kaydedilmemiş değişiklikleri veritabanı satırı olarak al (branch_id verilirse sadece o branşın)
+        Satırlar kayıt başarılı olup mark_saved() çağrılana kadar kirli kalır
+        """
+        return [self._row(state) for state in self._dirty.values()
+                if branch_id is None or state.branch_id == branch_id]
+
+    def mark_saved(self, rows: Iterable[Dict]):
+        """Veritabanına yazılan satırları kirli listesinden çıkar (o arada yeniden değişenler kalır)"""
+        for row in rows:
+            state = self._dirty.get(row['crn'])
+            if state is not None and self._row(state) == row:
+                del self._dirty[row['crn']]
+
+    @staticmethod
+    def _row(state: SectionState) -> Dict:
+        return {
+            'crn': state.crn,
+            'branch_id': state.branch_id,
+            'course_code': state.course_code,
+            'kontenjan': state.kontenjan,
+            'ogrenci_sayisi': state.ogrenci_sayisi,
+            'last_notified_at': state.last_notified_at,
+            'changed_at': state.changed_at,
+            'notify_pending': int(state.notify_pending)
+        }
+
+    def __len__(self) -> int:
+        return len(self._states)
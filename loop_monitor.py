@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+
+class LoopLagMonitor:
+    """Olay döngüsü gecikmesini ölçer (döngüyü bloklayan işler komutları da bekletir)"""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.reset()
+
+    def reset(self):
+        """İstatistikleri sıfırla"""
+        self.samples = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0  # 100 ms'den uzun gecikmeler
+
+    async def run(self):
+        """Belirli aralıklarla uyanıp planlanan zamandan ne kadar geç kalındığını ölç"""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+
+            self.samples += 1
+            self.total_lag += lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag > 0.1:
+                self.stalls += 1
+
+    def stats(self) -> dict:
+        """Gecikme istatistikleri (ms)"""
+        return {
+            'samples': self.samples,
+            'avg_ms': round(self.total_lag / self.samples * 1000, 2) if self.samples else 0.0,
+            'max_ms': round(self.max_lag * 1000, 2),
+            'stalls': self.stalls
+        }
@@ -0,0 +1,244 @@
+"""
+Telegram bildirim kuyruğu
+Bildirimler kuyruğa alınır ve işçi havuzu tarafından genel (~30 mesaj/sn) ve sohbet
+başına hız sınırına uyularak gönderilir; sorgu döngüsü teslimatı beklemez.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+logger = logging.getLogger(__name__)
+
+
+# Sohbete artık ulaşılamadığını gösteren BadRequest mesajları (küçük harf)
+UNREACHABLE_MESSAGES = (
+    'chat not found',
+    'user is deactivated',
+    'bot was blocked',
+    'bot was kicked',
+    'peer_id_invalid',
+    'chat_write_forbidden',
+)
+
+
+def is_unreachable_chat(error: BaseException) -> bool:
+    """Hata, sohbete bir daha mesaj gönderilemeyeceğini mi gösteriyor (engellendi, silindi, hesap kapandı)"""
+    if isinstance(error, Forbidden):
+        return True
+    if isinstance(error, BadRequest):
+        message = str(error).lower()
+        return any(text in message for text in UNREACHABLE_MESSAGES)
+    return False
+
+
+class _Bildirim:
+    """Kuyruktaki tek mesaj"""
+    __slots__ = ('chat_id', 'text', 'future', 'attempts', 'submitted_at')
+
+    def __init__(self, chat_id: int, text: str, future: asyncio.Future):
+        self.chat_id = chat_id
+        self.text = text
+        self.future = future
+        self.attempts = 0
+        self.submitted_at = time.monotonic()
+
+
+def retry_after_seconds(error: RetryAfter) -> float:
+    """RetryAfter süresini saniyeye çevir (sürüme göre int veya timedelta olabilir)"""
+    delay = error.retry_after
+    if hasattr(delay, 'total_seconds'):
+        delay = delay.total_seconds()
+    return float(delay)
+
+
+class NotificationDispatcher:
+    """
+    Hız sınırlı, eş zamanlı bildirim gönderici
+    send(chat_id, text) başarısızlıkta hata fırlatmalıdır; RetryAfter'da istenen süre
+    beklenir, geçici ağ hataları artan beklemeyle yeniden denenir.
+    """
+
+    def __init__(self, send: Callable[[int, str], Awaitable], workers: int = 8,
+                 rate: float = 30.0, per_chat_interval: float = 1.0,
+                 max_retries: int = 5, backoff: float = 1.0):
+        self.send = send
+        self.workers = workers
+        self.rate = rate                            # Genel sınır (mesaj/sn)
+        self.per_chat_interval = per_chat_interval  # Aynı sohbete iki mesaj arası (sn)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._pending = 0  # Kuyrukta, gönderimde veya yeniden denemeyi bekleyen mesajlar
+
+        # Genel token bucket (negatife düşebilir: sıradaki gönderimler için ayrılmış yer)
+        self._tokens = rate
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0  # RetryAfter sonrası tüm gönderimler bekler
+        self._chat_next: Dict[int, float] = {}
+
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.flood_waits = 0
+        self.unreachable = 0  # Engellenmiş / silinmiş sohbetler yüzünden başarısız olanlar
+        self._latencies = deque(maxlen=1000)
+
+    def start(self):
+        """İşçileri başlat (çalışan olay döngüsü içinde çağrılmalı)"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def submit(self, chat_id: int, text: str) -> asyncio.Future:
+        """
+        Mesajı kuyruğa al
+        Returns: teslim edildiğinde tamamlanan (veya son hatayı taşıyan) Future
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._pending += 1
+        self._queue.put_nowait(_Bildirim(chat_id, text, future))
+        return future
+
+    async def close(self, timeout: float = 10.0):
+        """Bekleyen mesajları en fazla timeout saniye gönder, sonra işçileri durdur"""
+        deadline = time.monotonic() + timeout
+        while self._pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _reserve(self, chat_id: int) -> float:
+        """Genel ve sohbet bazındaki sınıra göre gönderim için yer ayır, beklenecek süreyi döndür"""
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+        self._tokens -= 1
+        at = max(now, self._paused_until)
+        if self._tokens < 0:
+            at = max(at, now - self._tokens / self.rate)
+
+        chat_at = max(at, self._chat_next.get(chat_id, 0.0))
+        self._chat_next[chat_id] = chat_at + self.per_chat_interval
+        return chat_at - now
+
+    def _retry_later(self, item: _Bildirim, delay: float):
+        self.retried += 1
+        asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, item)
+
+    def _finish(self, item: _Bildirim, error: Optional[BaseException] = None):
+        self._pending -= 1
+        if item.future.done():
+            return
+        if error is None:
+            self.sent += 1
+            self._latencies.append(time.monotonic() - item.submitted_at)
+            item.future.set_result(True)
+        else:
+            self.failed += 1
+            if is_unreachable_chat(error):
+                self.unreachable += 1
+                logger.warning(f"Sohbete ulaşılamıyor ({item.chat_id}): {error}")
+            else:
+                logger.error(f"Bildirim gönderilemedi ({item.chat_id}): {error}")
+            item.future.set_exception(error)
+            item.future.exception()  # Kimse beklemiyorsa "never retrieved" uyarısı verme
+
+    async def _worker(self):
+        while True:
+            item = await self._queue.get()
+            try:
+                wait = self._reserve(item.chat_id)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                if time.monotonic() < self._paused_until:
+                    # Beklerken flood limitine girildi, sıraya geri koy
+                    self._retry_later(item, self._paused_until - time.monotonic())
+                    continue
+
+                item.attempts += 1
+                await self.send(item.chat_id, item.text)
+                self._finish(item)
+            except asyncio.CancelledError:
+                self._finish(item, asyncio.CancelledError())
+                raise
+            except RetryAfter as e:
+                delay = retry_after_seconds(e)
+                self.flood_waits += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                logger.warning(f"Telegram flood limiti: {delay:.0f} sn bekleniyor")
+                self._retry_later(item, delay)
+            except (Forbidden, BadRequest) as e:
+                # Kalıcı hata: yeniden denemek sonucu değiştirmez
+                self._finish(item, e)
+            except NetworkError as e:
+                if item.attempts > self.max_retries:
+                    self._finish(item, e)
+                else:
+                    self._retry_later(item, self.backoff * 2 ** (item.attempts - 1))
+            except Exception as e:
+                self._finish(item, e)
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        """Kuyruk ve teslimat istatistikleri"""
+        latencies = sorted(self._latencies)
+        return {
+            'queued': self._queue.qsize() if self._queue else 0,
+            'pending': self._pending,
+            'sent': self.sent,
+            'failed': self.failed,
+            'retried': self.retried,
+            'flood_waits': self.flood_waits,
+            'unreachable': self.unreachable,
+            'latency_avg_ms': round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+            'latency_p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1) if latencies else 0.0,
+        }
+
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+DIGEST_SEPARATOR = '\n\n'
+
+
+def digest_header(count: int) -> str:
+    return f"🔔 **{count} kontenjan bildirimi**"
+
+
+def pack_digest(items, limit: int = TELEGRAM_MESSAGE_LIMIT):
+    """
+    Bir sohbetin bildirimlerini sırasıyla mesajlara yerleştir, sadece Telegram mesaj sınırında yeni mesaja geç
+    items: (anahtar, metin) çiftleri
+    Returns: (mesajdaki anahtarlar, mesaj metni) listesi
+    """
+    budget = limit - len(digest_header(len(items))) - len(DIGEST_SEPARATOR)
+    groups = []
+    keys, texts, size = [], [], 0
+    for key, text in items:
+        text = text[:budget]  # Tek bildirim sınırı aşamaz (olağan dışı)
+        added = len(text) + (len(DIGEST_SEPARATOR) if texts else 0)
+        if texts and size + added > budget:
+            groups.append((keys, texts))
+            keys, texts, size = [], [], 0
+            added = len(text)
+        keys.append(key)
+        texts.append(text)
+        size += added
+    if texts:
+        groups.append((keys, texts))
+
+    messages = []
+    for keys, texts in groups:
+        if len(texts) > 1:
+            texts = [digest_header(len(texts))] + texts
+        messages.append((keys, DIGEST_SEPARATOR.join(texts)))
+    return messages
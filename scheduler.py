@@ -0,0 +1,214 @@
+import heapq
+import logging
+import math
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def parse_registration_windows(text: str) -> List[Tuple[datetime, datetime]]:
+    """
+    Kayıt dönemi takvimini çözümle
+    Format: "2026-09-22T10:00/2026-09-26T17:00;2027-02-09T10:00/2027-02-13T17:00"
+    """
+    windows = []
+    if not text:
+        return windows
+
+    for part in text.split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            start_text, end_text = part.split('/')
+            start = datetime.fromisoformat(start_text.strip())
+            end = datetime.fromisoformat(end_text.strip())
+        except ValueError:
+            logger.error(f"Geçersiz kayıt dönemi: {part}")
+            continue
+        if end > start:
+            windows.append((start, end))
+    return windows
+
+
+class PollScheduler:
+    """Branş bazlı uyarlanabilir sorgu zamanlayıcısı"""
+
+    def __init__(self, base_interval: float = 240, min_interval: float = 30,
+                 max_interval: float = 900, requests_per_minute: int = 60,
+                 registration_windows: Optional[List[Tuple[datetime, datetime]]] = None,
+                 registration_factor: float = 0.5, off_season_factor: float = 2.0,
+                 recent_change_window: float = 1800, recent_change_factor: float = 0.5):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.requests_per_minute = requests_per_minute
+        self.registration_windows = registration_windows or []
+        self.registration_factor = registration_factor
+        self.off_season_factor = off_season_factor
+        self.recent_change_window = recent_change_window
+        self.recent_change_factor = recent_change_factor
+
+        # (zamanı gelen an, branş) çiftlerinden oluşan öncelik kuyruğu
+        self._heap: List[Tuple[float, int]] = []
+        self._due: Dict[int, float] = {}
+        self._subscribers: Dict[int, int] = {}
+        self._last_change: Dict[int, float] = {}
+        self._in_flight: Dict[int, float] = {}
+
+        # İstek bütçesi (token bucket)
+        self._tokens = float(requests_per_minute)
+        self._last_refill = time.monotonic()
+
+        # Gecikme istatistikleri
+        self.polls = 0
+        self.background_requests = 0  # try_acquire ile bütçeden düşülen zamanlayıcı dışı istekler
+        self.overruns = 0
+        self.max_lateness = 0.0
+        self.poll_seconds = 0.0  # Tamamlanan sorguların toplam süresi
+        self.completed_polls = 0
+        self.max_poll_seconds = 0.0
+
+    def in_registration_window(self, now: Optional[datetime] = None) -> bool:
+        """Şu an bir kayıt dönemi içinde miyiz?"""
+        now = now or datetime.now()
+        return any(start <= now <= end for start, end in self.registration_windows)
+
+    def interval_for(self, branch_id: int, now: Optional[float] = None) -> float:
+        """Branş için bir sonraki sorguya kadar beklenecek süre"""
+        now = now if now is not None else time.monotonic()
+        subscribers = self._subscribers.get(branch_id, 0)
+
+        if subscribers <= 0:
+            return self.max_interval
+
+        # Takipçi arttıkça aralık kısalır: 1 takipçi -> taban, 100 takipçi -> taban / 3
+        interval = self.base_interval / (1 + math.log10(subscribers))
+
+        # Kontenjanı yakın zamanda değişen branşlar daha sık sorgulanır
+        last_change = self._last_change.get(branch_id)
+        if last_change is not None and now - last_change <= self.recent_change_window:
+            interval *= self.recent_change_factor
+
+        # Kayıt dönemi takvimi tanımlıysa dönem içinde sıklaştır, dışında seyrekleştir
+        if self.registration_windows:
+            if self.in_registration_window():
+                interval *= self.registration_factor
+            else:
+                interval *= self.off_season_factor
+
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def sync_branches(self, subscribers_by_branch: Dict[int, int]):
+        """Takip edilen branş listesini güncelle"""
+        now = time.monotonic()
+
+        for branch_id in list(self._subscribers):
+            if branch_id not in subscribers_by_branch:
+                del self._subscribers[branch_id]
+                self._due.pop(branch_id, None)
+                self._last_change.pop(branch_id, None)
+
+        for branch_id, count in subscribers_by_branch.items():
+            is_new = branch_id not in self._subscribers
+            self._subscribers[branch_id] = count
+            if is_new and branch_id not in self._in_flight:
+                # Yeni branşlar hemen sorgulanır
+                self._push(branch_id, now)
+
+    def _push(self, branch_id: int, due: float):
+        self._due[branch_id] = due
+        heapq.heappush(self._heap, (due, branch_id))
+
+    def _refill(self, now: float):
+        rate = self.requests_per_minute / 60.0
+        self._tokens = min(float(self.requests_per_minute), self._tokens + (now - self._last_refill) * rate)
+        self._last_refill = now
+
+    def pop_due(self) -> List[int]:
+        """Zamanı gelen ve bütçeye sığan branşları kuyruktan al"""
+        now = time.monotonic()
+        self._refill(now)
+
+        due_branches = []
+        while self._heap and self._heap[0][0] <= now and self._tokens >= 1:
+            due, branch_id = heapq.heappop(self._heap)
+            # Silinmiş veya yeniden zamanlanmış eski kayıtları atla
+            if self._due.get(branch_id) != due:
+                continue
+            del self._due[branch_id]
+
+            lateness = now - due
+            tolerance = max(5.0, self.interval_for(branch_id, now) * 0.25)
+            if lateness > tolerance:
+                self.overruns += 1
+                self.max_lateness = max(self.max_lateness, lateness)
+                logger.warning(f"Branş {branch_id} sorgusu {lateness:.1f} sn gecikti (bütçe veya eşzamanlılık yetersiz).")
+
+            self._tokens -= 1
+            self._in_flight[branch_id] = now
+            self.polls += 1
+            due_branches.append(branch_id)
+
+        return due_branches
+
+    def try_acquire(self, reserve: float = 0.0) -> bool:
+        """
+        Zamanlayıcı dışındaki bir OBS isteği (ör. ders kataloğu) için bütçeden bir hak al
+        reserve: takip sorgularına bırakılacak en az hak; kovada bundan fazlası yoksa istek yapılmamalı
+        """
+        self._refill(time.monotonic())
+        if self._tokens - 1 < reserve:
+            return False
+        self._tokens -= 1
+        self.background_requests += 1
+        return True
+
+    def record_result(self, branch_id: int, changed: bool):
+        """Sorgu sonucunu kaydet ve branşı yeniden zamanla"""
+        now = time.monotonic()
+        started = self._in_flight.pop(branch_id, None)
+        if started is not None:
+            self.completed_polls += 1
+            self.poll_seconds += now - started
+            self.max_poll_seconds = max(self.max_poll_seconds, now - started)
+        if changed:
+            self._last_change[branch_id] = now
+        if branch_id in self._subscribers:
+            self._push(branch_id, now + self.interval_for(branch_id, now))
+
+    def seconds_until_next(self) -> float:
+        """Bir sonraki sorguya kadar kalan süre"""
+        now = time.monotonic()
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return self.max_interval
+
+        wait = self._heap[0][0] - now
+        if self._tokens < 1:
+            # Bütçe boşsa bir istek hakkı dolana kadar bekle
+            wait = max(wait, (1 - self._tokens) * 60.0 / self.requests_per_minute)
+        return max(0.0, wait)
+
+    def planned_requests_per_minute(self) -> float:
+        """Mevcut aralıklarla dakikada yapılması planlanan istek sayısı"""
+        now = time.monotonic()
+        return sum(60.0 / self.interval_for(branch_id, now) for branch_id in self._subscribers)
+
+    def stats(self) -> dict:
+        """Zamanlayıcı istatistikleri"""
+        return {
+            'branches': len(self._subscribers),
+            'in_flight': len(self._in_flight),
+            'polls': self.polls,
+            'background_requests': self.background_requests,
+            'overruns': self.overruns,
+            'max_lateness': round(self.max_lateness, 1),
+            'avg_poll_seconds': round(self.poll_seconds / self.completed_polls, 2) if self.completed_polls else 0.0,
+            'max_poll_seconds': round(self.max_poll_seconds, 2),
+            'planned_rpm': round(self.planned_requests_per_minute(), 1),
+            'budget_rpm': self.requests_per_minute
+        }
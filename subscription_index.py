@@ -0,0 +1,134 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class SubscriptionIndex:
+    """
+    Bellekte abonelik indeksi: branş ID -> ders kodu -> sohbet ID'leri
+    Açılışta veritabanından kurulur, komutlar veritabanına yazdıkça artımlı güncellenir;
+    periyodik reconcile() veritabanıyla arasındaki farkları düzeltir.
+    """
+
+    def __init__(self):
+        self._by_branch: Dict[int, Dict[str, Set[int]]] = {}
+        self._users: Dict[int, Tuple[int, Dict[str, int]]] = {}  # user_id -> (chat_id, ders kodu -> branş)
+        self.version = 0  # Her artımlı değişiklikte artar
+
+    def load(self, rows: Iterable[Dict]):
+        """get_all_active_users satırlarından indeksi baştan kur"""
+        self._by_branch = {}
+        self._users = {}
+        for row in rows:
+            self._link(row['user_id'], row['chat_id'], row['course_code'], row['branch_id'])
+
+    def _link(self, user_id: int, chat_id: int, course_code: str, branch_id: int):
+        user = self._users.get(user_id)
+        if user is not None and user[0] != chat_id:
+            # Sohbet değişti: mevcut abonelikleri yeni sohbete taşı
+            courses = dict(user[1])
+            self._unlink_user(user_id)
+            for code, branch in courses.items():
+                self._link(user_id, chat_id, code, branch)
+            user = self._users.get(user_id)
+        if user is None:
+            user = (chat_id, {})
+            self._users[user_id] = user
+
+        old_branch = user[1].get(course_code)
+        if old_branch is not None and old_branch != branch_id:
+            self._unlink(user_id, course_code)
+        user[1][course_code] = branch_id
+        self._by_branch.setdefault(branch_id, {}).setdefault(course_code, set()).add(chat_id)
+
+    def _unlink(self, user_id: int, course_code: str):
+        user = self._users.get(user_id)
+        if user is None or course_code not in user[1]:
+            return
+        chat_id, courses = user
+        branch_id = courses.pop(course_code)
+        codes = self._by_branch.get(branch_id, {})
+        chats = codes.get(course_code)
+        if chats is not None:
+            chats.discard(chat_id)
+            if not chats:
+                del codes[course_code]
+                if not codes:
+                    del self._by_branch[branch_id]
+
+    def _unlink_user(self, user_id: int):
+        user = self._users.get(user_id)
+        if user is None:
+            return
+        for course_code in list(user[1]):
+            self._unlink(user_id, course_code)
+        del self._users[user_id]
+
+    def add(self, user_id: int, chat_id: int, course_code: str, branch_id: int):
+        """/add sonrası: kullanıcının aboneliğini ekle"""
+        self._link(user_id, chat_id, course_code, branch_id)
+        self.version += 1
+
+    def remove(self, user_id: int, course_code: str):
+        """/remove sonrası: kullanıcının aboneliğini kaldır"""
+        self._unlink(user_id, course_code)
+        self.version += 1
+
+    def remove_user(self, user_id: int):
+        """/removeall veya kullanıcı pasif olduğunda: tüm aboneliklerini kaldır"""
+        self._unlink_user(user_id)
+        self.version += 1
+
+    def set_user(self, user_id: int, chat_id: int, courses: Iterable[Dict]):
+        """/start sonrası: kullanıcının aboneliklerini veritabanındaki haliyle (aktif olarak) yeniden kur"""
+        self._unlink_user(user_id)
+        for course in courses:
+            self._link(user_id, chat_id, course['course_code'], course['branch_id'])
+        self.version += 1
+
+    def deactivate_chats(self, chat_ids: Iterable[int]):
+        """Pasif yapılan sohbetlerin kullanıcılarını indeksten çıkar"""
+        chat_ids = set(chat_ids)
+        for user_id in [u for u, (chat_id, _) in self._users.items() if chat_id in chat_ids]:
+            self._unlink_user(user_id)
+        self.version += 1
+
+    def chats_for(self, branch_id: int, course_code: str) -> Set[int]:
+        """Dersi takip eden aktif sohbetler (değiştirilmemeli)"""
+        return self._by_branch.get(branch_id, {}).get(course_code, set())
+
+    def work_plan(self) -> Tuple[Dict[int, Set[str]], Dict[int, int]]:
+        """
+        Takip edilen dersleri ve abonelik sayılarını branş ID'lerine göre getir
+        Returns: (branş -> ders kodları, branş -> abonelik sayısı)
+        """
+        courses_by_branch = {}
+        subscribers_by_branch = {}
+        for branch_id, codes in self._by_branch.items():
+            courses_by_branch[branch_id] = set(codes)
+            subscribers_by_branch[branch_id] = sum(len(chats) for chats in codes.values())
+        return courses_by_branch, subscribers_by_branch
+
+    def snapshot(self) -> Set[Tuple[int, int, str, int]]:
+        """(user_id, chat_id, ders kodu, branş) kümesi"""
+        return {
+            (user_id, chat_id, course_code, branch_id)
+            for user_id, (chat_id, courses) in self._users.items()
+            for course_code, branch_id in courses.items()
+        }
+
+    def reconcile(self, rows: List[Dict], version: Optional[int] = None) -> Optional[int]:
+        """
+        Veritabanından okunan satırlarla indeksi eşitle
+        version: satırlar okunmadan önceki self.version; o arada artımlı değişiklik olduysa
+        satırlar eski olabilir, eşitleme atlanır
+        Returns: düzeltilen abonelik sayısı (fark yoksa 0, atlandıysa None)
+        """
+        if version is not None and version != self.version:
+            return None
+        expected = {(r['user_id'], r['chat_id'], r['course_code'], r['branch_id']) for r in rows}
+        drift = len(expected ^ self.snapshot())
+        if drift:
+            self.load(rows)
+        return drift
+
+    def __len__(self) -> int:
+        return sum(len(courses) for _, courses in self._users.values())
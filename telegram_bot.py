@@ -1,16 +1,33 @@
 import asyncio
 import logging
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ContextTypes
-from database import DatabaseManager
+import re
+from telegram import (Update, InlineKeyboardButton, InlineKeyboardMarkup, InlineQueryResultArticle,
+                      InputTextMessageContent)
+from telegram.ext import (Application, CommandHandler, MessageHandler, CallbackQueryHandler, InlineQueryHandler,
+                          filters, ContextTypes)
+from database import get_async_database
 from course_validator import CourseValidator
+from notifier import is_unreachable_chat
 
 logger = logging.getLogger(__name__)
 
+# /add ile birden fazla ders: virgül, noktalı virgül veya satır sonuyla ayrılır
+COURSE_LIST_SEPARATOR = re.compile(r'[,;\n]+')
+
+# Geçersiz branşta benzer kod yoksa örnek olarak gösterilen yaygın branşlar
+EXAMPLE_BRANCHES = ('EHB', 'MAT', 'FIZ', 'KIM', 'BLG', 'MAK', 'INS', 'ELK', 'END', 'MIM')
+
+# Inline ders araması
+INLINE_RESULT_LIMIT = 20  # Telegram en fazla 50 sonuç kabul eder
+INLINE_CACHE_TIME = 300   # Aynı sorgunun sonuçlarını Telegram bu süre önbellekler (sn)
+
 class TelegramBot:
-    def __init__(self, bot_token: str):
+    def __init__(self, bot_token: str, subscriptions=None, course_catalog=None, course_search=None):
         self.bot_token = bot_token
-        self.db = DatabaseManager()
+        self.db = get_async_database()
+        self.subscriptions = subscriptions  # Bellekteki abonelik indeksi (SubscriptionIndex), yazmalardan sonra güncellenir
+        self.course_catalog = course_catalog  # Branş başına gerçek ders kodları (CourseCatalog), ağ isteği yapmaz
+        self.course_search = course_search    # Inline arama indeksi (CourseSearchIndex), bellekten cevap verir
         self.validator = CourseValidator()
         
         # Application oluştur
@@ -31,21 +48,28 @@ class TelegramBot:
         # Callback query handler (inline keyboard için)
         self.application.add_handler(CallbackQueryHandler(self.handle_callback))
         
+        # Inline ders araması (@bot_adı ders kodu / adı / öğretim üyesi)
+        self.application.add_handler(InlineQueryHandler(self.inline_query))
+        
         # Mesaj handler (ders kodu eklemek için)
         self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
     
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start komutu"""
         user = update.effective_user
+        previous = await self.db.get_user(user.id)
         
-        # Kullanıcıyı veritabanına ekle
-        self.db.add_user(
+        # Kullanıcıyı veritabanına ekle (botu engelleyip pasif yapılmış kullanıcı tekrar aktif olur)
+        await self.db.add_user(
             user_id=user.id,
             chat_id=update.effective_chat.id,
             username=user.username,
             first_name=user.first_name,
             last_name=user.last_name
         )
+        if self.subscriptions is not None:
+            # Pasif yapılmış kullanıcının dersleri tekrar takibe alınır
+            self.subscriptions.set_user(user.id, update.effective_chat.id, await self.db.get_user_courses(user.id))
         
         welcome_text = f"""
 🎓 **İTÜ Ders Kontenjan Takip Botu'na Hoş Geldiniz!**
@@ -66,6 +90,9 @@ Bu bot ile İTÜ derslerinin kontenjan değişikliklerini takip edebilirsiniz.
 `/add EHB 313E` yazarak ilk dersinizi ekleyebilirsiniz!
         """
         
+        if previous and not previous['is_active']:
+            welcome_text += "\n🔔 **Bildirimleriniz yeniden açıldı.** Takip listeniz korunmuştur.\n"
+        
         await update.message.reply_text(welcome_text, parse_mode='Markdown')
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -81,11 +108,15 @@ Bu bot, İTÜ OBS'deki ders kontenjanlarını sürekli kontrol eder ve kontenjan
 **➕ Ders Ekleme:**
 `/add EHB 313E` - EHB 313E dersini takip listesine ekler
 `/add MAT 101` - MAT 101 dersini takip listesine ekler
+`/add EHB 313E, MAT 101, FIZ 102` - Birden fazla dersi tek seferde ekler
 
 **➖ Ders Kaldırma:**
 `/remove EHB 313E` - Belirtilen dersi listeden kaldırır
 `/removeall` - Tüm dersleri kaldırır
 
+**🔎 Ders Arama:**
+Herhangi bir sohbette bot adını yazıp ardından ders kodu, ders adı veya öğretim üyesi adıyla arayın. Sonuçtaki *Takibe al* düğmesi dersi listenize ekler.
+
 **📊 Bilgi Komutları:**
 `/list` - Takip ettiğiniz dersleri gösterir
 `/status` - Bot durumunuzu gösterir
@@ -96,14 +127,21 @@ Bu bot, İTÜ OBS'deki ders kontenjanlarını sürekli kontrol eder ve kontenjan
 3. `/list` - Derslerinizi kontrol et
 4. Bot otomatik olarak kontenjan değişikliklerini takip eder
 
-**⚠️ Not:** Bot her 4 dakikada bir kontrol yapar. Kontenjan açıldığında anında bildirim alırsınız.
+**⚠️ Not:** Bot dersleri takipçi sayısına ve kayıt dönemine göre birkaç dakikada bir kontrol eder. Kontenjan açıldığında anında bildirim alırsınız.
         """
         
         await update.message.reply_text(help_text, parse_mode='Markdown')
     
     async def add_course_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Ders ekleme komutu"""
-        if not context.args:
+        # Satır sonları context.args'ta kaybolduğu için ders listesi mesaj metninden alınır
+        course_codes = [
+            ' '.join(code.split())
+            for code in COURSE_LIST_SEPARATOR.split(update.message.text.split(maxsplit=1)[1])
+            if code.strip()
+        ] if context.args else []
+        
+        if not course_codes:
             await update.message.reply_text(
                 "❌ **Hata:** Ders kodu belirtmelisiniz.\n\n"
                 "**Kullanım:** `/add EHB 313E`\n"
@@ -112,32 +150,50 @@ Bu bot, İTÜ OBS'deki ders kontenjanlarını sürekli kontrol eder ve kontenjan
             )
             return
         
-        course_code = ' '.join(context.args)
+        if len(course_codes) > 1:
+            await self.add_courses(update, course_codes)
+            return
+        
+        course_code = course_codes[0]
         user_id = update.effective_user.id
         
         # Ders kodunu doğrula
         is_valid, branch_id, formatted_code = self.validator.validate_course_code(course_code)
         
         if not is_valid:
-            available_branches = ', '.join(self.validator.get_available_branches()[:10])
+            similar = self.validator.suggest_branches(course_code)
+            if similar:
+                branch_hint = f"**Benzer branşlar:** {', '.join(similar)}"
+            else:
+                branch_hint = (f"**Branş örnekleri:** {', '.join(EXAMPLE_BRANCHES)} "
+                               f"({len(self.validator.get_available_branches())} branş)")
             await update.message.reply_text(
                 f"❌ **Geçersiz ders kodu:** `{course_code}`\n\n"
                 f"**Doğru format:** `EHB 313E` veya `MAT 101`\n"
-                f"**Mevcut branşlar:** {available_branches}...\n\n"
+                f"{branch_hint}\n\n"
                 f"**Örnek:** `/add EHB 313E`",
                 parse_mode='Markdown'
             )
             return
         
-        # Dersi kullanıcıya ekle
-        success = self.db.add_course_to_user(user_id, formatted_code, branch_id)
+        suggestions = self.missing_course_suggestions(branch_id, formatted_code)
+        if suggestions is not None:
+            text = f"❌ **Bu dönem açılmayan ders:** `{formatted_code}`\n\n"
+            if suggestions:
+                text += "**Bunu mu demek istediniz?**\n" + "\n".join(f"`/add {c}`" for c in suggestions)
+            else:
+                text += "Ders kodunu kontrol edip tekrar deneyin."
+            await update.message.reply_text(text, parse_mode='Markdown')
+            return
         
+        # Dersi kullanıcıya ekle
+        success = await self.db.add_course_to_user(user_id, formatted_code, branch_id)
         if success:
-            branch_name = self.validator.get_branch_name(formatted_code.split()[0])
+            await self.index_courses(user_id, {formatted_code: branch_id})
+            course_name = self.course_catalog.course_name(branch_id, formatted_code) if self.course_catalog else None
             await update.message.reply_text(
                 f"✅ **Ders eklendi!**\n\n"
-                f"📚 **Ders:** {formatted_code}\n"
-                f"🏫 **Branş:** {branch_name}\n\n"
+                f"📚 **Ders:** {formatted_code}{f' - {course_name}' if course_name else ''}\n\n"
                 f"Bu ders için kontenjan değişikliklerini takip edeceğim! 🔍",
                 parse_mode='Markdown'
             )
@@ -148,12 +204,70 @@ Bu bot, İTÜ OBS'deki ders kontenjanlarını sürekli kontrol eder ve kontenjan
                 parse_mode='Markdown'
             )
     
+    async def add_courses(self, update: Update, course_codes):
+        """Birden fazla dersi doğrula ve tek veritabanı işleminde ekle"""
+        user_id = update.effective_user.id
+        
+        valid = {}
+        invalid = []
+        missing = []
+        for course_code in course_codes:
+            is_valid, branch_id, formatted_code = self.validator.validate_course_code(course_code)
+            if not is_valid:
+                invalid.append(course_code)
+            elif self.missing_course_suggestions(branch_id, formatted_code) is not None:
+                missing.append(formatted_code)
+            else:
+                valid[formatted_code] = branch_id
+        
+        added = await self.db.add_courses(user_id, list(valid.items())) if valid else []
+        await self.index_courses(user_id, {course_code: valid[course_code] for course_code in added})
+        already = [course_code for course_code in valid if course_code not in added]
+        
+        text = ""
+        if added:
+            course_list = "\n".join(f"• {course_code}" for course_code in added)
+            text += f"✅ **{len(added)} ders eklendi!**\n\n{course_list}\n\n"
+        if already:
+            text += f"⚠️ **Zaten ekli:** {', '.join(f'`{c}`' for c in already)}\n\n"
+        if invalid:
+            text += (f"❌ **Geçersiz ders kodu:** {', '.join(f'`{c}`' for c in invalid)}\n"
+                     f"**Doğru format:** `EHB 313E` veya `MAT 101`\n\n")
+        if missing:
+            text += f"❌ **Bu dönem açılmayan ders:** {', '.join(f'`{c}`' for c in missing)}\n\n"
+        if added:
+            text += "Bu dersler için kontenjan değişikliklerini takip edeceğim! 🔍"
+        
+        await update.message.reply_text(text.strip(), parse_mode='Markdown')
+    
+    async def index_courses(self, user_id: int, courses):
+        """
+        Eklenen dersleri abonelik indeksine işle (ders kodu -> branş ID)
+        Sadece aktif kullanıcılar: get_all_active_users ile aynı küme, /start yapılınca set_user ekler
+        """
+        if self.subscriptions is None or not courses:
+            return
+        user = await self.db.get_user(user_id)
+        if user is None or not user['is_active']:
+            return
+        for course_code, branch_id in courses.items():
+            self.subscriptions.add(user_id, user['chat_id'], course_code, branch_id)
+    
+    def missing_course_suggestions(self, branch_id: int, formatted_code: str):
+        """
+        Ders kataloğuna göre ders bu dönem açılmıyorsa yakın ders kodları
+        Returns: öneri listesi (boş olabilir), ders varsa veya branş listesi taze değilse None
+        """
+        if self.course_catalog is None or self.course_catalog.contains(branch_id, formatted_code) is not False:
+            return None
+        return self.course_catalog.suggest(branch_id, formatted_code)
+    
     async def remove_course_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Ders kaldırma komutu"""
         if not context.args:
             # Kullanıcının derslerini listele ve inline keyboard ile seçim yap
             user_id = update.effective_user.id
-            courses = self.db.get_user_courses(user_id)
+            courses = await self.db.get_user_courses(user_id)
             
             if not courses:
                 await update.message.reply_text(
@@ -187,7 +301,9 @@ Bu bot, İTÜ OBS'deki ders kontenjanlarını sürekli kontrol eder ve kontenjan
             formatted_code = course_code.upper()
         
         # Dersi kaldır
-        self.db.remove_course_from_user(user_id, formatted_code)
+        await self.db.remove_course_from_user(user_id, formatted_code)
+        if self.subscriptions is not None:
+            self.subscriptions.remove(user_id, formatted_code)
         
         await update.message.reply_text(
             f"✅ **Ders kaldırıldı!**\n\n"
@@ -198,7 +314,7 @@ Bu bot, İTÜ OBS'deki ders kontenjanlarını sürekli kontrol eder ve kontenjan
     async def list_courses_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Ders listesi komutu"""
         user_id = update.effective_user.id
-        courses = self.db.get_user_courses(user_id)
+        courses = await self.db.get_user_courses(user_id)
         
         if not courses:
             await update.message.reply_text(
@@ -221,7 +337,7 @@ Bu bot, İTÜ OBS'deki ders kontenjanlarını sürekli kontrol eder ve kontenjan
     async def remove_all_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Tüm dersleri kaldırma komutu"""
         user_id = update.effective_user.id
-        courses = self.db.get_user_courses(user_id)
+        courses = await self.db.get_user_courses(user_id)
         
         if not courses:
             await update.message.reply_text(
@@ -249,8 +365,8 @@ Bu bot, İTÜ OBS'deki ders kontenjanlarını sürekli kontrol eder ve kontenjan
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Durum komutu"""
         user_id = update.effective_user.id
-        user_info = self.db.get_user(user_id)
-        courses = self.db.get_user_courses(user_id)
+        user_info = await self.db.get_user(user_id)
+        courses = await self.db.get_user_courses(user_id)
         
         if not user_info:
             await update.message.reply_text(
@@ -299,14 +415,21 @@ Bu bot, İTÜ OBS'deki ders kontenjanlarını sürekli kontrol eder ve kontenjan
     async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Callback query işleyici"""
         query = update.callback_query
-        await query.answer()
-        
         data = query.data
         user_id = query.from_user.id
         
+        if data.startswith("add_"):
+            # Inline arama sonucundan takibe alma: mesaj başka sohbette olabilir, sonuç kısa bildirimle döner
+            await self.add_course_callback(query, data.replace("add_", "", 1))
+            return
+        
+        await query.answer()
+        
         if data.startswith("remove_"):
             course_code = data.replace("remove_", "")
-            self.db.remove_course_from_user(user_id, course_code)
+            await self.db.remove_course_from_user(user_id, course_code)
+            if self.subscriptions is not None:
+                self.subscriptions.remove(user_id, course_code)
             
             await query.edit_message_text(
                 f"✅ **Ders kaldırıldı!**\n\n"
@@ -315,13 +438,13 @@ Bu bot, İTÜ OBS'deki ders kontenjanlarını sürekli kontrol eder ve kontenjan
             )
         
         elif data == "confirm_remove_all":
-            courses = self.db.get_user_courses(user_id)
-            for course in courses:
-                self.db.remove_course_from_user(user_id, course['course_code'])
+            removed = await self.db.remove_all_courses(user_id)
+            if self.subscriptions is not None:
+                self.subscriptions.remove_user(user_id)
             
             await query.edit_message_text(
                 f"✅ **Tüm dersler kaldırıldı!**\n\n"
-                f"**Kaldırılan ders sayısı:** {len(courses)}\n\n"
+                f"**Kaldırılan ders sayısı:** {removed}\n\n"
                 f"Yeni ders eklemek için `/add DERS_KODU` komutunu kullanın.",
                 parse_mode='Markdown'
             )
@@ -333,16 +456,72 @@ Bu bot, İTÜ OBS'deki ders kontenjanlarını sürekli kontrol eder ve kontenjan
                 parse_mode='Markdown'
             )
     
+    async def add_course_callback(self, query, course_code: str):
+        """Inline arama sonucundaki "Takibe al" düğmesi"""
+        user_id = query.from_user.id
+        user = await self.db.get_user(user_id)
+        if user is None or not user['is_active']:
+            await query.answer("Bildirim alabilmek için önce botla özel sohbette /start yazın.", show_alert=True)
+            return
+        
+        is_valid, branch_id, formatted_code = self.validator.validate_course_code(course_code)
+        if not is_valid:
+            await query.answer(f"❌ Geçersiz ders kodu: {course_code}", show_alert=True)
+            return
+        
+        success = await self.db.add_course_to_user(user_id, formatted_code, branch_id)
+        if success:
+            await self.index_courses(user_id, {formatted_code: branch_id})
+            await query.answer(f"✅ {formatted_code} takip listenize eklendi.")
+        else:
+            await query.answer(f"⚠️ {formatted_code} zaten takip listenizde.")
+    
+    async def inline_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Inline ders araması - bellekteki indeksten cevap verir, OBS'ye istek atmaz"""
+        query = update.inline_query
+        if self.course_search is None:
+            return
+        
+        results = []
+        for course in self.course_search.search(query.query, limit=INLINE_RESULT_LIMIT):
+            instructors = ', '.join(course.instructors[:3]) or '-'
+            results.append(InlineQueryResultArticle(
+                id=course.course_code,
+                title=f"{course.course_code} - {course.ders_adi}",
+                description=instructors,
+                input_message_content=InputTextMessageContent(
+                    f"📚 **{course.course_code}** - {course.ders_adi}\n"
+                    f"👨‍🏫 {instructors}",
+                    parse_mode='Markdown'
+                ),
+                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(
+                    "➕ Takibe al", callback_data=f"add_{course.course_code}"
+                )]])
+            ))
+        
+        await query.answer(results, cache_time=INLINE_CACHE_TIME)
+    
+    async def deliver(self, chat_id: int, message: str):
+        """Bildirimi gönder, hata olursa fırlat (yeniden deneme bildirim kuyruğunda yapılır)"""
+        await self.application.bot.send_message(
+            chat_id=chat_id,
+            text=message,
+            parse_mode='Markdown'
+        )
+    
     async def send_notification(self, chat_id: int, message: str):
         """Bildirim gönder"""
         try:
-            await self.application.bot.send_message(
-                chat_id=chat_id,
-                text=message,
-                parse_mode='Markdown'
-            )
+            await self.deliver(chat_id, message)
         except Exception as e:
-            logger.error(f"Bildirim gönderme hatası: {e}")
+            if is_unreachable_chat(e):
+                # Botu engellemiş / silinmiş sohbet: /start ile tekrar aktif olana kadar bildirim gönderilmez
+                await self.db.deactivate_chats([chat_id])
+                if self.subscriptions is not None:
+                    self.subscriptions.deactivate_chats([chat_id])
+                logger.warning(f"Sohbete ulaşılamıyor, kullanıcı pasif yapıldı ({chat_id}): {e}")
+            else:
+                logger.error(f"Bildirim gönderme hatası: {e}")
     
     async def run_async(self):
         """Bot'u asenkron çalıştır"""
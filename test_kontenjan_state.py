@@ -0,0 +1,114 @@
+"""
+Kontenjan durum tablosu: debounce ile ertelenen bildirimler ve notify_pending şema geçişi
+"""
+import sqlite3
+from typing import NamedTuple
+
+from database import MIGRATIONS, DatabaseManager
+from kontenjan_state import FILLED, OPENED, SectionStateTable
+
+DEBOUNCE = 600
+T0 = 1000.0  # last_notified_at 0 "hiç bildirilmedi" demek; saat bundan başlar
+BRANCH_ID = 5
+COURSE_CODE = 'EHB 313E'
+
+
+class Ders(NamedTuple):
+    crn: int
+    ders_kodu: str
+    kontenjan: int
+    ogrenci_sayisi: int
+
+
+def section(ogrenci_sayisi: int, kontenjan: int = 30, crn: int = 21001) -> Ders:
+    return Ders(crn, COURSE_CODE, kontenjan, ogrenci_sayisi)
+
+
+def kinds(events):
+    return [event.tur for event in events]
+
+
+def reopened_within_debounce() -> SectionStateTable:
+    """Açık görülüp dolan, sonra debounce süresi içinde yeniden açılan şube"""
+    table = SectionStateTable(debounce=DEBOUNCE)
+    assert kinds(table.update(BRANCH_ID, [section(29)], now=T0)) == [OPENED]
+    assert kinds(table.update(BRANCH_ID, [section(30)], now=T0 + 100)) == [FILLED]
+    assert table.update(BRANCH_ID, [section(29)], now=T0 + 200) == []
+    return table
+
+
+def test_opened_within_debounce_is_deferred():
+    table = reopened_within_debounce()
+    assert table.suppressed == 1
+    assert table.get(21001).notify_pending
+    assert not table.has_due_notification(BRANCH_ID, [COURSE_CODE], now=T0 + 500)
+
+    # Yanıt değişmese de süre dolunca bildirim verilir
+    assert table.update(BRANCH_ID, [section(29)], now=T0 + 500) == []
+    assert table.has_due_notification(BRANCH_ID, [COURSE_CODE], now=T0 + DEBOUNCE)
+    events = table.update(BRANCH_ID, [section(29)], now=T0 + DEBOUNCE)
+    assert kinds(events) == [OPENED]
+    assert events[0].bos == 1
+
+    # Bir kez bildirilir
+    assert not table.get(21001).notify_pending
+    assert table.update(BRANCH_ID, [section(29)], now=T0 + DEBOUNCE + 1000) == []
+
+
+def test_filled_clears_pending():
+    table = reopened_within_debounce()
+    assert kinds(table.update(BRANCH_ID, [section(30)], now=T0 + 300)) == [FILLED]
+    assert not table.get(21001).notify_pending
+    assert not table.has_due_notification(BRANCH_ID, [COURSE_CODE], now=T0 + DEBOUNCE + 1000)
+    assert table.update(BRANCH_ID, [section(30)], now=T0 + DEBOUNCE + 1000) == []
+
+
+def test_pending_survives_save_and_load(tmp_path):
+    table = reopened_within_debounce()
+    rows = table.dirty_rows(BRANCH_ID)
+
+    db = DatabaseManager(str(tmp_path / 'users.db'))
+    try:
+        db.save_section_states(rows)
+        table.mark_saved(rows)
+        assert table.dirty_rows() == []
+        saved = db.get_section_states()
+    finally:
+        db.close()
+
+    reloaded = SectionStateTable(debounce=DEBOUNCE)
+    reloaded.load(saved)
+    assert reloaded.get(21001).notify_pending
+    assert reloaded.has_due_notification(BRANCH_ID, [COURSE_CODE], now=T0 + DEBOUNCE)
+    assert kinds(reloaded.update(BRANCH_ID, [section(29)], now=T0 + DEBOUNCE)) == [OPENED]
+
+
+def test_notify_pending_migration_on_old_database(tmp_path):
+    path = str(tmp_path / 'users.db')
+    # notify_pending sütunu eklenmeden önceki (1. sürüm) şema
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE section_states (
+            crn INTEGER PRIMARY KEY,
+            branch_id INTEGER,
+            course_code TEXT,
+            kontenjan INTEGER,
+            ogrenci_sayisi INTEGER,
+            last_notified_at REAL DEFAULT 0,
+            changed_at REAL DEFAULT 0
+        );
+        INSERT INTO section_states VALUES (21001, 5, 'EHB 313E', 30, 29, 0, 0);
+        PRAGMA user_version = 1;
+    ''')
+    conn.close()
+
+    db = DatabaseManager(path)
+    try:
+        assert db.schema_version() == MIGRATIONS[-1][0]
+        columns = [row[1] for row in db.conn.execute('PRAGMA table_info(section_states)')]
+        assert 'notify_pending' in columns
+        [row] = db.get_section_states()
+    finally:
+        db.close()
+    assert row['crn'] == 21001
+    assert row['notify_pending'] == 0
@@ -0,0 +1,90 @@
+"""
+Sorgu zamanlayıcısı: istek bütçesi (token bucket) ve zamanlayıcı dışı istekler
+"""
+import pytest
+
+import scheduler
+from scheduler import PollScheduler
+
+
+class FakeClock:
+    """time modülünün yerine geçen elle ilerletilen saat"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler, 'time', clock)
+    return clock
+
+
+def make_scheduler(requests_per_minute: int = 60) -> PollScheduler:
+    return PollScheduler(base_interval=240, min_interval=30, max_interval=900,
+                         requests_per_minute=requests_per_minute)
+
+
+def test_pop_due_returns_new_branches_and_consumes_tokens(clock):
+    poller = make_scheduler()
+    poller.sync_branches({1: 1, 2: 1, 3: 1})
+
+    assert sorted(poller.pop_due()) == [1, 2, 3]
+    assert poller._tokens == pytest.approx(57)
+    assert poller.stats()['in_flight'] == 3
+    # Sorgusu sürerken branş tekrar verilmez
+    assert poller.pop_due() == []
+
+
+def test_pop_due_stops_when_budget_is_empty(clock):
+    poller = make_scheduler(requests_per_minute=2)
+    poller.sync_branches({1: 1, 2: 1, 3: 1})
+
+    assert len(poller.pop_due()) == 2
+    assert poller.seconds_until_next() == pytest.approx(30)
+
+    # Dakikada 2 istek: 30 sn'de bir hak dolar
+    clock.now += 30
+    assert len(poller.pop_due()) == 1
+
+
+def test_record_result_reschedules_branch(clock):
+    poller = make_scheduler()
+    poller.sync_branches({1: 1})
+    assert poller.pop_due() == [1]
+
+    clock.now += 2
+    poller.record_result(1, changed=False)
+    assert poller.seconds_until_next() == pytest.approx(poller.interval_for(1))
+    assert poller.stats()['avg_poll_seconds'] == 2
+
+    clock.now += poller.interval_for(1)
+    assert poller.pop_due() == [1]
+
+
+def test_try_acquire_shares_the_budget(clock):
+    poller = make_scheduler(requests_per_minute=4)
+
+    assert poller.try_acquire()
+    assert poller.try_acquire()
+    assert poller.stats()['background_requests'] == 2
+
+    # Zamanlayıcı dışı istekler takip sorgularının bütçesinden düşer
+    poller.sync_branches({1: 1, 2: 1, 3: 1})
+    assert len(poller.pop_due()) == 2
+
+
+def test_try_acquire_keeps_reserve_for_polls(clock):
+    poller = make_scheduler(requests_per_minute=4)
+
+    assert poller.try_acquire(reserve=2)
+    assert poller.try_acquire(reserve=2)
+    assert not poller.try_acquire(reserve=2)
+    assert poller.stats()['background_requests'] == 2
+
+    poller.sync_branches({1: 1, 2: 1})
+    assert len(poller.pop_due()) == 2